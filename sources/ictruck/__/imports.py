@@ -25,6 +25,7 @@
 
 import collections.abc as   cabc
 import contextlib as        ctxl
+import contextvars as       ctxv
 import dataclasses as       dcls
 import                      enum
 import functools as         funct
@@ -38,8 +38,12 @@ from . import exceptions
 
 
 from .configuration import *
+from .controls import *
+from .debuggers import *
 from .exceptions import *
+from .formatters import *
 from .printers import *
+from .reloaders import *
 from .vehicles import *
 
 
@@ -0,0 +1,85 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+''' Command-line interface for inspection of debugging artifacts.
+
+    Also serves as client for control servers of running processes.
+
+    Invoke as ``python -m ictruck``.
+'''
+
+
+
+import argparse as _argparse
+import json as _json
+
+from . import __
+from . import controls as _controls
+from . import printers as _printers
+
+
+def main(
+    arguments: __.typx.Optional[ __.cabc.Sequence[ str ] ] = None
+) -> None:
+    ''' Parses command-line arguments and dispatches to subcommand. '''
+    parser = _produce_parser( )
+    options = parser.parse_args( arguments )
+    options.handler( options )
+
+
+def _control( options: _argparse.Namespace ) -> None:
+    arguments: dict[ str, str ] = { }
+    for name in ( 'module', 'active_flavors', 'trace_levels' ):
+        value = getattr( options, name )
+        if value is not None: arguments[ name ] = value
+    result = _controls.request_control(
+        options.location, options.command, **arguments )
+    print( _json.dumps( result, indent = 2 ) )
+
+
+def _decode_recording( options: _argparse.Namespace ) -> None:
+    for record in _printers.decode_flight_recording( options.location ):
+        print( record )
+
+
+def _produce_parser( ) -> _argparse.ArgumentParser:
+    parser = _argparse.ArgumentParser( prog = f"python -m {__.package_name}" )
+    subparsers = parser.add_subparsers( required = True )
+    decoder = subparsers.add_parser(
+        'decode', help = 'Print records from flight recorder file.' )
+    decoder.add_argument( 'location', help = 'Path to flight recorder file.' )
+    decoder.set_defaults( handler = _decode_recording )
+    controller = subparsers.add_parser(
+        'ctl', help = 'Send command to control server of running process.' )
+    controller.add_argument( 'location', help = 'Path to control socket.' )
+    controller.add_argument(
+        'command',
+        choices = (
+            'activation', 'debuggers', 'dump', 'flush', 'reconfigure' ) )
+    controller.add_argument( '--module', help = 'Name of module to inspect.' )
+    controller.add_argument(
+        '--active-flavors', help = 'Specification of active flavors.' )
+    controller.add_argument(
+        '--trace-levels', help = 'Specification of trace levels.' )
+    controller.set_defaults( handler = _control )
+    return parser
+
+
+if '__main__' == __name__: main( )
@@ -1,20 +1,40 @@
-from collections.abc import Callable
+import enum
+
+from collections.abc import Callable, Sequence
+from types import FrameType
 
 from typing_extensions import Any
 
+import executing
+
 DEFAULT_ARG_TO_STRING_FUNCTION: Callable[ [ Any ], str ]
 DEFAULT_OUTPUT_FUNCTION: Callable[ [ str ], None ]
 DEFAULT_PREFIX: str
 
+class Sentinel( enum.Enum ):
+
+    absent = ...
+
+
+class Source( executing.Source ):
+
+    def get_text_with_indentation( self, node: Any ) -> str:
+        ...
+
+
 class IceCreamDebugger:
 
     enabled: bool = ...
     lineWrapWidth: int = ...
     contextDelimiter: str = ...
+    argToStringFunction: Callable[ [ Any ], str ] = ...
+    includeContext: bool = ...
+    outputFunction: Callable[ [ str ], None ] = ...
+    prefix: str | Callable[ [ ], str ] = ...
 
     def __init__(
         self,
-        prefix: str = ...,
+        prefix: str | Callable[ [ ], str ] = ...,
         outputFunction: Callable[ [ str ], None ] = ...,
         argToStringFunction: Callable[ [ Any ], str ] = ...,
         includeContext: bool = ...,
@@ -28,6 +48,23 @@ class IceCreamDebugger:
     def format( self, *args: Any ) -> str:
         ...
 
+    def _constructArgumentOutput(
+        self,
+        prefix: str,
+        context: str,
+        pairs: Sequence[ tuple[ str | Sentinel, Any ] ],
+    ) -> str:
+        ...
+
+    def _format( self, callFrame: FrameType, *args: Any ) -> str:
+        ...
+
+    def _formatContext( self, callFrame: FrameType ) -> str:
+        ...
+
+    def _formatTime( self ) -> str:
+        ...
+
     def enable( self ) -> None:
         ...
 
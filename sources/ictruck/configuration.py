@@ -38,14 +38,43 @@ class FormatterControl( __.immut.DataclassObject ):
             '''
         ),
     ] = None
+    type_formatters: __.typx.Annotated[
+        __.cabc.Mapping[ type, __.typx.Callable[ [ __.typx.Any ], str ] ],
+        __.typx.Doc(
+            ''' Registry of value types to formatters.
+
+                Formatters from factories are wrapped by dispatchers to these,
+                unless factories have true ``applies_type_formatters``
+                attributes, in which case they apply these to individual
+                values themselves, such as to retain decorations of flavors.
+            ''' ),
+    ] = __.dcls.field(
+        default_factory = __.immut.Dictionary[ type, __.typx.Any ] )
+
+
+class RateLimit( __.immut.DataclassObject ):
+    ''' Limit on rate of emissions, enforced by token bucket. '''
+
+    rate: __.typx.Annotated[
+        float,
+        __.typx.Doc( ''' Sustained rate of emissions, per second. ''' ),
+    ]
+    burst: __.typx.Annotated[
+        int,
+        __.typx.Doc( ''' Number of emissions allowed in a burst. ''' ),
+    ] = 1
 
 
 Flavor: __.typx.TypeAlias = int | str
 Formatter: __.typx.TypeAlias = __.typx.Callable[ [ __.typx.Any ], str ]
 FormatterFactory: __.typx.TypeAlias = (
     __.typx.Callable[ [ FormatterControl, str, Flavor ], Formatter ] )
-PrefixEmitter: __.typx.TypeAlias = __.typx.Callable[ [ str, Flavor ], str ]
+PrefixRenderer: __.typx.TypeAlias = __.typx.Callable[ [ ], str ]
+PrefixEmitter: __.typx.TypeAlias = (
+    __.typx.Callable[ [ str, Flavor ], str | PrefixRenderer ] )
 PrefixEmitterUnion: __.typx.TypeAlias = str | PrefixEmitter
+TypeFormattersRegistry: __.typx.TypeAlias = (
+    __.immut.Dictionary[ type, Formatter ] )
 
 
 class FlavorConfiguration( __.immut.DataclassObject ):
@@ -75,8 +104,18 @@ class FlavorConfiguration( __.immut.DataclassObject ):
         __.typx.Doc(
             ''' String or factory which produces output prefix string.
 
-                Factory takes formatter control, module name, and flavor as
-                arguments. Returns prefix string.
+                Factory takes module name and flavor as arguments and is
+                invoked once per debugger. Returns prefix string or, for
+                prefixes with volatile content, such as timestamps, a callable
+                without arguments, which is invoked for every emission.
+
+                Default ``None`` inherits from cumulative configuration.
+            ''' ),
+    ] = None
+    rate_limit: __.typx.Annotated[
+        __.typx.Optional[ RateLimit ],
+        __.typx.Doc(
+            ''' Limit on rate of emissions.
 
                 Default ``None`` inherits from cumulative configuration.
             ''' ),
@@ -130,12 +169,33 @@ class ModuleConfiguration( __.immut.DataclassObject ):
         __.typx.Doc(
             ''' String or factory which produces output prefix string.
 
-                Factory takes formatter control, module name, and flavor as
-                arguments. Returns prefix string.
+                Factory takes module name and flavor as arguments and is
+                invoked once per debugger. Returns prefix string or, for
+                prefixes with volatile content, such as timestamps, a callable
+                without arguments, which is invoked for every emission.
+
+                Default ``None`` inherits from cumulative configuration.
+            ''' ),
+    ] = None
+    rate_limit: __.typx.Annotated[
+        __.typx.Optional[ RateLimit ],
+        __.typx.Doc(
+            ''' Limit on rate of emissions.
 
                 Default ``None`` inherits from cumulative configuration.
             ''' ),
     ] = None
+    type_formatters: __.typx.Annotated[
+        TypeFormattersRegistry,
+        __.typx.Doc(
+            ''' Registry of value types to formatters.
+
+                Formatters are resolved along method resolution order of type
+                of each value and take precedence over formatter from
+                factory. Entries merge with those of parent packages and
+                general configuration.
+            ''' ),
+    ] = __.dcls.field( default_factory = TypeFormattersRegistry )
 
 
 class VehicleConfiguration( __.immut.DataclassObject ):
@@ -163,7 +223,27 @@ class VehicleConfiguration( __.immut.DataclassObject ):
         __.typx.Doc(
             ''' String or factory which produces output prefix string.
 
-                Factory takes formatter control, module name, and flavor as
-                arguments. Returns prefix string.
+                Factory takes module name and flavor as arguments and is
+                invoked once per debugger. Returns prefix string or, for
+                prefixes with volatile content, such as timestamps, a callable
+                without arguments, which is invoked for every emission.
             ''' ),
     ] = _icecream.DEFAULT_PREFIX
+    rate_limit: __.typx.Annotated[
+        __.typx.Optional[ RateLimit ],
+        __.typx.Doc(
+            ''' Limit on rate of emissions.
+
+                Default ``None`` means unlimited.
+            ''' ),
+    ] = None
+    type_formatters: __.typx.Annotated[
+        TypeFormattersRegistry,
+        __.typx.Doc(
+            ''' Registry of value types to formatters.
+
+                Formatters are resolved along method resolution order of type
+                of each value and take precedence over formatter from
+                factory.
+            ''' ),
+    ] = __.dcls.field( default_factory = TypeFormattersRegistry )
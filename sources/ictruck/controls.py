@@ -0,0 +1,307 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+
+''' Control endpoint for live inspection and reconfiguration of trucks. '''
+
+
+
+import atexit as _atexit
+import json as _json
+import socket as _socket
+import stat as _stat
+
+from . import __
+from . import exceptions as _exceptions
+from . import printers as _printers
+from . import vehicles as _vehicles
+
+
+_validate_arguments = (
+    __.validate_arguments(
+        globalvars = globals( ),
+        errorclass = _exceptions.ArgumentClassInvalidity ) )
+
+
+_poll_interval = 0.25
+_conversation_timeout = 5.0
+
+
+class ControlServer( __.immut.DataclassObjectMutable ):
+    ''' Serves control requests for truck over Unix domain socket.
+
+        Requests and responses are JSON objects, one per line. Each request
+        names a command; each response holds either a ``result`` or an
+        ``error``. Commands:
+
+        * ``debuggers``: cached debuggers with enablement and emission counts.
+        * ``activation``: effective flavors and trace level per module;
+          optionally for a single ``module``.
+        * ``reconfigure``: swap in ``active_flavors`` and ``trace_levels``,
+          given as specification strings.
+        * ``flush``: flush deduplicator, flight recorder, printer stream,
+          and standard streams.
+        * ``dump``: records from flight recorder.
+
+        Connections are served one at a time from a daemon thread.
+        Stale sockets, on which nothing listens, are replaced on start.
+        Socket is removed on stop or, failing that, at process exit.
+    '''
+
+    truck: __.typx.Annotated[
+        _vehicles.Truck, __.typx.Doc( ''' Truck to inspect and control. ''' )
+    ]
+    location: __.typx.Annotated[
+        str, __.typx.Doc( ''' Path of Unix domain socket. ''' )
+    ]
+    recorder: __.typx.Annotated[
+        __.typx.Optional[ _printers.FlightRecorder ],
+        __.typx.Doc( ''' Flight recorder to flush and dump, if any. ''' ),
+    ] = None
+    _halter: __.threads.Event = __.dcls.field(
+        default_factory = __.threads.Event )
+    _listener: __.typx.Optional[ _socket.socket ] = None
+    _thread: __.typx.Optional[ __.threads.Thread ] = None
+
+    def start( self ) -> __.typx.Self:
+        ''' Binds socket, readable only by owner, and starts serving. '''
+        if self._thread is not None: return self
+        _remove_stale_socket( self.location )
+        listener = _socket.socket( _socket.AF_UNIX, _socket.SOCK_STREAM )
+        try:
+            listener.bind( self.location )
+            __.os.chmod( self.location, 0o600 )
+            listener.listen( )
+        except OSError:
+            listener.close( )
+            raise
+        listener.settimeout( _poll_interval )
+        self._listener = listener
+        self._halter.clear( )
+        self._thread = __.threads.Thread(
+            target = self._serve,
+            name = f"{__.package_name}-control-server",
+            daemon = True )
+        self._thread.start( )
+        _atexit.register( self.stop )
+        return self
+
+    def stop( self ) -> None:
+        ''' Stops serving, closes socket, and removes its path. '''
+        thread = self._thread
+        if thread is None: return
+        _atexit.unregister( self.stop )
+        self._halter.set( )
+        thread.join( )
+        self._thread = None
+        if self._listener is not None: self._listener.close( )
+        self._listener = None
+        with __.ctxl.suppress( OSError ): __.os.unlink( self.location )
+
+    def _accept( self ) -> __.typx.Optional[ _socket.socket ]:
+        try: connection, _ = self._listener.accept( ) # pyright: ignore
+        except TimeoutError: return None
+        connection.settimeout( _conversation_timeout )
+        return connection
+
+    def _converse( self, connection: _socket.socket ) -> None:
+        with connection, connection.makefile(
+            'rw', encoding = 'utf-8'
+        ) as stream:
+            for line in stream:
+                stream.write( _json.dumps( self._respond( line ) ) + '\n' )
+                stream.flush( )
+
+    def _respond( self, line: str ) -> dict[ str, __.typx.Any ]:
+        # Any failure of a request is reported and must not halt serving.
+        try:
+            handler, request = _parse_request( line )
+            result = handler( self, request )
+        except Exception as exc:
+            return { 'error': f"{type( exc ).__name__}: {exc}" }
+        return { 'result': result }
+
+    def _serve( self ) -> None:
+        while not self._halter.is_set( ):
+            connection = self._accept( )
+            if connection is None: continue
+            # Malformed streams abandon connection, not server.
+            try: self._converse( connection )
+            except ( OSError, ValueError ): continue
+
+
+ControlHandler: __.typx.TypeAlias = __.cabc.Callable[
+    [ ControlServer, __.cabc.Mapping[ str, __.typx.Any ] ], __.typx.Any ]
+
+
+def request_control(
+    location: str, command: str, **arguments: __.typx.Any
+) -> __.typx.Any:
+    ''' Sends command to control server and returns its result. '''
+    with _connect( location ) as stream:
+        stream.write(
+            _json.dumps( dict( arguments, command = command ) ) + '\n' )
+        stream.flush( )
+        response = _json.loads( stream.readline( ) )
+    if 'error' in response:
+        raise _exceptions.ControlRequestFailure( command, response[ 'error' ] )
+    return response[ 'result' ]
+
+
+@_validate_arguments
+def serve_control(
+    truck: _vehicles.Truck,
+    location: str,
+    recorder: __.typx.Optional[ _printers.FlightRecorder ] = None,
+) -> ControlServer:
+    ''' Produces and starts control server for truck. '''
+    return ControlServer(
+        truck = truck, location = location, recorder = recorder ).start( )
+
+
+def _access_request_field(
+    request: __.cabc.Mapping[ str, __.typx.Any ], name: str
+) -> str:
+    value = request[ name ]
+    if not isinstance( value, str ):
+        raise _exceptions.ArgumentClassInvalidity( name, str )
+    return value
+
+
+@__.ctxl.contextmanager
+def _connect( location: str ) -> __.cabc.Iterator[ __.typx.Any ]:
+    with (
+        _socket.socket( _socket.AF_UNIX, _socket.SOCK_STREAM ) as connection
+    ):
+        connection.settimeout( _conversation_timeout )
+        connection.connect( location )
+        with connection.makefile( 'rw', encoding = 'utf-8' ) as stream:
+            yield stream
+
+
+def _describe_activation( truck: _vehicles.Truck, mname: str ) -> __.typx.Any:
+    flavors = _vehicles._calculate_effective_flavors( # noqa: SLF001
+        truck.active_flavors, mname )
+    return dict(
+        flavors = (
+            '*' if isinstance( flavors, _vehicles.Omniflavor )
+            else sorted( map( str, flavors ) ) ),
+        trace_level = _vehicles._calculate_effective_trace_level( # noqa: SLF001
+            truck.trace_levels, mname ) )
+
+
+def _handle_activation(
+    server: ControlServer, request: __.cabc.Mapping[ str, __.typx.Any ]
+) -> __.typx.Any:
+    truck = server.truck
+    if 'module' in request:
+        return _describe_activation(
+            truck, _access_request_field( request, 'module' ) )
+    mnames = set( truck.modulecfgs ).union(
+        mname for mname, _ in truck._debuggers ) # noqa: SLF001
+    return {
+        mname: _describe_activation( truck, mname )
+        for mname in sorted( mnames ) }
+
+
+def _handle_debuggers(
+    server: ControlServer, request: __.cabc.Mapping[ str, __.typx.Any ]
+) -> __.typx.Any:
+    return [
+        dict(
+            module = mname, flavor = flavor,
+            enabled = debugger.enabled, emissions = debugger.emissions )
+        for ( mname, flavor ), debugger
+        in tuple( server.truck._debuggers.items( ) ) ] # noqa: SLF001
+
+
+def _handle_dump(
+    server: ControlServer, request: __.cabc.Mapping[ str, __.typx.Any ]
+) -> __.typx.Any:
+    recorder = server.recorder
+    if recorder is None or recorder.location is None:
+        raise _exceptions.FlightRecorderAbsence( )
+    recorder.flush( )
+    return _printers.decode_flight_recording( recorder.location )
+
+
+def _handle_flush(
+    server: ControlServer, request: __.cabc.Mapping[ str, __.typx.Any ]
+) -> __.typx.Any:
+    if server.truck.deduplicator is not None:
+        server.truck.deduplicator.flush( )
+    if server.recorder is not None: server.recorder.flush( )
+    printer_factory = server.truck.printer_factory
+    if isinstance( printer_factory, __.io.TextIOBase ):
+        printer_factory.flush( )
+    __.sys.stdout.flush( )
+    __.sys.stderr.flush( )
+
+
+def _handle_reconfigure(
+    server: ControlServer, request: __.cabc.Mapping[ str, __.typx.Any ]
+) -> __.typx.Any:
+    nomargs: dict[ str, __.typx.Any ] = { }
+    if 'active_flavors' in request:
+        nomargs[ 'active_flavors' ] = (
+            _vehicles.active_flavors_from_specification(
+                _access_request_field( request, 'active_flavors' ) ) )
+    if 'trace_levels' in request:
+        nomargs[ 'trace_levels' ] = (
+            _vehicles.trace_levels_from_specification(
+                _access_request_field( request, 'trace_levels' ) ) )
+    server.truck.reconfigure( **nomargs )
+    return _handle_activation( server, { } )
+
+
+def _parse_request(
+    line: str
+) -> tuple[ ControlHandler, __.cabc.Mapping[ str, __.typx.Any ] ]:
+    request = _json.loads( line )
+    if not isinstance( request, dict ):
+        raise _exceptions.ArgumentClassInvalidity( 'request', dict )
+    request = __.typx.cast( dict[ str, __.typx.Any ], request )
+    command = _access_request_field( request, 'command' )
+    if command not in _handlers:
+        raise _exceptions.ArgumentValueInvalidity(
+            'command', command, 'one of ' + ', '.join( _handlers ) )
+    return _handlers[ command ], request
+
+
+def _remove_stale_socket( location: str ) -> None:
+    try: mode = __.os.lstat( location ).st_mode
+    except FileNotFoundError: return
+    # Never remove files which are not sockets.
+    if not _stat.S_ISSOCK( mode ): return
+    with _socket.socket( _socket.AF_UNIX, _socket.SOCK_STREAM ) as probe:
+        probe.settimeout( _conversation_timeout )
+        try: probe.connect( location )
+        except ConnectionRefusedError: pass
+        else: return # Live server; binding will fail.
+    with __.ctxl.suppress( FileNotFoundError ): __.os.unlink( location )
+
+
+_handlers: dict[ str, ControlHandler ] = dict(
+    activation = _handle_activation,
+    debuggers = _handle_debuggers,
+    dump = _handle_dump,
+    flush = _handle_flush,
+    reconfigure = _handle_reconfigure,
+)
@@ -0,0 +1,825 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+''' Icecream debuggers with emission controls. '''
+
+
+
+import atexit as _atexit
+import collections as _collections
+
+# Records are rendered through private interfaces of Icecream debuggers:
+# '_constructArgumentOutput', '_formatContext', and '_formatTime', as well
+# as 'Source.executing'. Hence, the dependency is pinned to a minor release.
+import icecream as _icecream
+
+from . import __
+from . import configuration as _cfg
+from . import exceptions as _exceptions
+
+
+ArgumentLabels: __.typx.TypeAlias = tuple[ str | _icecream.Sentinel, ... ]
+
+
+CallSite: __.typx.TypeAlias = tuple[ __.types.CodeType, int ]
+
+
+_labels_cache: dict[ CallSite, ArgumentLabels ] = { }
+_sites_tallies: dict[ CallSite, int ] = { }
+_sites_times: dict[ CallSite, float ] = { }
+_sites_lock: __.threads.Lock = __.threads.Lock( )
+
+
+class Record( __.typx.NamedTuple ):
+    ''' Emission captured for deferred formatting and printing.
+
+        Argument values are retained as-is. Formatting them is deferred until
+        the record is rendered, which may be never.
+    '''
+
+    debugger: _icecream.IceCreamDebugger
+    arguments: tuple[ __.typx.Any, ... ]
+    labels: ArgumentLabels
+    context: str = ''
+    time: str = ''
+
+    def render( self, prefix: __.typx.Optional[ str ] = None ) -> str:
+        ''' Formats arguments and combines them with prefix and context.
+
+            Prefix of debugger is rendered, unless one is supplied.
+        '''
+        debugger = self.debugger
+        if prefix is None:
+            prefix_ = debugger.prefix
+            prefix = prefix_( ) if callable( prefix_ ) else prefix_
+        if not self.arguments: return prefix + self.context + self.time
+        pairs = tuple( zip( self.labels, self.arguments ) )
+        token = _rendition.set( object( ) )
+        try:
+            return debugger._constructArgumentOutput( # noqa: SLF001
+                prefix, self.context, pairs )
+        finally: _rendition.reset( token )
+
+
+# Marker which is unique to each rendering of an emission.
+_rendition: __.ctxv.ContextVar[ __.typx.Optional[ object ] ] = (
+    __.ctxv.ContextVar( f"{__.package_name}.rendition", default = None ) )
+
+
+class BufferedScope( __.immut.DataclassObjectMutable ):
+    ''' Buffers emissions from active debuggers for duration of scope.
+
+        Buffered emissions are printed when the scope exits with an
+        exception, when the scope lasts longer than the latency threshold,
+        or when the scope is explicitly kept. Otherwise, they are discarded
+        without ever being formatted.
+
+        Scopes are tracked by context variable, so each asyncio task has its
+        own scope. Threads do not inherit context by default; use
+        :py:meth:`contextvars.Context.run` with a copied context to buffer
+        emissions from a worker thread into the scope of its parent.
+
+        Can also decorate functions and coroutine functions, in which case
+        each invocation gets a fresh scope.
+    '''
+
+    latency_threshold: __.typx.Annotated[
+        __.typx.Optional[ float ],
+        __.typx.Doc(
+            ''' Duration, in seconds, after which buffer is printed.
+
+                If ``None``, then duration does not matter.
+            ''' ),
+    ] = None
+    bytes_count: __.typx.Annotated[
+        int,
+        __.typx.Doc(
+            ''' Approximate size of buffered argument values, in bytes. ''' ),
+    ] = 0
+    kept: __.typx.Annotated[
+        bool, __.typx.Doc( ''' Print buffer regardless of outcome? ''' )
+    ] = False
+    records: __.typx.Annotated[
+        list[ Record ], __.typx.Doc( ''' Buffered emissions. ''' )
+    ] = __.dcls.field( default_factory = list[ Record ] )
+    _parent: __.typx.Any = None
+    _started: float = 0.0
+    _token: __.typx.Optional[ __.ctxv.Token[ __.typx.Any ] ] = None
+
+    def __call__(
+        self, function: __.cabc.Callable[ ..., __.typx.Any ]
+    ) -> __.cabc.Callable[ ..., __.typx.Any ]:
+        latency_threshold = self.latency_threshold
+        if __.inspect.iscoroutinefunction( function ):
+
+            async def invoke_async(
+                *posargs: __.typx.Any, **nomargs: __.typx.Any
+            ) -> __.typx.Any:
+                with BufferedScope( latency_threshold = latency_threshold ):
+                    return await function( *posargs, **nomargs )
+
+            return __.funct.wraps( function )( invoke_async )
+
+        def invoke( *posargs: __.typx.Any, **nomargs: __.typx.Any ):
+            with BufferedScope( latency_threshold = latency_threshold ):
+                return function( *posargs, **nomargs )
+
+        return __.funct.wraps( function )( invoke )
+
+    def __enter__( self ) -> __.typx.Self:
+        self._parent = _buffered_scope.get( )
+        self._started = __.time.monotonic( )
+        self._token = _buffered_scope.set( self )
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[ BaseException ] | None,
+        exc_value: BaseException | None,
+        traceback: __.types.TracebackType | None,
+    ) -> None:
+        if self._token is not None: _buffered_scope.reset( self._token )
+        self._token = None
+        threshold = self.latency_threshold
+        elapsed = __.time.monotonic( ) - self._started
+        if (    self.kept or exc_type is not None
+            or ( threshold is not None and elapsed > threshold )
+        ): self.release( )
+        self.records.clear( )
+
+    def keep( self ) -> None:
+        ''' Ensures that buffer is printed when scope exits. '''
+        self.kept = True
+
+    def release( self ) -> None:
+        ''' Prints buffered emissions, oldest first, and discards them.
+
+            If scope is nested in another scope, then emissions are passed
+            to the enclosing scope instead. May be called while scope is
+            active, in which case later emissions are buffered anew.
+        '''
+        records = tuple( self.records )
+        self.records.clear( )
+        self.bytes_count = 0
+        # Active scope is, or encloses, the current one; never retain there.
+        scope = (
+            self._parent if self._token is not None
+            else _buffered_scope.get( ) )
+        for record in records:
+            if scope is None or scope is self:
+                record.debugger.outputFunction( record.render( ) )
+            else: scope.retain( record )
+
+    def retain( self, record: Record ) -> None:
+        ''' Appends emission to buffer. '''
+        self.records.append( record )
+        self.bytes_count += sum( map( __.sys.getsizeof, record.arguments ) )
+
+
+_buffered_scope: __.ctxv.ContextVar[ __.typx.Optional[ BufferedScope ] ] = (
+    __.ctxv.ContextVar( f"{__.package_name}.buffered_scope", default = None ) )
+
+
+class RateLimiter:
+    ''' Token bucket which admits emissions at limited rate.
+
+        Plain class with slots, since it is updated on every emission.
+        Updates are not locked; concurrent emissions may occasionally be
+        admitted in excess of the limit, which is acceptable.
+    '''
+
+    __slots__ = ( 'burst', 'rate', 'suppressions', 'tokens', 'updated' )
+
+    def __init__( self, rate: float, burst: int ) -> None:
+        self.burst = float( burst )
+        self.rate = rate
+        self.suppressions = 0
+        self.tokens = float( burst )
+        self.updated = __.time.monotonic( )
+
+    def admit( self ) -> bool:
+        ''' Consumes token, if available. Else counts suppression. '''
+        now = __.time.monotonic( )
+        tokens = min(
+            self.burst, self.tokens + ( now - self.updated ) * self.rate )
+        self.updated = now
+        if tokens < 1.0:
+            self.tokens = tokens
+            self.suppressions += 1
+            return False
+        self.tokens = tokens - 1.0
+        return True
+
+
+class Retrospector( __.immut.DataclassObject ):
+    ''' Retains recent emissions from inactive debuggers, per thread.
+
+        When a debugger with a trigger flavor emits, the retained records of
+        the current thread are printed, oldest first, through the printers of
+        the debuggers which captured them. This provides context for failures
+        without printing traces for every success.
+    '''
+
+    capacity: __.typx.Annotated[
+        int, __.typx.Doc( ''' Maximum records retained per thread. ''' )
+    ] = 64
+    triggers: __.typx.Annotated[
+        frozenset[ _cfg.Flavor ],
+        __.typx.Doc( ''' Flavors which cause retained records to print. ''' ),
+    ] = frozenset( ( 'error', 'errorx', 'abort', 'abortx' ) )
+    _storage: __.typx.Annotated[
+        __.threads.local,
+        __.typx.Doc( ''' Per-thread storage for retained records. ''' ),
+    ] = __.dcls.field( default_factory = __.threads.local )
+
+    def capture( self, record: Record ) -> None:
+        ''' Retains record, displacing oldest record if full. '''
+        records: __.typx.Optional[ _collections.deque[ Record ] ] = (
+            getattr( self._storage, 'records', None ) )
+        if records is None:
+            records = _collections.deque( maxlen = self.capacity )
+            self._storage.records = records
+        records.append( record )
+
+    def flush( self ) -> None:
+        ''' Prints and discards retained records for current thread. '''
+        records = getattr( self._storage, 'records', None )
+        while records:
+            record = records.popleft( )
+            record.debugger.outputFunction( record.render( ) )
+
+    def install_excepthooks( self ) -> __.typx.Self:
+        ''' Prints retained records on uncaught exceptions.
+
+            Wraps :py:func:`sys.excepthook` and
+            :py:func:`threading.excepthook`.
+        '''
+        excepthook = __.sys.excepthook
+        threading_excepthook = __.threads.excepthook
+
+        def hook( *posargs: __.typx.Any ) -> None:
+            self.flush( )
+            excepthook( *posargs )
+
+        def threading_hook( arguments: __.typx.Any ) -> None:
+            self.flush( )
+            threading_excepthook( arguments )
+
+        __.sys.excepthook = hook
+        __.threads.excepthook = threading_hook
+        return self
+
+
+class SiteRepetition:
+    ''' Run of identical emissions from call site.
+
+        Plain class with slots, since it is updated on every emission.
+    '''
+
+    __slots__ = ( 'debugger', 'digest', 'repeats', 'started' )
+
+    def __init__(
+        self, debugger: _icecream.IceCreamDebugger, digest: int, started: float
+    ) -> None:
+        self.debugger = debugger
+        self.digest = digest
+        self.repeats = 0
+        self.started = started
+
+    def summarize( self ) -> None:
+        ''' Prints count of held back repeats, if any, and resets it. '''
+        repeats = self.repeats
+        if not repeats: return
+        self.repeats = 0
+        prefix = self.debugger.prefix
+        if callable( prefix ): prefix = prefix( )
+        self.debugger.outputFunction(
+            f"{prefix}Last message repeated {repeats} times." )
+
+
+class Deduplicator( __.immut.DataclassObject ):
+    ''' Collapses runs of identical emissions from each call site.
+
+        Repeats of the previous rendered text, less its prefix, from a call
+        site are held back and counted. The count is printed when a
+        different text is emitted from the site, upon any emission after the
+        timeout, when the deduplicator is flushed, or when the process exits.
+
+        At most 1024 call sites are tracked; the earliest tracked sites are
+        summarized and forgotten to make room for others.
+        Safe for use by concurrent threads.
+    '''
+
+    timeout: __.typx.Annotated[
+        float,
+        __.typx.Doc(
+            ''' Duration, in seconds, after which count of repeats is
+                printed even if run continues.
+            ''' ),
+    ] = 5.0
+    _lock: __.threads.RLock = __.dcls.field(
+        default_factory = __.threads.RLock )
+    _pending: dict[ tuple[ str, _cfg.Flavor, CallSite ], SiteRepetition ] = (
+        __.dcls.field(
+            default_factory = dict[
+                tuple[ str, _cfg.Flavor, CallSite ], SiteRepetition ] ) )
+    _sites: dict[ tuple[ str, _cfg.Flavor, CallSite ], SiteRepetition ] = (
+        __.dcls.field(
+            default_factory = dict[
+                tuple[ str, _cfg.Flavor, CallSite ], SiteRepetition ] ) )
+
+    def flush( self ) -> None:
+        ''' Prints counts of all held back repeats. '''
+        with self._lock:
+            pending = tuple( self._pending.values( ) )
+            self._pending.clear( )
+            with _pending_deduplicators_lock:
+                _pending_deduplicators.pop( id( self ), None )
+            for run in pending: run.summarize( )
+
+    def print(
+        self,
+        debugger: 'Debugger',
+        frame: __.types.FrameType,
+        text: str,
+        prefix: str = '',
+    ) -> None:
+        ''' Prints text, unless it repeats previous text from call site.
+
+            Comparison excludes prefix, with which text begins, so that
+            volatile prefixes, such as timestamps, do not defeat it.
+        '''
+        index = (
+            debugger.module_name, debugger.flavor,
+            ( frame.f_code, frame.f_lasti ) )
+        now = __.time.monotonic( )
+        digest = hash(
+            text[ len( prefix ) : ] if text.startswith( prefix ) else text )
+        with self._lock:
+            run = self._sites.get( index )
+            if run is not None and run.digest == digest:
+                run.repeats += 1
+                if index not in self._pending:
+                    if not self._pending:
+                        _register_pending_deduplicator( self )
+                    self._pending[ index ] = run
+                self._summarize_expirations( now )
+                return
+            if run is not None and self._pending.pop( index, None ):
+                run.summarize( )
+            if self._pending: self._summarize_expirations( now )
+            self._sites.pop( index, None )
+            if len( self._sites ) >= _deduplicator_sites_maximum:
+                self._forget_oldest_site( )
+            self._sites[ index ] = SiteRepetition( debugger, digest, now )
+            debugger.outputFunction( text )
+
+    def _forget_oldest_site( self ) -> None:
+        index = next( iter( self._sites ) )
+        run = self._sites.pop( index )
+        if self._pending.pop( index, None ): run.summarize( )
+
+    def _summarize_expirations( self, now: float ) -> None:
+        timeout = self.timeout
+        for index, run in tuple( self._pending.items( ) ):
+            if now - run.started < timeout: continue
+            del self._pending[ index ]
+            run.summarize( )
+            run.started = now
+
+
+_deduplicator_sites_maximum = 1024
+_pending_deduplicators: dict[ int, Deduplicator ] = { }
+_pending_deduplicators_lock: __.threads.Lock = __.threads.Lock( )
+
+
+class SiteThrottle:
+    ''' Emission statistics and sampling stride for call site.
+
+        Plain class with slots, since it is updated on every emission.
+    '''
+
+    __slots__ = (
+        'attempts', 'emissions', 'noted', 'spent', 'started', 'stride' )
+
+    def __init__( self, started: float ) -> None:
+        self.attempts = 0
+        self.emissions = 0
+        self.noted = False
+        self.spent = 0.0
+        self.started = started
+        self.stride = 1
+
+
+class Throttler( __.immut.DataclassObject ):
+    ''' Samples down emissions from hot call sites.
+
+        Emission rate and time spent emitting are measured per call site
+        over windows of time. If a site exceeds either budget, then only
+        every Nth emission from it is admitted, where N doubles each window
+        until the site is within budget. N halves once the site is well
+        within budget. A notice is emitted, via the ``note`` flavor of this
+        package, the first time a site is throttled.
+    '''
+
+    rate_budget: __.typx.Annotated[
+        float,
+        __.typx.Doc( ''' Emissions per second allowed per call site. ''' ),
+    ] = 100.0
+    time_budget: __.typx.Annotated[
+        float,
+        __.typx.Doc(
+            ''' Fraction of wall-clock time allowed per call site. ''' ),
+    ] = 0.05
+    window: __.typx.Annotated[
+        float,
+        __.typx.Doc( ''' Duration, in seconds, of measurement window. ''' ),
+    ] = 1.0
+    _sites: dict[ CallSite, SiteThrottle ] = __.dcls.field(
+        default_factory = dict[ CallSite, SiteThrottle ] )
+
+    def admit( self, debugger: 'Debugger', frame: __.types.FrameType ) -> (
+        __.typx.Optional[ SiteThrottle ]
+    ):
+        ''' Returns statistics of call site, if emission is admitted. '''
+        now = __.time.monotonic( )
+        site = ( frame.f_code, frame.f_lasti )
+        state = self._sites.get( site )
+        if state is None:
+            state = self._sites[ site ] = SiteThrottle( now )
+        elif now - state.started >= self.window:
+            self._adjust( debugger, frame, state, now )
+        state.attempts += 1
+        if state.attempts % state.stride: return None
+        state.emissions += 1
+        return state
+
+    def _adjust(
+        self,
+        debugger: 'Debugger',
+        frame: __.types.FrameType,
+        state: SiteThrottle,
+        now: float,
+    ) -> None:
+        elapsed = now - state.started
+        rate = state.emissions / elapsed
+        share = state.spent / elapsed
+        if rate > self.rate_budget or share > self.time_budget:
+            state.stride *= 2
+            if not state.noted:
+                state.noted = True
+                _note_throttling( debugger, frame )
+        elif state.stride > 1 and (
+            2 * rate <= self.rate_budget and 2 * share <= self.time_budget
+        ): state.stride //= 2
+        state.attempts = state.emissions = 0
+        state.spent = 0.0
+        state.started = now
+
+
+class Debugger( _icecream.IceCreamDebugger ):
+    ''' Icecream debugger which is aware of its module and flavor.
+
+        Consults emission controls of its truck on each invocation.
+    '''
+
+    def __init__( # noqa: PLR0913
+        self, *,
+        flavor: _cfg.Flavor,
+        module_name: str,
+        control: __.typx.Optional[ _cfg.FormatterControl ] = None,
+        deduplicator: __.typx.Optional[ Deduplicator ] = None,
+        rate_limit: __.typx.Optional[ _cfg.RateLimit ] = None,
+        retrospector: __.typx.Optional[ Retrospector ] = None,
+        throttler: __.typx.Optional[ Throttler ] = None,
+        truck: __.typx.Any = None,
+        **nomargs: __.typx.Any,
+    ) -> None:
+        super( ).__init__( **nomargs )
+        self.control = control
+        self.flavor = flavor
+        self.module_name = module_name
+        self.truck = truck
+        self.emissions = 0
+        self.limiter = (
+            None if rate_limit is None
+            else RateLimiter( rate_limit.rate, rate_limit.burst ) )
+        self.deduplicator = deduplicator
+        self.retrospector = retrospector
+        self.throttler = throttler
+        self.retrospective_trigger = (
+            retrospector is not None and flavor in retrospector.triggers )
+
+    def __call__( self, *arguments: __.typx.Any ) -> __.typx.Any:
+        if (    self.enabled
+            or  self.retrospector is not None
+            or  _activation_overlay.get( ) is not None
+        ): # Inlined engagement check for fast path.
+            frame = __.inspect.currentframe( ).f_back # pyright: ignore
+            self._dispatch( frame, arguments ) # pyright: ignore
+        if not arguments: return None
+        if 1 == len( arguments ): return arguments[ 0 ]
+        return arguments
+
+    def every( self, count: int ) -> __.cabc.Callable[ ..., __.typx.Any ]:
+        ''' Emits on first and then every Nth invocation from call site.
+
+            Returns debugger or, for suppressed invocations, a function
+            which merely passes its arguments through. Count must be
+            positive.
+        '''
+        if count < 1:
+            raise _exceptions.ArgumentValueInvalidity(
+                'count', count, 'at least 1' )
+        if not self._engaged( ): return self
+        frame = __.inspect.currentframe( ).f_back # pyright: ignore
+        site = ( frame.f_code, frame.f_lasti ) # pyright: ignore
+        with _sites_lock:
+            tally = _sites_tallies.get( site, 0 )
+            _sites_tallies[ site ] = tally + 1
+        return _pass_through if tally % count else self
+
+    def first( self, count: int ) -> __.cabc.Callable[ ..., __.typx.Any ]:
+        ''' Emits on first N invocations from call site.
+
+            Returns debugger or, for suppressed invocations, a function
+            which merely passes its arguments through. Count must be
+            positive.
+        '''
+        if count < 1:
+            raise _exceptions.ArgumentValueInvalidity(
+                'count', count, 'at least 1' )
+        if not self._engaged( ): return self
+        frame = __.inspect.currentframe( ).f_back # pyright: ignore
+        site = ( frame.f_code, frame.f_lasti ) # pyright: ignore
+        with _sites_lock:
+            tally = _sites_tallies.get( site, 0 )
+            if tally >= count: return _pass_through
+            _sites_tallies[ site ] = tally + 1
+        return self
+
+    def once( self, *arguments: __.typx.Any ) -> __.typx.Any:
+        ''' Emits arguments only on first invocation from call site. '''
+        if not self._engaged( ): return _pass_through( *arguments )
+        frame = __.inspect.currentframe( ).f_back # pyright: ignore
+        site = ( frame.f_code, frame.f_lasti ) # pyright: ignore
+        with _sites_lock:
+            fresh = site not in _sites_tallies
+            if fresh: _sites_tallies[ site ] = 1
+        if fresh: self._dispatch( frame, arguments ) # pyright: ignore
+        return _pass_through( *arguments )
+
+    def per( self, seconds: float ) -> __.cabc.Callable[ ..., __.typx.Any ]:
+        ''' Emits at most once per interval from call site.
+
+            Returns debugger or, for suppressed invocations, a function
+            which merely passes its arguments through. Interval must be
+            positive.
+        '''
+        if not seconds > 0: # Also rejects NaN.
+            raise _exceptions.ArgumentValueInvalidity(
+                'seconds', seconds, 'positive' )
+        if not self._engaged( ): return self
+        frame = __.inspect.currentframe( ).f_back # pyright: ignore
+        site = ( frame.f_code, frame.f_lasti ) # pyright: ignore
+        now = __.time.monotonic( )
+        with _sites_lock:
+            then = _sites_times.get( site )
+            if then is not None and now - then < seconds:
+                return _pass_through
+            _sites_times[ site ] = now
+        return self
+
+    def _dispatch(
+        self, frame: __.types.FrameType, arguments: tuple[ __.typx.Any, ... ]
+    ) -> None:
+        if self.enabled or (
+            ( overlay := _activation_overlay.get( ) ) is not None
+            and overlay.assess( self )
+        ):
+            if self.throttler is None: self._emit( frame, arguments )
+            else: self._emit_throttled( frame, arguments )
+        elif self.retrospector is not None:
+            self.retrospector.capture(
+                capture_record( self, frame, arguments ) )
+
+    def _engaged( self ) -> bool:
+        return (
+                self.enabled
+            or  self.retrospector is not None
+            or  _activation_overlay.get( ) is not None )
+
+    def _emit(
+        self, frame: __.types.FrameType, arguments: tuple[ __.typx.Any, ... ]
+    ) -> None:
+        limiter = self.limiter
+        if limiter is not None:
+            if not limiter.admit( ): return
+            if limiter.suppressions: self._report_suppressions( limiter )
+        self.emissions += 1
+        scope = _buffered_scope.get( )
+        if scope is not None:
+            scope.retain( capture_record( self, frame, arguments ) )
+            return
+        if self.retrospective_trigger:
+            self.retrospector.flush( ) # pyright: ignore
+        deduplicator = self.deduplicator
+        if deduplicator is not None:
+            # Prefix is rendered separately, so that it can be discounted.
+            prefix = self.prefix
+            if callable( prefix ): prefix = prefix( )
+            text = capture_record( self, frame, arguments ).render( prefix )
+            deduplicator.print( self, frame, text, prefix )
+            return
+        token = _rendition.set( object( ) )
+        try: text = self._format( frame, *arguments )
+        finally: _rendition.reset( token )
+        self.outputFunction( text )
+
+    def _emit_throttled(
+        self, frame: __.types.FrameType, arguments: tuple[ __.typx.Any, ... ]
+    ) -> None:
+        state = self.throttler.admit( self, frame ) # pyright: ignore
+        if state is None: return
+        started = __.time.perf_counter( )
+        self._emit( frame, arguments )
+        state.spent += __.time.perf_counter( ) - started
+
+    def _report_suppressions( self, limiter: RateLimiter ) -> None:
+        count, limiter.suppressions = limiter.suppressions, 0
+        prefix = self.prefix
+        if callable( prefix ): prefix = prefix( )
+        self.outputFunction(
+            f"{prefix}{count} emissions suppressed by rate limit." )
+
+
+class ActivationOverlay( __.immut.DataclassObjectMutable ):
+    ''' Activates additional flavors and trace levels within a context.
+
+        Only debuggers vended by the associated truck are affected. Activation
+        is tracked by context variable, so it applies only to the current
+        thread or asyncio task and to tasks spawned from it. Nested overlays
+        add to the activations of enclosing overlays.
+
+        Overlays can only activate debuggers; debuggers which are active
+        according to their truck remain active.
+    '''
+
+    truck: __.typx.Annotated[
+        __.typx.Any,
+        __.typx.Doc( ''' Truck which vends affected debuggers. ''' ),
+    ]
+    assessor: __.typx.Annotated[
+        __.cabc.Callable[ [ str, _cfg.Flavor ], bool ],
+        __.typx.Doc(
+            ''' Is flavor for module activated by overlay? ''' ),
+    ]
+    _assessments: dict[ tuple[ str, _cfg.Flavor ], bool ] = __.dcls.field(
+        default_factory = dict[ tuple[ str, _cfg.Flavor ], bool ] )
+    _parent: __.typx.Any = None
+    _token: __.typx.Optional[ __.ctxv.Token[ __.typx.Any ] ] = None
+
+    def __enter__( self ) -> __.typx.Self:
+        self._parent = _activation_overlay.get( )
+        self._token = _activation_overlay.set( self )
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[ BaseException ] | None,
+        exc_value: BaseException | None,
+        traceback: __.types.TracebackType | None,
+    ) -> None:
+        if self._token is not None: _activation_overlay.reset( self._token )
+        self._token = None
+        self._parent = None
+
+    def assess( self, debugger: Debugger ) -> bool:
+        ''' Is debugger activated by this overlay or enclosing overlays? '''
+        if debugger.truck is self.truck:
+            index = ( debugger.module_name, debugger.flavor )
+            assessment = self._assessments.get( index )
+            if assessment is None:
+                assessment = self.assessor( *index )
+                self._assessments[ index ] = assessment
+            if assessment: return True
+        parent = self._parent
+        return parent is not None and parent.assess( debugger )
+
+
+_activation_overlay: __.ctxv.ContextVar[
+    __.typx.Optional[ ActivationOverlay ]
+] = __.ctxv.ContextVar(
+    f"{__.package_name}.activation_overlay", default = None )
+
+
+def capture_record(
+    debugger: _icecream.IceCreamDebugger,
+    frame: __.types.FrameType,
+    arguments: tuple[ __.typx.Any, ... ],
+) -> Record:
+    ''' Captures emission from frame of invoker for deferred rendering. '''
+    context = (
+        debugger._formatContext( frame ) # noqa: SLF001
+        if debugger.includeContext or not arguments else '' )
+    time = '' if arguments else debugger._formatTime( ) # noqa: SLF001
+    return Record(
+        debugger = debugger,
+        arguments = arguments,
+        labels = _discover_argument_labels( frame, len( arguments ) ),
+        context = context,
+        time = time )
+
+
+def current_buffered_scope( ) -> __.typx.Optional[ BufferedScope ]:
+    ''' Returns innermost buffered scope of current context, if any.
+
+        Useful for keeping buffer from code which is deep within scope, such
+        as within function decorated with buffered scope.
+    '''
+    return _buffered_scope.get( )
+
+
+def current_rendition( ) -> __.typx.Optional[ object ]:
+    ''' Returns marker of emission being rendered in current context, if any.
+
+        Marker is distinct for each rendering of an emission. Useful for
+        formatters which decorate emissions rather than individual arguments,
+        such as with tracebacks, and so should do so only once per emission.
+    '''
+    return _rendition.get( )
+
+
+def emit_record( record: Record ) -> None:
+    ''' Prints captured emission or passes it to current buffered scope. '''
+    scope = _buffered_scope.get( )
+    if scope is not None: scope.retain( record )
+    else: record.debugger.outputFunction( record.render( ) )
+
+
+def _discover_argument_labels(
+    frame: __.types.FrameType, count: int
+) -> ArgumentLabels:
+    index = ( frame.f_code, frame.f_lasti )
+    labels = _labels_cache.get( index )
+    if labels is not None: return labels
+    node = _icecream.Source.executing( frame ).node
+    if node is None: # pyright: ignore[reportUnnecessaryComparison]
+        labels = ( _icecream.Sentinel.absent, ) * count
+    else:
+        source = __.typx.cast(
+            _icecream.Source, _icecream.Source.for_frame( frame ) )
+        labels = tuple(
+            source.get_text_with_indentation( argument )
+            for argument in node.args ) # pyright: ignore
+        _labels_cache[ index ] = labels
+    return labels
+
+
+def _flush_pending_deduplicators( ) -> None:
+    with _pending_deduplicators_lock:
+        deduplicators = tuple( _pending_deduplicators.values( ) )
+        _pending_deduplicators.clear( )
+    for deduplicator in deduplicators: deduplicator.flush( )
+
+
+def _note_throttling(
+    debugger: Debugger, frame: __.types.FrameType
+) -> None:
+    truck = debugger.truck
+    if truck is None: return
+    site = f"{frame.f_code.co_filename}:{frame.f_lineno}"
+    truck( 'note', module_name = __name__ )(
+        'Throttling emissions from hot call site.', site )
+
+
+def _pass_through( *arguments: __.typx.Any ) -> __.typx.Any:
+    if not arguments: return None
+    if 1 == len( arguments ): return arguments[ 0 ]
+    return arguments
+
+
+def _register_pending_deduplicator( deduplicator: Deduplicator ) -> None:
+    # Only deduplicators with held back repeats are retained for exit.
+    with _pending_deduplicators_lock:
+        _pending_deduplicators[ id( deduplicator ) ] = deduplicator
+
+
+_atexit.register( _flush_pending_deduplicators )
@@ -36,6 +36,14 @@ class Omnierror( Omniexception, Exception ):
     ''' Base for error exceptions raised by package API. '''
 
 
+class ActivationSpecificationInvalidity( Omnierror, ValueError ):
+    ''' Activation specification in file is invalid. '''
+
+    def __init__( self, location: str, line: str ):
+        super( ).__init__(
+            f"Invalid activation specification {line!r} in {location!r}." )
+
+
 class ArgumentClassInvalidity( Omnierror, TypeError ):
     ''' Argument class is invalid. '''
 
@@ -47,6 +55,14 @@ class ArgumentClassInvalidity( Omnierror, TypeError ):
             f"Argument {name!r} must be an instance of {cnames}." )
 
 
+class ArgumentValueInvalidity( Omnierror, ValueError ):
+    ''' Argument value is invalid. '''
+
+    def __init__( self, name: str, value: __.typx.Any, requirement: str ):
+        super( ).__init__(
+            f"Argument {name!r} must be {requirement}. Got: {value!r}" )
+
+
 class AttributeNondisplacement( Omnierror, AttributeError ):
     ''' Cannot displace existing attribute. '''
 
@@ -55,6 +71,14 @@ class AttributeNondisplacement( Omnierror, AttributeError ):
             f"Cannot displace attribute {name!r} on: {object_}" )
 
 
+class ControlRequestFailure( Omnierror, RuntimeError ):
+    ''' Control server could not fulfill request. '''
+
+    def __init__( self, command: str, reason: str ):
+        super( ).__init__(
+            f"Control command {command!r} failed. Reason: {reason}" )
+
+
 class FlavorInavailability( Omnierror, ValueError ):
     ''' Requested flavor is not available. '''
 
@@ -62,6 +86,29 @@ class FlavorInavailability( Omnierror, ValueError ):
         super( ).__init__( f"Flavor {flavor!r} is not available." )
 
 
+class FlightRecorderAbsence( Omnierror, ValueError ):
+    ''' Flight recorder file is not available. '''
+
+    def __init__( self ):
+        super( ).__init__( "No flight recorder file is available." )
+
+
+class FlightRecorderCapacityInvalidity( Omnierror, ValueError ):
+    ''' Capacity of flight recorder is invalid. '''
+
+    def __init__( self, capacity: int ):
+        super( ).__init__(
+            f"Flight recorder capacity must be at least 2 bytes. "
+            f"Got: {capacity}" )
+
+
+class FlightRecordingInvalidity( Omnierror, ValueError ):
+    ''' Flight recording is invalid or corrupt. '''
+
+    def __init__( self, location: str ):
+        super( ).__init__( f"Invalid flight recording: {location!r}" )
+
+
 class ModuleInferenceFailure( Omnierror, RuntimeError ):
     ''' Failure to infer invoking module from call stack. '''
 
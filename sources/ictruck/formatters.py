@@ -0,0 +1,646 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+
+''' Formatter factories and auxiliary functions and types. '''
+
+
+
+from . import __
+from . import configuration as _cfg
+from . import exceptions as _exceptions
+
+
+_validate_arguments = (
+    __.validate_arguments(
+        globalvars = globals( ),
+        errorclass = _exceptions.ArgumentClassInvalidity ) )
+
+
+class TypeDispatcher:
+    ''' Formats values with formatters registered for their types.
+
+        Formatters are resolved along method resolution order of type of
+        each value. Resolutions are cached per type, so that each type is
+        resolved once. Values of unregistered types are formatted by
+        fallback formatter.
+
+        Plain class with slots, since it is invoked for every argument.
+    '''
+
+    __slots__ = ( 'fallback', 'registry', 'resolutions' )
+
+    def __init__(
+        self,
+        registry: __.cabc.Mapping[ type, _cfg.Formatter ],
+        fallback: _cfg.Formatter,
+    ) -> None:
+        self.fallback = fallback
+        self.registry = registry
+        self.resolutions: dict[ type, _cfg.Formatter ] = { }
+
+    def __call__( self, value: __.typx.Any ) -> str:
+        vtype: type = value.__class__
+        formatter = self.resolutions.get( vtype )
+        if formatter is None:
+            formatter = self.resolutions[ vtype ] = self.resolve( vtype )
+        return formatter( value )
+
+    def resolve( self, vtype: type ) -> _cfg.Formatter:
+        ''' Finds formatter for type along its method resolution order. '''
+        registry = self.registry
+        for base in vtype.__mro__:
+            if base in registry: return registry[ base ]
+        return self.fallback
+
+
+class ReprBudget( __.immut.DataclassObject ):
+    ''' Limits on representations produced by safe formatter. '''
+
+    characters: __.typx.Annotated[
+        int,
+        __.typx.Doc( ''' Maximum length of entire representation. ''' ),
+    ] = 4096
+    depth: __.typx.Annotated[
+        int, __.typx.Doc( ''' Maximum nesting depth of containers. ''' )
+    ] = 6
+    elements: __.typx.Annotated[
+        int,
+        __.typx.Doc( ''' Maximum number of elements shown per container. ''' ),
+    ] = 64
+    strings: __.typx.Annotated[
+        __.typx.Optional[ int ],
+        __.typx.Doc(
+            ''' Maximum length of each string, bytes, or scalar repr.
+
+                If ``None``, then the effective columns count from the
+                formatter control is used, if available.
+            ''' ),
+    ] = None
+
+
+class RecordFormatter:
+    ''' Formats records with renderers generated per class.
+
+        Records are dataclasses, named tuples, and classes with slots, which
+        have generated or inherited representations. On first sight of each
+        record class, a renderer is compiled from its fields, with labels and
+        attribute accessors inlined, so that each subsequent rendering is a
+        single straight-line call. Values of other classes, including ones
+        with handwritten representations, are formatted by fallback
+        formatter.
+
+        Plain class with slots, since it is invoked for every argument.
+    '''
+
+    __slots__ = (
+        'exclusions', 'fallback', 'inclusions', 'renderers', 'represent' )
+
+    def __init__(
+        self,
+        fallback: _cfg.Formatter,
+        inclusions: __.typx.Optional[ __.cabc.Collection[ str ] ] = None,
+        exclusions: __.cabc.Collection[ str ] = ( ),
+        strings: __.typx.Optional[ int ] = None,
+    ) -> None:
+        self.exclusions = frozenset( exclusions )
+        self.fallback = fallback
+        self.inclusions = (
+            None if inclusions is None else frozenset( inclusions ) )
+        self.renderers: dict[ type, _cfg.Formatter ] = { }
+        self.represent: _cfg.Formatter = (
+            repr if strings is None
+            else __.funct.partial( _represent_bounded, strings ) )
+
+    def __call__( self, value: __.typx.Any ) -> str:
+        vtype: type = value.__class__
+        renderer = self.renderers.get( vtype )
+        if renderer is None:
+            renderer = self.renderers[ vtype ] = self.compile( vtype )
+        return renderer( value )
+
+    def compile( self, vtype: type ) -> _cfg.Formatter:
+        ''' Generates renderer for class or returns fallback formatter. '''
+        fields = _discover_record_fields( vtype )
+        if fields is None: return self.fallback
+        inclusions, exclusions = self.inclusions, self.exclusions
+        fields = tuple(
+            ( label, attribute, slotted )
+            for label, attribute, slotted in fields
+            if label not in exclusions
+            and ( inclusions is None or label in inclusions ) )
+        terms: list[ str ] = [ ]
+        prefix = f"{vtype.__qualname__}("
+        for i, ( label, attribute, slotted ) in enumerate( fields ):
+            terms.append( repr( f"{prefix if not i else ', '}{label}=" ) )
+            accessor = (
+                f"getattr( value, {attribute!r}, unset )" if slotted
+                else f"value.{attribute}" )
+            terms.append( f"represent( {accessor} )" )
+        terms.append( repr( ')' if fields else f"{prefix})" ) )
+        source = (
+            "def render( value ):\n"
+            f"    return {' + '.join( terms )}\n" )
+        namespace: dict[ str, __.typx.Any ] = dict(
+            represent = self.represent, unset = _unset_slot )
+        exec( compile( # noqa: S102
+            source, f"<ictruck record renderer: {vtype.__qualname__}>",
+            'exec' ), namespace )
+        return namespace[ 'render' ]
+
+
+scalar_formatters: __.typx.Annotated[
+    _cfg.TypeFormattersRegistry,
+    __.typx.Doc(
+        ''' Fast formatters for common scalar types.
+
+            Renders strings, bytes, integers, floats, and ``None`` via
+            :py:func:`repr`, bypassing more elaborate formatters, such as
+            ones from Rich. Can be supplied as, or merged into, type
+            formatters of a configuration.
+        ''' ),
+] = __.immut.Dictionary( {
+    bytes: repr, float: repr, int: repr, str: repr, type( None ): repr } )
+
+
+@_validate_arguments
+def produce_array_formatter(
+    control: _cfg.FormatterControl,
+    mname: str,
+    flavor: _cfg.Flavor,
+    edge: int = 3,
+    fallback: __.Absential[ _cfg.FormatterFactory ] = __.absent,
+) -> _cfg.Formatter:
+    ''' Produces formatter which summarizes arrays and data frames.
+
+        Array-like values are rendered as shape, data type, memory size,
+        minimum, maximum, and mean, and a few elements from the head and
+        tail. Their full representations are never produced.
+
+        NumPy and Pandas are never imported; their types are recognized only
+        if already imported by the application. Other array-like values are
+        recognized by their ``__array__`` method and ``shape`` attribute.
+
+        Other values are rendered by formatter from fallback factory, which
+        defaults to :py:func:`produce_safe_formatter`.
+    '''
+    if __.is_absent( fallback ): fallback = produce_safe_formatter
+    return __.funct.partial(
+        _format_array_or, edge, fallback( control, mname, flavor ) )
+
+
+@_validate_arguments
+def produce_hexdump_formatter(
+    control: _cfg.FormatterControl,
+    mname: str,
+    flavor: _cfg.Flavor,
+    window: int = 256,
+    fallback: __.Absential[ _cfg.FormatterFactory ] = __.absent,
+) -> _cfg.Formatter:
+    ''' Produces formatter which renders byte buffers as hexdumps.
+
+        Bytes, byte arrays, and memory views are rendered as
+        offset, hexadecimal, and ASCII columns for at most ``window`` bytes,
+        split between head and tail of buffer. Buffers are accessed through
+        memory view slices, so that large buffers cost only as much as the
+        rendered window. Bytes per line are fitted to effective columns
+        count from the formatter control, if available.
+
+        Other values are rendered by formatter from fallback factory, which
+        defaults to :py:func:`produce_safe_formatter`.
+    '''
+    if __.is_absent( fallback ): fallback = produce_safe_formatter
+    width = _calculate_hexdump_width( control.columns_count_effective )
+    return __.funct.partial(
+        _format_buffer_or, window, width, fallback( control, mname, flavor ) )
+
+
+@_validate_arguments
+def produce_record_formatter( # noqa: PLR0913
+    control: _cfg.FormatterControl,
+    mname: str,
+    flavor: _cfg.Flavor,
+    inclusions: __.Absential[ __.cabc.Collection[ str ] ] = __.absent,
+    exclusions: __.cabc.Collection[ str ] = ( ),
+    fallback: __.Absential[ _cfg.FormatterFactory ] = __.absent,
+    strings: __.typx.Optional[ int ] = None,
+) -> _cfg.Formatter:
+    ''' Produces formatter with generated renderers for records.
+
+        Dataclasses, named tuples, and classes with slots are rendered by
+        functions generated and cached per class. Only included fields, if
+        inclusions are supplied, and no excluded fields are rendered. Field
+        representations are truncated to the supplied maximum length or,
+        if none is supplied, to the effective columns count from the
+        formatter control, if available.
+
+        Other values are rendered by formatter from fallback factory, which
+        defaults to :py:func:`produce_safe_formatter`.
+
+        Use with :py:func:`functools.partial` to supply field selections
+        or maximum length.
+    '''
+    if __.is_absent( fallback ): fallback = produce_safe_formatter
+    if strings is None: strings = control.columns_count_effective
+    return RecordFormatter(
+        fallback( control, mname, flavor ),
+        inclusions = None if __.is_absent( inclusions ) else inclusions,
+        exclusions = exclusions,
+        strings = strings )
+
+
+@_validate_arguments
+def produce_safe_formatter(
+    control: _cfg.FormatterControl,
+    mname: str,
+    flavor: _cfg.Flavor,
+    budget: __.Absential[ ReprBudget ] = __.absent,
+) -> _cfg.Formatter:
+    ''' Produces formatter which renders values within budget.
+
+        Containers are rendered incrementally, so that huge containers cost
+        only as much as the rendered portion. Mappings, sets, and sequences,
+        other than builtin ones, are labeled with names of their classes,
+        such as ``deque([1, 2])``. Omitted elements are indicated
+        by ``...(N more)`` markers. Cycles are rendered as ``...``.
+        Exceptions from ``__repr__`` of values are rendered as placeholders.
+
+        Use with :py:func:`functools.partial` to supply a custom budget.
+    '''
+    if __.is_absent( budget ): budget = ReprBudget( )
+    strings = budget.strings
+    if strings is None: strings = control.columns_count_effective
+    return __.funct.partial( render_safely, budget, strings )
+
+
+def is_array_like( value: __.typx.Any ) -> bool:
+    ''' Is value an array, data frame, or similar? '''
+    vtype: type = value.__class__
+    numpy = __.sys.modules.get( 'numpy' )
+    if numpy is not None and isinstance( value, numpy.ndarray ): return True
+    pandas = __.sys.modules.get( 'pandas' )
+    if pandas is not None and isinstance(
+        value, ( pandas.DataFrame, pandas.Series )
+    ): return True
+    return hasattr( vtype, '__array__' ) and hasattr( vtype, 'shape' )
+
+
+def render_hexdump(
+    value: __.typx.Any, window: int = 256, width: int = 16
+) -> str:
+    ''' Renders byte buffer as hexdump within window of bytes.
+
+        Buffer must support the buffer protocol. Buffers with multiple
+        dimensions or with items other than bytes must be contiguous.
+    '''
+    view = memoryview( value )
+    if view.format != 'B' or view.ndim != 1: view = view.cast( 'B' )
+    size = view.nbytes
+    lines = [ f"{type( value ).__qualname__}(nbytes={size})" ]
+    if size <= window:
+        _render_hexdump_lines( lines, view, 0, size, width )
+        return '\n'.join( lines )
+    head = window // 2
+    head -= head % width
+    tail_start = size - ( window - head )
+    tail_start += -tail_start % width
+    _render_hexdump_lines( lines, view, 0, head, width )
+    lines.append( f"... ({tail_start - head} bytes elided) ..." )
+    _render_hexdump_lines( lines, view, tail_start, size, width )
+    return '\n'.join( lines )
+
+
+def render_safely(
+    budget: ReprBudget,
+    strings: __.typx.Optional[ int ],
+    value: __.typx.Any,
+) -> str:
+    ''' Renders value within budget. '''
+    renderer = _SafeRenderer( budget, strings )
+    try: renderer.render( value, 0 )
+    except _BudgetExhaustion: renderer.parts.append( '...(truncated)' )
+    return ''.join( renderer.parts )
+
+
+def summarize_array( value: __.typx.Any, edge: int = 3 ) -> str:
+    ''' Summarizes array-like value without full conversion to text. '''
+    parts = [ f"shape={tuple( value.shape )}" ]
+    dtype = getattr( value, 'dtype', None )
+    if dtype is not None: parts.append( f"dtype={dtype}" )
+    # Data frames have data type per column rather than overall.
+    dtypes = None if dtype is not None else getattr( value, 'dtypes', None )
+    if dtypes is not None:
+        dtypes_names = sorted( set( map( str, dtypes ) ) )
+        parts.append( f"dtypes=[{', '.join( dtypes_names )}]" )
+    columns = getattr( value, 'columns', None )
+    if columns is not None: parts.append( f"columns={len( columns )}" )
+    nbytes = _measure_array( value )
+    if nbytes is not None: parts.append( f"nbytes={nbytes}" )
+    if getattr( dtype, 'kind', None ) in _numeric_kinds:
+        parts.extend( _summarize_array_statistics( value ) )
+    elif dtypes is not None:
+        parts.extend( _summarize_frame_statistics( value ) )
+    parts.extend( _sample_array( value, edge ) )
+    return f"{type( value ).__qualname__}({', '.join( parts )})"
+
+
+def _calculate_hexdump_width( columns: __.typx.Optional[ int ] ) -> int:
+    # Each line has 8-digit offset, 2 separator spaces, 3 columns per byte
+    # in hexadecimal, less 1 trailing space, 2 more separator spaces, and
+    # 2 bars around 1 column per byte in ASCII.
+    if columns is None: return 16
+    width = ( columns - 13 ) // 4
+    return max( 4, min( 32, width - width % 4 ) )
+
+
+def _classify_container(
+    vtype: type
+) -> __.typx.Optional[ tuple[ str, str, bool ] ]:
+    # Named tuples have informative representations of their own.
+    if hasattr( vtype, '_fields' ) and issubclass( vtype, tuple ): return None
+    if issubclass( vtype, _scalars_sequential ): return None
+    if issubclass( vtype, __.cabc.Mapping ): brackets, mapping = '{}', True
+    elif issubclass( vtype, __.cabc.Set ): brackets, mapping = '{}', False
+    elif issubclass( vtype, __.cabc.Sequence ): brackets, mapping = '[]', False
+    else: return None
+    name = vtype.__name__
+    return ( f"{name}({brackets[ 0 ]}", f"{brackets[ 1 ]})", mapping )
+
+
+def _discover_record_fields(
+    vtype: type
+) -> __.typx.Optional[ tuple[ tuple[ str, str, bool ], ... ] ]:
+    ''' Discovers labels and attributes of fields of record class.
+
+        Slots are flagged, since they may be unset on instances.
+    '''
+    if not _has_generated_repr( vtype ): return None
+    mro: tuple[ type, ... ] = vtype.__mro__
+    if tuple in mro:
+        names: __.typx.Optional[ tuple[ str, ... ] ] = (
+            getattr( vtype, '_fields', None ) )
+        if names is None: return None
+        return tuple( ( name, name, False ) for name in names )
+    if __.dcls.is_dataclass( vtype ):
+        return tuple(
+            ( field.name, field.name, False )
+            for field in __.dcls.fields( vtype ) if field.repr )
+    fields: list[ tuple[ str, str, bool ] ] = [ ]
+    for base in reversed( mro ):
+        slots = vars( base ).get( '__slots__', ( ) )
+        if isinstance( slots, str ): slots = ( slots, )
+        for name in slots:
+            if name in ( '__dict__', '__weakref__' ): continue
+            attribute = name
+            if name.startswith( '__' ) and not name.endswith( '__' ):
+                attribute = f"_{base.__name__.lstrip( '_' )}{name}"
+            fields.append( ( name, attribute, True ) )
+    return tuple( fields ) if fields else None
+
+
+def _format_array_or(
+    edge: int, fallback: _cfg.Formatter, value: __.typx.Any
+) -> str:
+    if is_array_like( value ): return summarize_array( value, edge )
+    return fallback( value )
+
+
+def _format_buffer_or(
+    window: int, width: int, fallback: _cfg.Formatter, value: __.typx.Any
+) -> str:
+    if isinstance( value, _buffers ):
+        try: return render_hexdump( value, window, width )
+        except ( TypeError, ValueError ): pass # non-contiguous
+    return fallback( value )
+
+
+def _has_generated_repr( vtype: type ) -> bool:
+    ''' Is representation of class inherited or generated for records?
+
+        Classes with handwritten representations, such as ones from the
+        standard library which merely have slots, keep them.
+    '''
+    represent: __.typx.Any = vtype.__repr__
+    if represent is object.__repr__: return True
+    code = getattr( represent, '__code__', None )
+    if code is None: return False
+    if code is _namedtuple_repr_code: return True
+    # Dataclasses generate representations via '__create_fn__'.
+    represent = getattr( represent, '__wrapped__', represent )
+    qname: str = getattr( represent, '__qualname__', '' )
+    return qname.startswith( '__create_fn__.' )
+
+
+def _measure_array( value: __.typx.Any ) -> __.typx.Optional[ int ]:
+    nbytes = getattr( value, 'nbytes', None )
+    if nbytes is not None: return int( nbytes )
+    measurer = getattr( value, 'memory_usage', None )
+    if measurer is None: return None
+    return int( measurer( deep = False ).sum( ) )
+
+
+def _render_hexdump_lines(
+    lines: list[ str ],
+    view: memoryview,
+    start: int,
+    stop: int,
+    width: int,
+) -> None:
+    column = 3 * width - 1
+    for offset in range( start, stop, width ):
+        chunk = view[ offset : min( offset + width, stop ) ]
+        text = chunk.tobytes( ).translate( _hexdump_ascii )
+        lines.append(
+            f"{offset:08x}  {chunk.hex( ' ' ):<{column}}  "
+            f"|{text.decode( 'ascii' )}|" )
+
+
+def _represent_bounded( strings: int, value: __.typx.Any ) -> str:
+    text = repr( value )
+    excess = len( text ) - strings
+    if excess > 0: return f"{text[ : strings ]}...({excess} more)"
+    return text
+
+
+def _sample_array( value: __.typx.Any, edge: int ) -> list[ str ]:
+    if hasattr( value, 'iloc' ):
+        count = len( value )
+        slicer = value.iloc
+    elif hasattr( value, 'flat' ):
+        count = int( value.size )
+        slicer = value.flat
+    else: return [ ]
+    def sample( selector: slice ) -> str:
+        sample = slicer[ selector ]
+        if hasattr( sample, 'to_numpy' ): sample = sample.to_numpy( )
+        return repr( sample.tolist( ) )
+    if count <= 2 * edge: return [ f"values={sample( slice( None ) )}" ]
+    return [
+        f"head={sample( slice( None, edge ) )}",
+        f"tail={sample( slice( -edge, None ) )}" ]
+
+
+def _summarize_array_statistics( value: __.typx.Any ) -> list[ str ]:
+    if not getattr( value, 'size', 0 ): return [ ]
+    try:
+        return [
+            f"min={_unbox_scalar( value.min( ) )!r}",
+            f"max={_unbox_scalar( value.max( ) )!r}",
+            f"mean={_unbox_scalar( value.mean( ) )!r}" ]
+    except Exception: return [ ]
+
+
+def _summarize_frame_statistics( value: __.typx.Any ) -> list[ str ]:
+    selector = getattr( value, 'select_dtypes', None )
+    if selector is None: return [ ]
+    try: numbers = selector( 'number' ).to_numpy( )
+    except Exception: return [ ]
+    return _summarize_array_statistics( numbers )
+
+
+def _unbox_scalar( value: __.typx.Any ) -> __.typx.Any:
+    # NumPy scalars have verbose representations in recent versions.
+    item = getattr( value, 'item', None )
+    return value if item is None else item( )
+
+
+_buffers = ( bytes, bytearray, memoryview )
+_hexdump_ascii = bytes(
+    code if ' ' <= chr( code ) <= '~' else ord( '.' )
+    for code in range( 256 ) )
+
+
+class _BudgetExhaustion( Exception ):
+    ''' Signals that character budget is exhausted. '''
+
+
+# Forms of containers are opener, closer, and whether container is mapping.
+# Forms of other containers are classified on first sight of their classes.
+_containers_forms: dict[
+    type, __.typx.Optional[ tuple[ str, str, bool ] ]
+] = {
+    dict: ( '{', '}', True ),
+    frozenset: ( 'frozenset({', '})', False ),
+    list: ( '[', ']', False ),
+    set: ( '{', '}', False ),
+    tuple: ( '(', ')', False ),
+}
+_numeric_kinds = frozenset( ( 'b', 'i', 'u', 'f' ) )
+_namedtuple_repr_code: __.types.CodeType = (
+    __.typx.NamedTuple( '_Record', [ ] ).__repr__.__code__ )
+_scalars_sequential = ( str, bytes, bytearray, memoryview, range )
+
+
+class _SafeRenderer:
+    ''' Renders representations incrementally with bounds. '''
+
+    __slots__ = ( 'active', 'budget', 'parts', 'size', 'strings' )
+
+    def __init__(
+        self, budget: ReprBudget, strings: __.typx.Optional[ int ]
+    ) -> None:
+        self.active: set[ int ] = set( )
+        self.budget = budget
+        self.parts: list[ str ] = [ ]
+        self.size = 0
+        self.strings = strings
+
+    def emit( self, text: str ) -> None:
+        ''' Appends text, unless budget is exhausted. '''
+        remainder = self.budget.characters - self.size
+        if len( text ) > remainder:
+            self.parts.append( text[ : max( remainder, 0 ) ] )
+            raise _BudgetExhaustion
+        self.parts.append( text )
+        self.size += len( text )
+
+    def render( self, value: __.typx.Any, depth: int ) -> None:
+        ''' Renders value at nesting depth. '''
+        vtype: type = value.__class__
+        if vtype in _containers_forms: form = _containers_forms[ vtype ]
+        else: form = _containers_forms[ vtype ] = _classify_container( vtype )
+        if form is None: self.emit( self.render_scalar( value ) )
+        else: self.render_container( value, depth, form )
+
+    def render_container(
+        self,
+        value: __.typx.Any,
+        depth: int,
+        form: tuple[ str, str, bool ],
+    ) -> None:
+        ''' Renders container, guarding against depth and cycles. '''
+        opener, closer, mapping = form
+        if not value:
+            # Empty sets have no literal form; braces denote dictionaries.
+            vtype: type = value.__class__
+            self.emit(
+                f"{vtype.__name__}()"
+                if issubclass( vtype, __.cabc.Set ) else opener + closer )
+            return
+        if depth >= self.budget.depth or id( value ) in self.active:
+            self.emit( f"{opener}...{closer}" )
+            return
+        self.active.add( id( value ) )
+        self.emit( opener )
+        try: self.render_elements( value, depth, mapping )
+        finally: self.active.discard( id( value ) )
+        if 1 == len( value ) and type( value ) is tuple: self.emit( ',' )
+        self.emit( closer )
+
+    def render_elements(
+        self, value: __.typx.Any, depth: int, mapping: bool
+    ) -> None:
+        ''' Renders elements of container up to elements budget. '''
+        limit = self.budget.elements
+        items: __.cabc.Iterable[ __.typx.Any ] = (
+            value.items( ) if mapping else value )
+        for i, item in enumerate( __.itert.islice( items, limit ) ):
+            if i: self.emit( ', ' )
+            if mapping:
+                self.render( item[ 0 ], depth + 1 )
+                self.emit( ': ' )
+                self.render( item[ 1 ], depth + 1 )
+            else: self.render( item, depth + 1 )
+        excess = len( value ) - limit
+        if excess > 0: self.emit( f", ...({excess} more)" )
+
+    def render_scalar( self, value: __.typx.Any ) -> str:
+        ''' Renders scalar, truncating long representations. '''
+        strings = self.strings
+        if strings is not None and isinstance( value, ( str, bytes ) ):
+            excess = len( value ) - strings
+            if excess > 0:
+                return f"{value[ : strings ]!r}...({excess} more)"
+        try: text = repr( value )
+        except Exception as exc:
+            return f"<{type( value ).__qualname__} repr failed: {exc!r}>"
+        if strings is not None and len( text ) > strings:
+            excess = len( text ) - strings
+            return f"{text[ : strings ]}...({excess} more)"
+        return text
+
+
+class _UnsetSlot:
+    ''' Marks slot without value on record instance. '''
+
+    def __repr__( self ) -> str: return '<unset>'
+
+
+_unset_slot = _UnsetSlot( )
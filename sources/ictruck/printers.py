@@ -22,6 +22,9 @@
 
 
 
+import mmap as _mmap
+import struct as _struct
+
 import colorama as _colorama
 
 from . import __
@@ -74,3 +77,178 @@ def _simple_print(
         print( _remove_ansi_c1_sequences( text ), file = target )
         return
     print( text, file = target )
+
+
+class FlightRecorder( __.immut.DataclassObject ):
+    ''' Circular record of output text in memory-mapped file.
+
+        Records are copied into the mapped region without system calls.
+        The mapping is shared with the file, so recorded text survives
+        crashes of the recording process. Can be used as context manager,
+        which closes recorder on exit.
+    '''
+
+    area: __.typx.Annotated[
+        _mmap.mmap,
+        __.typx.Doc( ''' Memory-mapped region of backing file. ''' ),
+    ]
+    capacity: __.typx.Annotated[
+        int, __.typx.Doc( ''' Size of ring, excluding header, in bytes. ''' )
+    ]
+    location: __.typx.Annotated[
+        __.typx.Optional[ str ],
+        __.typx.Doc( ''' Path to backing file, if known. ''' ),
+    ] = None
+    _lock: __.typx.Annotated[
+        __.threads.Lock, __.typx.Doc( ''' Access lock for write cursor. ''' )
+    ] = __.dcls.field( default_factory = __.threads.Lock )
+
+    def __enter__( self ) -> __.typx.Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[ BaseException ] | None,
+        exc_value: BaseException | None,
+        traceback: __.types.TracebackType | None,
+    ) -> None:
+        self.close( )
+
+    def close( self ) -> None:
+        ''' Synchronizes and unmaps region. Later records are discarded. '''
+        with self._lock:
+            if self.area.closed: return
+            self.area.flush( )
+            self.area.close( )
+
+    def flush( self ) -> None:
+        ''' Synchronizes mapped region with backing file. '''
+        with self._lock:
+            if not self.area.closed: self.area.flush( )
+
+    def record( self, text: str ) -> None:
+        ''' Copies text into ring as one record. '''
+        data = text.encode( errors = 'replace' ).replace(
+            _recorder_separator, b' ' ) + _recorder_separator
+        capacity = self.capacity
+        if len( data ) > capacity:
+            data = data[ : capacity - 1 ] + _recorder_separator
+        size = len( data )
+        area = self.area
+        with self._lock:
+            if area.closed: return
+            ( cursor, ) = _recorder_cursor.unpack_from(
+                area, _recorder_cursor_offset )
+            position = cursor % capacity
+            end = cursor + size
+            alignment = False
+            if end > capacity:
+                # Byte before oldest surviving byte is about to be
+                # overwritten by last byte of record. Remember whether it
+                # ends a record, so that decoders know whether oldest
+                # surviving record is whole.
+                index = _recorder_header.size + ( end - 1 ) % capacity
+                alignment = area[ index : index + 1 ] == _recorder_separator
+            head = min( size, capacity - position )
+            start = _recorder_header.size + position
+            area[ start : start + head ] = data[ : head ]
+            if head < size:
+                start = _recorder_header.size
+                area[ start : start + size - head ] = data[ head : ]
+            _recorder_cursor.pack_into(
+                area, _recorder_alignment_offset, alignment )
+            _recorder_cursor.pack_into( area, _recorder_cursor_offset, end )
+
+
+_recorder_capacity_minimum = 2
+_recorder_alignment_offset = 24
+_recorder_header = _struct.Struct( '<8sQQQ' )
+_recorder_cursor = _struct.Struct( '<Q' )
+_recorder_cursor_offset = 16
+_recorder_magic = b'ICTRRING'
+_recorder_separator = b'\x1e'
+
+
+def decode_flight_recording( location: str ) -> tuple[ str, ... ]:
+    ''' Decodes records from flight recorder file in chronological order.
+
+        If the ring has wrapped, then the oldest record is discarded if it
+        has been partially overwritten.
+    '''
+    with open( location, 'rb' ) as file: data = file.read( )
+    if len( data ) < _recorder_header.size:
+        raise _exceptions.FlightRecordingInvalidity( location )
+    magic, capacity, cursor, alignment = (
+        _recorder_header.unpack_from( data ) )
+    if magic != _recorder_magic or not capacity:
+        raise _exceptions.FlightRecordingInvalidity( location )
+    ring = data[ _recorder_header.size : _recorder_header.size + capacity ]
+    if cursor <= capacity: content = ring[ : cursor ]
+    else:
+        position = cursor % capacity
+        content = ring[ position : ] + ring[ : position ]
+        if not alignment:
+            content = content[ content.find( _recorder_separator ) + 1 : ]
+    return tuple(
+        record.decode( errors = 'replace' )
+        for record in content.split( _recorder_separator )[ : -1 ] )
+
+
+@_validate_arguments
+def produce_flight_recorder(
+    location: str, capacity: int = 1 << 20
+) -> FlightRecorder:
+    ''' Produces flight recorder backed by file at location.
+
+        Existing recordings with the same capacity are continued.
+        Otherwise, the file is (re)initialized.
+    '''
+    if capacity < _recorder_capacity_minimum:
+        raise _exceptions.FlightRecorderCapacityInvalidity( capacity )
+    size = _recorder_header.size + capacity
+    with open( location, 'a+b' ) as file:
+        file.seek( 0 )
+        header = file.read( _recorder_header.size )
+        reusable = (
+                len( header ) == _recorder_header.size
+            and _recorder_header.unpack( header )[ : 2 ]
+                == ( _recorder_magic, capacity ) )
+        if not reusable:
+            file.truncate( 0 )
+            file.write(
+                _recorder_header.pack( _recorder_magic, capacity, 0, 0 ) )
+        file.truncate( size )
+        file.flush( )
+        area = _mmap.mmap( file.fileno( ), size )
+    return FlightRecorder(
+        area = area, capacity = capacity, location = location )
+
+
+@_validate_arguments
+def produce_recorder_printer(
+    recorder: FlightRecorder,
+    mname: str,
+    flavor: _cfg.Flavor,
+    force_color: bool = False,
+) -> Printer:
+    ''' Produces printer which copies text into flight recorder. '''
+    if force_color: return recorder.record
+    return lambda text: recorder.record( _remove_ansi_c1_sequences( text ) )
+
+
+@_validate_arguments
+def produce_routing_printer(
+    routes: __.cabc.Mapping[ _cfg.Flavor, PrinterFactoryUnion ],
+    default: PrinterFactoryUnion,
+    mname: str,
+    flavor: _cfg.Flavor,
+) -> Printer:
+    ''' Produces printer from factory which is selected by flavor.
+
+        E.g., errors can go to a standard stream while trace depths only go
+        to a flight recorder.
+    '''
+    factory = routes.get( flavor, default )
+    if isinstance( factory, __.io.TextIOBase ):
+        return __.funct.partial( print, file = factory )
+    return factory( mname, flavor )
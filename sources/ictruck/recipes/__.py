@@ -27,5 +27,7 @@
 from .. import exceptions
 from ..__ import *
 from ..configuration import *
+from ..debuggers import *
+from ..formatters import *
 from ..printers import *
 from ..vehicles import *
@@ -27,8 +27,12 @@
 
 
 
+import weakref as _weakref
+
 from rich.console import Console as _Console
+from rich.pretty import Pretty as _Pretty
 from rich.pretty import pretty_repr as _pretty_repr
+from rich.protocol import is_renderable as _is_renderable
 
 from . import __
 
@@ -46,11 +50,169 @@ class ConsoleTextIoInvalidity( __.exceptions.Omnierror, TypeError ):
         super( ).__init__( f"Invalid stream for Rich console: {stream!r}" )
 
 
+class AtomicWriter:
+    ''' Writes whole renditions to stream, one at a time.
+
+        Renditions are encoded by the calling threads and only the writing
+        of complete byte strings is serialized, so that output from
+        concurrent threads never interleaves within renditions.
+
+        Plain class with slots, since it is used for every emission.
+    '''
+
+    __slots__ = ( 'buffer', 'encoding', 'lock', 'stream' )
+
+    def __init__( self, stream: __.io.TextIOBase ) -> None:
+        self.buffer: __.typx.Optional[ __.typx.BinaryIO ] = (
+            getattr( stream, 'buffer', None ) )
+        self.encoding = getattr( stream, 'encoding', None ) or 'utf-8'
+        self.lock = __.threads.Lock( )
+        self.stream = stream
+
+    def write( self, text: str ) -> None:
+        ''' Writes text to stream as one unit. '''
+        buffer = self.buffer
+        if buffer is None:
+            with self.lock:
+                self.stream.write( text )
+                self.stream.flush( )
+            return
+        data = text.encode( self.encoding, errors = 'replace' )
+        with self.lock:
+            self.stream.flush( ) # Preserve order with text writes.
+            buffer.write( data )
+            buffer.flush( )
+
+
+class ThreadConsoles:
+    ''' Per-thread consoles which render into reusable buffers.
+
+        Each thread renders through its own console, which mirrors the
+        color system, theme, markup, emoji, highlighting, and other settings
+        of a template console, into its own text buffer, which is reset for
+        every rendering. Width is read from the template console on every
+        access, so that resizes are tracked. This avoids the capture context
+        of the template console and does not contend for its lock.
+
+        Plain class with slots, since it is used for every formatting.
+    '''
+
+    __slots__ = ( 'console', 'locals' )
+
+    def __init__( self, console: _Console ) -> None:
+        self.console = console
+        self.locals = __.threads.local( )
+
+    def access( self ) -> tuple[ _Console, __.io.StringIO ]:
+        ''' Returns console and buffer for current thread. '''
+        template = self.console
+        try: pair = self.locals.pair
+        except AttributeError:
+            pair = self.locals.pair = _produce_thread_console( template )
+        pair[ 0 ].width = template.width
+        return pair
+
+    def render( self, *renderables: __.typx.Any, end: str = '\n' ) -> str:
+        ''' Renders objects via console of current thread. '''
+        console, buffer = self.access( )
+        buffer.seek( 0 )
+        buffer.truncate( )
+        console.print( *renderables, end = end )
+        return buffer.getvalue( )
+
+
+class PrettyBudget( __.immut.DataclassObject ):
+    ''' Limits on renditions produced by Rich prettier. '''
+
+    max_depth: __.typx.Annotated[
+        __.typx.Optional[ int ],
+        __.typx.Doc( ''' Maximum nesting depth of containers. ''' ),
+    ] = 6
+    max_length: __.typx.Annotated[
+        __.typx.Optional[ int ],
+        __.typx.Doc( ''' Maximum number of elements shown per container. ''' ),
+    ] = 64
+    max_seconds: __.typx.Annotated[
+        __.typx.Optional[ float ],
+        __.typx.Doc(
+            ''' Maximum duration of rendition, in seconds.
+
+                Values of classes which have exceeded this duration are
+                rendered as truncated plain representations for a cooldown
+                period thereafter. If ``None``, then duration is not
+                measured.
+            ''' ),
+    ] = 0.1
+    max_string: __.typx.Annotated[
+        __.typx.Optional[ int ],
+        __.typx.Doc( ''' Maximum length of each string. ''' ),
+    ] = 4096
+    max_width: __.typx.Annotated[
+        __.typx.Optional[ int ],
+        __.typx.Doc(
+            ''' Maximum width of rendition in columns.
+
+                If ``None``, then the effective columns count from the
+                formatter control is used, if available, else 80 columns.
+                Ignored by console formatters, which use console widths.
+            ''' ),
+    ] = None
+
+
+class TimedFormatter:
+    ''' Falls back to cheaper formatter for classes which format slowly.
+
+        Each formatting is timed. Once formatting a value of some class has
+        exceeded the time budget, values of that class are passed to the
+        fallback formatter until the cooldown period has elapsed. Then,
+        formatting is timed again, so that one slow value does not demote
+        its class permanently.
+
+        Plain class with slots, since it is invoked for every argument.
+    '''
+
+    __slots__ = ( 'cooldown', 'demotions', 'fallback', 'formatter', 'seconds' )
+
+    def __init__(
+        self,
+        formatter: __.Formatter,
+        fallback: __.Formatter,
+        seconds: float,
+        cooldown: float = 60.0,
+    ) -> None:
+        self.cooldown = cooldown
+        self.demotions: dict[ type, float ] = { }
+        self.fallback = fallback
+        self.formatter = formatter
+        self.seconds = seconds
+
+    def __call__( self, value: __.typx.Any ) -> str:
+        vtype: type = value.__class__
+        demotions = self.demotions
+        if demotions and vtype in demotions:
+            if __.time.perf_counter( ) < demotions.get( vtype, 0.0 ):
+                return self.fallback( value )
+            demotions.pop( vtype, None )
+        start = __.time.perf_counter( )
+        text = self.formatter( value )
+        finish = __.time.perf_counter( )
+        if finish - start > self.seconds:
+            demotions[ vtype ] = finish + self.cooldown
+        return text
+
+
 class Modes( __.enum.Enum ):
     ''' Operation modes for Rich truck. '''
 
     Formatter = 'formatter'
     Printer = 'printer'
+    PooledPrinter = 'pooled-printer'
+
+
+_thread_consoles: _weakref.WeakKeyDictionary[
+    _Console, ThreadConsoles
+] = _weakref.WeakKeyDictionary( )
+_thread_consoles_lock = __.threads.Lock( )
 
 
 ProduceTruckModeArgument: __.typx.TypeAlias = __.typx.Annotated[
@@ -67,6 +229,19 @@ ProduceTruckModeArgument: __.typx.TypeAlias = __.typx.Annotated[
             sequences (e.g., terminal colorization), then it might be
             reprocessed by the printer, causing visual artifacts. Less safe,
             but more vibrant option.
+            ``PooledPrinter`` is like ``Printer``, but renders through
+            per-thread consoles and writes complete renditions atomically,
+            so that concurrent threads do not contend on one console.
+        ''' ),
+]
+ProduceTruckPrettyBudgetsArgument: __.typx.TypeAlias = __.typx.Annotated[
+    __.Absential[ PrettyBudget | __.cabc.Mapping[ __.Flavor, PrettyBudget ] ],
+    __.typx.Doc(
+        ''' Limits on renditions by Rich prettier.
+
+            Either one budget for all flavors or mapping of flavors to
+            budgets. Flavors absent from mapping use default budget. If
+            absent, then renditions are unlimited.
         ''' ),
 ]
 ProduceTruckStderrArgument: __.typx.TypeAlias = __.typx.Annotated[
@@ -82,6 +257,7 @@ def install( # noqa: PLR0913
     trace_levels: __.ProduceTruckTraceLevelsArgument = __.absent,
     mode: ProduceTruckModeArgument = Modes.Formatter,
     stderr: ProduceTruckStderrArgument = True,
+    pretty_budgets: ProduceTruckPrettyBudgetsArgument = __.absent,
 ) -> __.Truck:
     ''' Produces truck and installs it into builtins with alias.
 
@@ -94,7 +270,8 @@ def install( # noqa: PLR0913
         active_flavors = active_flavors,
         trace_levels = trace_levels,
         mode = mode,
-        stderr = stderr )
+        stderr = stderr,
+        pretty_budgets = pretty_budgets )
     return truck.install( alias = alias )
 
 
@@ -104,9 +281,20 @@ def produce_console_formatter(
     control: __.FormatterControl,
     mname: str,
     flavor: int | str,
+    budget: __.Absential[ PrettyBudget ] = __.absent,
 ) -> __.Formatter:
-    ''' Produces formatter which uses Rich highlighter and prettier. '''
-    return __.funct.partial( _console_format, console )
+    ''' Produces formatter which uses Rich highlighter and prettier.
+
+        Values are rendered through per-thread consoles, which mirror the
+        console, so that formatting threads do not serialize on it.
+
+        If budget is supplied, then renditions are limited by it.
+    '''
+    consoles = _access_thread_consoles( console )
+    if __.is_absent( budget ):
+        return __.funct.partial( _console_format, consoles )
+    formatter = __.funct.partial( _console_format_pretty, consoles, budget )
+    return _apply_time_budget( formatter, budget )
 
 
 @_validate_arguments
@@ -125,31 +313,69 @@ def produce_console_printer(
     return console.print
 
 
+@_validate_arguments
+def produce_pooled_console_printer(
+    console: _Console, writer: AtomicWriter, mname: str, flavor: __.Flavor
+) -> __.Printer:
+    ''' Produces printer which renders via per-thread consoles.
+
+        Consoles of threads mirror the console. Complete renditions are
+        passed to the writer.
+
+        .. note::
+
+            May reprocess ANSI SGR codes or markup from formatters, like
+            :py:func:`produce_console_printer`.
+    '''
+    return __.funct.partial(
+        _print_pooled, _access_thread_consoles( console ), writer )
+
+
 @_validate_arguments
 def produce_pretty_formatter(
-    control: __.FormatterControl, mname: str, flavor: int | str
+    control: __.FormatterControl,
+    mname: str,
+    flavor: int | str,
+    budget: __.Absential[ PrettyBudget ] = __.absent,
 ) -> __.Formatter:
-    ''' Produces formatter which uses Rich prettier. '''
-    return _pretty_repr
+    ''' Produces formatter which uses Rich prettier, optionally within budget.
+
+        Without budget, renditions are unlimited, as with
+        :py:func:`rich.pretty.pretty_repr`. Use with
+        :py:func:`functools.partial` to supply a budget.
+    '''
+    if __.is_absent( budget ): return _pretty_repr
+    max_width = budget.max_width
+    if max_width is None: max_width = control.columns_count_effective or 80
+    formatter = __.funct.partial(
+        _pretty_repr,
+        max_depth = budget.max_depth,
+        max_length = budget.max_length,
+        max_string = budget.max_string,
+        max_width = max_width )
+    return _apply_time_budget( formatter, budget )
 
 
 @_validate_arguments
-def produce_truck(
+def produce_truck( # noqa: PLR0913
     flavors: __.ProduceTruckFlavorsArgument = __.absent,
     active_flavors: __.ProduceTruckActiveFlavorsArgument = __.absent,
     trace_levels: __.ProduceTruckTraceLevelsArgument = __.absent,
     mode: ProduceTruckModeArgument = Modes.Formatter,
     stderr: ProduceTruckStderrArgument = True,
+    pretty_budgets: ProduceTruckPrettyBudgetsArgument = __.absent,
 ) -> __.Truck:
     ''' Produces icecream truck which integrates with Rich. '''
     match mode:
         case Modes.Formatter: factory = _produce_formatter_truck
         case Modes.Printer: factory = _produce_printer_truck
+        case Modes.PooledPrinter: factory = _produce_pooled_printer_truck
     return factory(
         flavors = flavors,
         active_flavors = active_flavors,
         trace_levels = trace_levels,
-        stderr = stderr )
+        stderr = stderr,
+        pretty_budgets = pretty_budgets )
 
 
 @_validate_arguments
@@ -158,6 +384,7 @@ def register_module(
     flavors: __.ProduceTruckFlavorsArgument = __.absent,
     include_context: __.RegisterModuleIncludeContextArgument = __.absent,
     prefix_emitter: __.RegisterModulePrefixEmitterArgument = __.absent,
+    pretty_budgets: ProduceTruckPrettyBudgetsArgument = __.absent,
 ) -> None:
     ''' Registers module with Rich prettier to format arguments.
 
@@ -167,15 +394,72 @@ def register_module(
     __.register_module(
         name = name,
         flavors = flavors,
-        formatter_factory = produce_pretty_formatter,
+        formatter_factory = _apply_pretty_budgets(
+            produce_pretty_formatter, pretty_budgets ),
         include_context = include_context,
         prefix_emitter = prefix_emitter )
 
 
-def _console_format( console: _Console, value: __.typx.Any ) -> str:
-    with console.capture( ) as capture:
-        console.print( value )
-    return capture.get( )
+def _access_thread_consoles( console: _Console ) -> ThreadConsoles:
+    with _thread_consoles_lock:
+        consoles = _thread_consoles.get( console )
+        if consoles is None:
+            consoles = _thread_consoles[ console ] = ThreadConsoles( console )
+    return consoles
+
+
+def _apply_pretty_budgets(
+    factory: __.typx.Callable[ ..., __.Formatter ],
+    budgets: ProduceTruckPrettyBudgetsArgument,
+) -> __.typx.Callable[ ..., __.Formatter ]:
+    if __.is_absent( budgets ): return factory
+    if isinstance( budgets, PrettyBudget ):
+        return __.funct.partial( factory, budget = budgets )
+    budgets_ = dict( budgets )
+    default = PrettyBudget( )
+
+    def produce_formatter(
+        *posargs: __.typx.Any, **nomargs: __.typx.Any
+    ) -> __.Formatter:
+        # Flavor is final positional argument of formatter factories.
+        flavor = posargs[ -1 ]
+        nomargs[ 'budget' ] = budgets_.get( flavor, default )
+        return factory( *posargs, **nomargs )
+
+    return produce_formatter
+
+
+def _apply_time_budget(
+    formatter: __.Formatter, budget: PrettyBudget
+) -> __.Formatter:
+    if budget.max_seconds is None: return formatter
+    fallback_budget = __.ReprBudget( **{
+        name: value for name, value in (
+            ( 'depth', budget.max_depth ),
+            ( 'elements', budget.max_length ) )
+        if value is not None } )
+    fallback = __.funct.partial(
+        __.render_safely, fallback_budget, budget.max_string )
+    return TimedFormatter( formatter, fallback, budget.max_seconds )
+
+
+def _console_format( consoles: ThreadConsoles, value: __.typx.Any ) -> str:
+    return consoles.render( value )
+
+
+def _console_format_pretty(
+    consoles: ThreadConsoles,
+    budget: PrettyBudget,
+    value: __.typx.Any,
+) -> str:
+    # Console renders other objects via its own prettier without limits.
+    if isinstance( value, str ) or _is_renderable( value ):
+        return consoles.render( value )
+    return consoles.render( _Pretty(
+        value,
+        max_depth = budget.max_depth,
+        max_length = budget.max_length,
+        max_string = budget.max_string ) )
 
 
 def _produce_formatter_truck(
@@ -183,13 +467,15 @@ def _produce_formatter_truck(
     active_flavors: __.ProduceTruckActiveFlavorsArgument = __.absent,
     trace_levels: __.ProduceTruckTraceLevelsArgument = __.absent,
     stderr: ProduceTruckStderrArgument = True,
+    pretty_budgets: ProduceTruckPrettyBudgetsArgument = __.absent,
 ) -> __.Truck:
     console = _Console( stderr = stderr )
     gc_nomargs = { }
     if not __.is_absent( flavors ): gc_nomargs[ 'flavors' ] = flavors
     generalcfg = __.VehicleConfiguration(
-        formatter_factory = __.funct.partial(
-            produce_console_formatter, console ),
+        formatter_factory = _apply_pretty_budgets(
+            __.funct.partial( produce_console_formatter, console ),
+            pretty_budgets ),
         **gc_nomargs ) # pyright: ignore
     target = __.sys.stderr if stderr else __.sys.stdout
     if not isinstance( target, __.io.TextIOBase ):
@@ -203,17 +489,52 @@ def _produce_formatter_truck(
     return __.produce_truck( **nomargs )
 
 
+def _print_pooled(
+    consoles: ThreadConsoles, writer: AtomicWriter, text: str
+) -> None:
+    writer.write( consoles.render( text ) )
+
+
+def _produce_pooled_printer_truck(
+    flavors: __.ProduceTruckFlavorsArgument = __.absent,
+    active_flavors: __.ProduceTruckActiveFlavorsArgument = __.absent,
+    trace_levels: __.ProduceTruckTraceLevelsArgument = __.absent,
+    stderr: ProduceTruckStderrArgument = True,
+    pretty_budgets: ProduceTruckPrettyBudgetsArgument = __.absent,
+) -> __.Truck:
+    console = _Console( stderr = stderr )
+    gc_nomargs = { }
+    if not __.is_absent( flavors ): gc_nomargs[ 'flavors' ] = flavors
+    generalcfg = __.VehicleConfiguration(
+        formatter_factory = _apply_pretty_budgets(
+            produce_pretty_formatter, pretty_budgets ),
+        **gc_nomargs ) # pyright: ignore
+    target = __.sys.stderr if stderr else __.sys.stdout
+    if not isinstance( target, __.io.TextIOBase ): # pragma: no cover
+        raise ConsoleTextIoInvalidity( target )
+    writer = AtomicWriter( target )
+    nomargs: dict[ str, __.typx.Any ] = dict(
+        active_flavors = active_flavors,
+        generalcfg = generalcfg,
+        printer_factory = __.funct.partial(
+            produce_pooled_console_printer, console, writer ),
+        trace_levels = trace_levels )
+    return __.produce_truck( **nomargs )
+
+
 def _produce_printer_truck(
     flavors: __.ProduceTruckFlavorsArgument = __.absent,
     active_flavors: __.ProduceTruckActiveFlavorsArgument = __.absent,
     trace_levels: __.ProduceTruckTraceLevelsArgument = __.absent,
     stderr: ProduceTruckStderrArgument = True,
+    pretty_budgets: ProduceTruckPrettyBudgetsArgument = __.absent,
 ) -> __.Truck:
     console = _Console( stderr = stderr )
     gc_nomargs = { }
     if not __.is_absent( flavors ): gc_nomargs[ 'flavors' ] = flavors
     generalcfg = __.VehicleConfiguration(
-        formatter_factory = produce_pretty_formatter,
+        formatter_factory = _apply_pretty_budgets(
+            produce_pretty_formatter, pretty_budgets ),
         **gc_nomargs ) # pyright: ignore
     target = __.sys.stderr if stderr else __.sys.stdout
     if not isinstance( target, __.io.TextIOBase ): # pragma: no cover
@@ -226,6 +547,33 @@ def _produce_printer_truck(
     return __.produce_truck( **nomargs )
 
 
+def _produce_thread_console(
+    template: _Console
+) -> tuple[ _Console, __.io.StringIO ]:
+    buffer = __.io.StringIO( )
+    console = _Console(
+        file = buffer,
+        color_system = template.color_system, # pyright: ignore
+        emoji = getattr( template, '_emoji', True ),
+        force_terminal = template.is_terminal,
+        highlight = getattr( template, '_highlight', True ),
+        highlighter = template.highlighter,
+        legacy_windows = template.legacy_windows,
+        markup = getattr( template, '_markup', True ),
+        no_color = template.no_color,
+        safe_box = template.safe_box,
+        soft_wrap = template.soft_wrap,
+        tab_size = template.tab_size,
+        width = template.width )
+    # Share theme stack, so that themes pushed onto template also apply.
+    # Theme stacks are thread-local, as are these consoles.
+    theme_stack = getattr( template, '_theme_stack', None )
+    locals_ = getattr( console, '_thread_locals', None )
+    if theme_stack is not None and locals_ is not None:
+        locals_.theme_stack = theme_stack
+    return console, buffer
+
+
 # def _produce_prefix( console: _Console, mname: str, flavor: _Flavor ) -> str:
 #     # TODO: Detect if terminal supports 256 colors or true color.
 #     #       Make spectrum of hues for trace depths, if so.
@@ -29,10 +29,16 @@
 
 
 
+import string as _string
+import traceback as _traceback
+
+from rich.color import ColorSystem as _ColorSystem
 from rich.console import Console as _Console
 from rich.style import Style as _Style
+from rich.traceback import Traceback as _Traceback
 
 from . import __
+from .rich import ThreadConsoles as _ThreadConsoles
 
 
 _validate_arguments = (
@@ -45,6 +51,80 @@ InterpolantsStylesRegistry: __.typx.TypeAlias = (
     __.accret.Dictionary[ str, _Style ] )
 
 
+def _discover_process_id( ) -> int:
+    ''' Returns ID of current process, cached until next fork. '''
+    return _process_id
+
+
+def _discover_thread( ) -> __.threads.Thread:
+    ''' Returns current thread, cached in thread-local storage. '''
+    try: return _thread_locals.thread
+    except AttributeError: pass
+    thread = _thread_locals.thread = __.threads.current_thread( )
+    return thread
+
+
+def _refresh_process_id( ) -> None:
+    global _process_id # noqa: PLW0603
+    _process_id = __.os.getpid( )
+
+
+_process_id = __.os.getpid( )
+_thread_locals = __.threads.local( )
+if hasattr( __.os, 'register_at_fork' ): # pragma: no branch
+    __.os.register_at_fork( after_in_child = _refresh_process_id )
+
+
+class TimestampProvider:
+    ''' Renders current time in format with fractional seconds.
+
+        Besides the directives of :py:func:`time.strftime`, formats may
+        contain one fractional seconds directive: ``%f`` for microseconds or
+        ``%Nf`` for ``N`` digits, such as ``%3f`` for milliseconds. The
+        portions of the rendition around the fraction are cached and only
+        reformatted once per second. The fraction is derived from
+        :py:func:`time.time_ns` for every rendition.
+
+        If ``elapsed`` is true, then monotonic seconds since creation of the
+        provider, with fractional digits per the format, are rendered
+        instead of the date and time.
+
+        Plain class with slots, since it is invoked for every prefix.
+    '''
+
+    __slots__ = ( 'elapsed', 'formats', 'origin', 'renditions' )
+
+    def __init__( self, elapsed: bool = False ) -> None:
+        self.elapsed = elapsed
+        self.formats: dict[ str, tuple[ str, str, int ] ] = { }
+        self.origin = __.time.monotonic_ns( )
+        self.renditions: dict[ str, tuple[ int, str, str ] ] = { }
+
+    def __call__( self, ts_format: str ) -> str:
+        compilation = self.formats.get( ts_format )
+        if compilation is None:
+            compilation = self.formats[ ts_format ] = (
+                _compile_timestamp_format( ts_format ) )
+        head, tail, digits = compilation
+        if self.elapsed:
+            seconds, fraction = divmod(
+                __.time.monotonic_ns( ) - self.origin, 1_000_000_000 )
+            if not digits: return str( seconds )
+            fraction //= 10 ** ( 9 - digits )
+            return f"{seconds}.{fraction:0{digits}d}"
+        seconds, fraction = divmod( __.time.time_ns( ), 1_000_000_000 )
+        rendition = self.renditions.get( ts_format )
+        if rendition is None or rendition[ 0 ] != seconds:
+            moment = __.time.localtime( seconds )
+            rendition = self.renditions[ ts_format ] = (
+                seconds,
+                __.time.strftime( head, moment ),
+                __.time.strftime( tail, moment ) if tail else '' )
+        if not digits: return rendition[ 1 ]
+        fraction //= 10 ** ( 9 - digits )
+        return f"{rendition[ 1 ]}{fraction:0{digits}d}{rendition[ 2 ]}"
+
+
 class Auxiliaries( __.immut.DataclassObject ):
     ''' Auxiliary functions used by formatters and interpolation.
 
@@ -59,15 +139,15 @@ class Auxiliaries( __.immut.DataclassObject ):
     pid_discoverer: __.typx.Annotated[
         __.typx.Callable[ [ ], int ],
         __.typx.Doc( ''' Returns ID of current process. ''' ),
-    ] = __.os.getpid
+    ] = _discover_process_id
     thread_discoverer: __.typx.Annotated[
         __.typx.Callable[ [ ], __.threads.Thread ],
         __.typx.Doc( ''' Returns current thread. ''' ),
-    ] = __.threads.current_thread
+    ] = _discover_thread
     time_formatter: __.typx.Annotated[
         __.typx.Callable[ [ str ], str ],
         __.typx.Doc( ''' Returns current time in specified format. ''' ),
-    ] = __.time.strftime
+    ] = __.dcls.field( default_factory = TimestampProvider )
 
 
 
@@ -78,6 +158,15 @@ class FlavorSpecification( __.immut.DataclassObject ):
         str, __.typx.Doc( ''' Name of prefix color. ''' ) ]
     emoji: __.typx.Annotated[ str, __.typx.Doc( ''' Prefix emoji. ''' ) ]
     label: __.typx.Annotated[ str, __.typx.Doc( ''' Prefix label. ''' ) ]
+    highlight_strings: __.typx.Annotated[
+        bool,
+        __.typx.Doc(
+            ''' Render plain strings via Rich?
+
+                If false, then plain strings are emitted verbatim, without
+                markup interpretation or highlighting.
+            ''' ),
+    ] = True
     stack: __.typx.Annotated[
         bool, __.typx.Doc( ''' Include stack trace? ''' )
     ] = False
@@ -140,7 +229,8 @@ class PrefixFormatControl( __.immut.DataclassObject ):
         __.typx.Doc(
             ''' String format for prefix timestamp.
 
-                Used by :py:func:`time.strftime` or equivalent.
+                Used by :py:func:`time.strftime` or equivalent, such as
+                :py:class:`TimestampProvider`, which also supports ``%f``.
             ''' ),
     ] = '%Y-%m-%d %H:%M:%S.%f'
 
@@ -158,6 +248,21 @@ ProduceModulecfgConsoleFactoryArgument: __.typx.TypeAlias = __.typx.Annotated[
     __.typx.Doc(
         ''' Factory function that produces Rich console instances. ''' ),
 ]
+ProduceModulecfgHighlightStringsArgument: __.typx.TypeAlias = (
+    __.typx.Annotated[
+        __.Absential[ bool ],
+        __.typx.Doc(
+            ''' Render plain strings via Rich for all flavors?
+
+                If absent, then flavor specifications decide. Trace levels
+                render plain strings via Rich by default.
+            ''' ),
+    ] )
+ProduceModulecfgPlainTracebacksArgument: __.typx.TypeAlias = __.typx.Annotated[
+    __.Absential[ bool ],
+    __.typx.Doc(
+        ''' Render tracebacks as plain text rather than via Rich? ''' ),
+]
 ProduceModulecfgPrefixLabelAsArgument: __.typx.TypeAlias = __.typx.Annotated[
     __.Absential[ PrefixLabelPresentations ],
     __.typx.Doc(
@@ -218,6 +323,27 @@ _trace_color_names: tuple[ str, ... ] = (
 _trace_prefix_styles: tuple[ _Style, ... ] = tuple(
     _Style( color = name ) for name in _trace_color_names )
 
+_TemplateSegment: __.typx.TypeAlias = tuple[
+    str, __.typx.Optional[ str ], __.typx.Optional[ str ],
+    __.typx.Optional[ str ] ]
+
+_VolatileSegment: __.typx.TypeAlias = tuple[
+    __.PrefixRenderer, str, str,
+    __.typx.Optional[ str ], __.typx.Optional[ str ], str ]
+
+_color_systems: __.immut.Dictionary[ str, _ColorSystem ] = (
+    __.immut.Dictionary( {
+        'standard': _ColorSystem.STANDARD,
+        '256': _ColorSystem.EIGHT_BIT,
+        'truecolor': _ColorSystem.TRUECOLOR,
+        'windows': _ColorSystem.WINDOWS,
+    } ) )
+_conversions: __.immut.Dictionary[
+    str, __.cabc.Callable[ [ __.typx.Any ], str ]
+] = __.immut.Dictionary( a = ascii, r = repr, s = str )
+_style_placeholder = '\x00'
+_timestamp_directives_regex = __.re.compile( r'''%%|%([1-9]?)f''' )
+
 
 def _produce_console( ) -> _Console: # pragma: no cover
     # TODO? safe_box = True
@@ -241,11 +367,19 @@ def produce_module_configuration( # noqa: PLR0913
     prefix_ts_format: ProduceModulecfgPrefixTsFormatArgument = __.absent,
     console_factory: ProduceModulecfgConsoleFactoryArgument = __.absent,
     auxiliaries: ProduceModulecfgAuxiliariesArgument = __.absent,
+    plain_tracebacks: ProduceModulecfgPlainTracebacksArgument = __.absent,
+    highlight_strings: ProduceModulecfgHighlightStringsArgument = __.absent,
 ) -> __.ModuleConfiguration:
-    ''' Produces module configuration with sundae-specific flavor settings. '''
+    ''' Produces module configuration with sundae-specific flavor settings.
+
+        Console is not produced until needed to format or stylize output.
+        Consoles are shared by configurations with the same console factory.
+    '''
     if __.is_absent( console_factory ): console_factory = _produce_console
     if __.is_absent( auxiliaries ): auxiliaries = Auxiliaries( )
-    console = console_factory( )
+    if __.is_absent( plain_tracebacks ): plain_tracebacks = False
+    # Console is produced on first use by an enabled debugger.
+    console = __.typx.cast( _Console, _ConsoleDeferral( console_factory ) )
     prefix_fmtctl_initargs: dict[ str, __.typx.Any ] = { }
     if not __.is_absent( colorize ):
         prefix_fmtctl_initargs[ 'colorize' ] = colorize
@@ -259,7 +393,8 @@ def produce_module_configuration( # noqa: PLR0913
         prefix_fmtctl_initargs[ 'ts_format' ] = prefix_ts_format
     prefix_fmtctl = PrefixFormatControl( **prefix_fmtctl_initargs )
     flavors = _produce_flavors( console, auxiliaries, prefix_fmtctl )
-    formatter_factory = _produce_formatter_factory( console, auxiliaries )
+    formatter_factory = _produce_formatter_factory(
+        console, auxiliaries, plain_tracebacks, highlight_strings )
     return __.ModuleConfiguration(
         flavors = flavors, formatter_factory = formatter_factory )
 
@@ -274,6 +409,8 @@ def register_module( # noqa: PLR0913
     prefix_ts_format: ProduceModulecfgPrefixTsFormatArgument = __.absent,
     console_factory: ProduceModulecfgConsoleFactoryArgument = __.absent,
     auxiliaries: ProduceModulecfgAuxiliariesArgument = __.absent,
+    plain_tracebacks: ProduceModulecfgPlainTracebacksArgument = __.absent,
+    highlight_strings: ProduceModulecfgHighlightStringsArgument = __.absent,
 ) -> __.ModuleConfiguration:
     ''' Registers module with sundae-specific flavor configurations. '''
     configuration = produce_module_configuration(
@@ -283,7 +420,9 @@ def register_module( # noqa: PLR0913
         prefix_template = prefix_template,
         prefix_ts_format = prefix_ts_format,
         console_factory = console_factory,
-        auxiliaries = auxiliaries )
+        auxiliaries = auxiliaries,
+        plain_tracebacks = plain_tracebacks,
+        highlight_strings = highlight_strings )
     return __.register_module(
         name = name,
         flavors = configuration.flavors,
@@ -294,67 +433,75 @@ def _produce_flavors(
     console: _Console, auxiliaries: Auxiliaries, control: PrefixFormatControl
 ) -> __.FlavorsRegistry:
     emitter = _produce_prefix_emitter( console, auxiliaries, control )
-    flavors: __.FlavorsRegistryLiberal = { }
-    for name in _flavor_specifications:
-        flavors[ name ] = __.FlavorConfiguration( prefix_emitter = emitter )
-    for alias, name in _flavor_aliases.items( ):
-        flavors[ alias ] = flavors[ name ]
-    for level in range( 10 ):
-        flavors[ level ] = __.FlavorConfiguration( prefix_emitter = emitter )
+    # Configurations are immutable and identical, so one is shared.
+    flavor = __.FlavorConfiguration( prefix_emitter = emitter )
+    flavors: __.FlavorsRegistryLiberal = dict.fromkeys(
+        ( *_flavor_specifications, *_flavor_aliases, *range( 10 ) ), flavor )
     return __.immut.Dictionary( flavors )
 
 
 def _produce_formatter_factory(
-    console: _Console, auxiliaries: Auxiliaries
+    console: _Console,
+    auxiliaries: Auxiliaries,
+    plain_tracebacks: bool = False,
+    highlight_strings: __.Absential[ bool ] = __.absent,
 ) -> __.FormatterFactory:
+    consoles = _ThreadConsoles( console )
+    tracebacks = _TracebacksCache( consoles, plain = plain_tracebacks )
+    return _FormatterFactory(
+        auxiliaries, consoles, tracebacks, highlight_strings )
 
-    def factory(
-        control: __.FormatterControl, mname: str, flavor: __.Flavor
-    ) -> __.Formatter:
 
-        def formatter( value: __.typx.Any ) -> str:
-            tb_text = ''
-            if isinstance( flavor, str ):
-                flavor_ = _flavor_aliases.get( flavor, flavor )
-                spec = _flavor_specifications[ flavor_ ]
-                if spec.stack and auxiliaries.exc_info_discoverer( )[ 0 ]:
-                    with console.capture( ) as capture:
-                        console.print_exception( )
-                    tb_text = capture.get( )
-            else: flavor_ = flavor
-            with console.capture( ) as capture:
-                console.print( value, end = '' )
-            text = capture.get( )
-            if tb_text: return f"\n{tb_text}\n{text}"
-            return text
+def _produce_prefix_emitter(
+    console: _Console, auxiliaries: Auxiliaries, control: PrefixFormatControl
+) -> __.PrefixEmitter:
+    # Labels, styles, and non-volatile interpolants are fixed per module and
+    # flavor, so prefixes are compiled once per pair.
+    prefixes: dict[ tuple[ str, __.Flavor ], str | __.PrefixRenderer ] = { }
+
+    def emitter(
+        mname: str, flavor: __.Flavor
+    ) -> str | __.PrefixRenderer:
+        index = ( mname, flavor )
+        prefix = prefixes.get( index )
+        if prefix is None:
+            if isinstance( flavor, int ):
+                prefix = _compile_trace_prefix(
+                    console, auxiliaries, control, mname, flavor )
+            else:
+                prefix = _compile_special_prefix(
+                    console, auxiliaries, control, mname,
+                    _flavor_aliases.get( flavor, flavor ) )
+            prefixes[ index ] = prefix
+        return prefix
 
-        return formatter
+    return emitter
 
-    return factory
 
+def _produce_value_renderer(
+    consoles: _ThreadConsoles, highlight_strings: bool
+) -> __.Formatter:
+    render = consoles.render
 
-def _produce_prefix_emitter(
-    console: _Console, auxiliaries: Auxiliaries, control: PrefixFormatControl
-) -> __.PrefixEmitter:
+    def render_value( value: __.typx.Any ) -> str:
+        return render( value, end = '' )
 
-    def emitter( mname: str, flavor: __.Flavor ) -> str:
-        if isinstance( flavor, int ):
-            return _produce_trace_prefix(
-                console, auxiliaries, control, mname, flavor )
-        name = _flavor_aliases.get( flavor, flavor )
-        return _produce_special_prefix(
-            console, auxiliaries, control, mname, name )
+    if highlight_strings: return render_value
 
-    return emitter
+    def render_value_or_string( value: __.typx.Any ) -> str:
+        if value.__class__ is str: return value
+        return render( value, end = '' )
+
+    return render_value_or_string
 
 
-def _produce_special_prefix(
+def _compile_special_prefix(
     console: _Console,
     auxiliaries: Auxiliaries,
     control: PrefixFormatControl,
     mname: str,
     flavor: str,
-) -> str:
+) -> str | __.PrefixRenderer:
     styles = dict( control.styles )
     spec = _flavor_specifications[ flavor ]
     label = ''
@@ -365,17 +512,17 @@ def _produce_special_prefix(
     elif control.label_as & PrefixLabelPresentations.Words:
         label = f"{spec.label}"
     if control.colorize: styles[ 'flavor' ] = _Style( color = spec.color )
-    return _render_prefix(
+    return _compile_prefix(
         console, auxiliaries, control, mname, label, styles )
 
 
-def _produce_trace_prefix(
+def _compile_trace_prefix(
     console: _Console,
     auxiliaries: Auxiliaries,
     control: PrefixFormatControl,
     mname: str,
     level: int,
-) -> str:
+) -> str | __.PrefixRenderer:
     # TODO? Option to render indentation guides.
     styles = dict( control.styles )
     label = ''
@@ -386,47 +533,284 @@ def _produce_trace_prefix(
     elif control.label_as & PrefixLabelPresentations.Words:
         label = f"TRACE{level}"
     if control.colorize and level < len( _trace_color_names ):
-        styles[ 'flavor' ] = _Style( color = _trace_color_names[ level ] )
+        styles[ 'flavor' ] = _trace_prefix_styles[ level ]
     indent = '  ' * level
-    return _render_prefix(
-        console, auxiliaries, control, mname, label, styles ) + indent
+    return _compile_prefix(
+        console, auxiliaries, control, mname, label, styles, indent )
 
 
-def _render_prefix( # noqa: PLR0913
+def _compile_prefix( # noqa: PLR0913
     console: _Console,
     auxiliaries: Auxiliaries,
     control: PrefixFormatControl,
     mname: str,
     flavor: str,
-    styles: dict[ str, _Style ],
-) -> str:
-    # TODO? Performance optimization: Only compute and interpolate PID, thread,
-    #       and timestamp, if capabilities set permits.
-    thread = auxiliaries.thread_discoverer( )
-    interpolants: dict[ str, str ] = {
-        'flavor': flavor,
-        'module_qname': mname,
-        'timestamp': auxiliaries.time_formatter( control.ts_format ),
-        'process_id': str( auxiliaries.pid_discoverer( ) ),
-        'thread_id': str( thread.ident ),
-        'thread_name': thread.name,
-    }
-    if control.colorize: _stylize_interpolants( console, interpolants, styles )
-    return control.template.format( **interpolants )
-
-
-def _stylize_interpolants(
-    console: _Console,
-    interpolants: dict[ str, str ],
-    styles: dict[ str, _Style ],
-) -> None:
+    styles: __.cabc.Mapping[ str, _Style ],
+    suffix: str = '',
+) -> str | __.PrefixRenderer:
+    ''' Compiles prefix into text or renderer of volatile interpolants.
+
+        Literals, label, module name, and their SGR sequences are joined
+        once. Only volatile interpolants, such as timestamps, are rendered
+        per emission.
+    '''
+    color_system = console.color_system if control.colorize else None
     style_default = styles.get( 'flavor' )
-    interpolants_: dict[ str, str ] = { }
-    for iname, ivalue in interpolants.items( ):
-        style = styles.get( iname, style_default )
-        if not style: continue # pragma: no branch
-        with console.capture( ) as capture:
-            console.print(
-                ivalue, end = '', highlight = False, style = style  )
-        interpolants_[ iname ] = capture.get( )
-    interpolants.update( interpolants_ )
+    fixtures = dict( flavor = flavor, module_qname = mname )
+    # Constant texts precede and follow each volatile interpolant.
+    texts: list[ str ] = [ '' ]
+    volatiles: list[ tuple[ __.typx.Any, ... ] ] = [ ]
+    for literal, name, spec, conversion in (
+        _compile_template( control.template )
+    ):
+        texts[ -1 ] += literal
+        if name is None: continue
+        style = styles.get( name, style_default )
+        start, reset = (
+            _compile_style( style, color_system ) if style else ( '', '' ) )
+        if name in fixtures:
+            texts[ -1 ] += _format_interpolant(
+                f"{start}{fixtures[ name ]}{reset}", spec, conversion )
+            continue
+        provider = _produce_interpolant_provider( auxiliaries, control, name )
+        volatiles.append( ( provider, start, reset, spec, conversion ) )
+        texts.append( '' )
+    texts[ -1 ] += suffix
+    if not volatiles: return texts[ 0 ]
+    head = texts[ 0 ]
+    segments: tuple[ _VolatileSegment, ... ] = tuple(
+        ( *volatile, tail )
+        for volatile, tail in zip( volatiles, texts[ 1 : ], strict = True ) )
+
+    def render( ) -> str:
+        parts = [ head ]
+        for provider, start, reset, spec, conversion, tail in segments:
+            parts.append( _format_interpolant(
+                f"{start}{provider( )}{reset}", spec, conversion ) )
+            parts.append( tail )
+        return ''.join( parts )
+
+    return render
+
+
+@__.funct.lru_cache( maxsize = 256 )
+def _compile_style(
+    style: _Style, color_system: __.typx.Optional[ str ]
+) -> tuple[ str, str ]:
+    ''' Compiles style into SGR start and reset sequences. '''
+    if color_system is None: return ( '', '' )
+    rendition = style.render(
+        _style_placeholder, color_system = _color_systems[ color_system ] )
+    start, _, reset = rendition.partition( _style_placeholder )
+    return ( start, reset )
+
+
+@__.funct.lru_cache( maxsize = 64 )
+def _compile_template( template: str ) -> tuple[ _TemplateSegment, ... ]:
+    ''' Compiles template into literal and interpolant segments. '''
+    return tuple( _string.Formatter( ).parse( template ) )
+
+
+def _compile_timestamp_format( ts_format: str ) -> tuple[ str, str, int ]:
+    ''' Splits format around fractional seconds directive. '''
+    for match in _timestamp_directives_regex.finditer( ts_format ):
+        if '%%' == match[ 0 ]: continue
+        digits = int( match[ 1 ] or 6 )
+        return (
+            ts_format[ : match.start( ) ], ts_format[ match.end( ) : ],
+            digits )
+    return ( ts_format, '', 0 )
+
+
+def _format_interpolant(
+    value: str,
+    spec: __.typx.Optional[ str ],
+    conversion: __.typx.Optional[ str ],
+) -> str:
+    value_: __.typx.Any = value
+    if conversion: value_ = _conversions[ conversion ]( value_ )
+    return format( value_, spec ) if spec else str( value_ )
+
+
+def _produce_interpolant_provider(
+    auxiliaries: Auxiliaries, control: PrefixFormatControl, name: str
+) -> __.PrefixRenderer:
+    match name:
+        case 'timestamp':
+            return __.funct.partial(
+                auxiliaries.time_formatter, control.ts_format )
+        case 'process_id':
+            return lambda: str( auxiliaries.pid_discoverer( ) )
+        case 'thread_id':
+            return lambda: str( auxiliaries.thread_discoverer( ).ident )
+        case 'thread_name':
+            return lambda: auxiliaries.thread_discoverer( ).name
+        case _: raise KeyError( name )
+
+
+class _ConsoleDeferral:
+    ''' Stands in for console until first attribute access. '''
+
+    __slots__ = ( 'factory', )
+
+    def __init__( self, factory: __.typx.Callable[ [ ], _Console ] ) -> None:
+        self.factory = factory
+
+    def __getattr__( self, name: str ) -> __.typx.Any:
+        return getattr( _access_console( self.factory ), name )
+
+
+class _TracebacksCache:
+    ''' Renders tracebacks once per exception and flavor.
+
+        Exceptions cannot be weakly referenced, so renditions are kept in a
+        bounded cache, keyed by identities of exceptions and their
+        tracebacks, rather than being attached to the exceptions.
+        Tracebacks with shapes, i.e., exception types and chains of code
+        locations, identical to previously-rendered ones are rendered as
+        references to them.
+    '''
+
+    __slots__ = (
+        'consoles', 'count', 'lock', 'plain', 'renditions', 'shapes' )
+
+    def __init__(
+        self, consoles: _ThreadConsoles, plain: bool = False
+    ) -> None:
+        self.consoles = consoles
+        self.count = 0
+        self.lock = __.threads.Lock( )
+        self.plain = plain
+        self.renditions: dict[ tuple[ __.typx.Any, ... ], str ] = { }
+        self.shapes: dict[ tuple[ __.typx.Any, ... ], int ] = { }
+
+    def render( self, exc_info: __.ExceptionInfo, flavor: str ) -> str:
+        ''' Renders traceback or reference to identical one. '''
+        _, exception, traceback = exc_info
+        if exception is None: return ''
+        # Exception class guards against reuse of identities.
+        key = ( id( exception ), id( traceback ), type( exception ), flavor )
+        rendition = self.renditions.get( key )
+        if rendition is not None: return rendition
+        shape = _survey_traceback( exception, traceback )
+        with self.lock:
+            ordinal = self.shapes.get( shape )
+            if ordinal is None:
+                if len( self.shapes ) >= _traceback_shapes_maximum:
+                    del self.shapes[ next( iter( self.shapes ) ) ]
+                self.count += 1
+                ordinal = self.shapes[ shape ] = self.count
+                fresh = True
+            else: fresh = False
+        if fresh:
+            text = self.render_fully( exception, traceback )
+            rendition = f"Traceback #{ordinal}:\n{text}"
+        else:
+            summary = ''.join( _traceback.format_exception_only(
+                type( exception ), exception ) ).rstrip( )
+            rendition = f"Same traceback as #{ordinal}: {summary}"
+        with self.lock:
+            if len( self.renditions ) >= _traceback_renditions_maximum:
+                del self.renditions[ next( iter( self.renditions ) ) ]
+            self.renditions[ key ] = rendition
+        return rendition
+
+    def render_fully(
+        self,
+        exception: BaseException,
+        traceback: __.typx.Optional[ __.types.TracebackType ],
+    ) -> str:
+        ''' Renders traceback in full, as plain text or via Rich. '''
+        if self.plain:
+            return ''.join( _traceback.format_exception(
+                type( exception ), exception, traceback ) )
+        return self.consoles.render( _Traceback.from_exception(
+            type( exception ), exception, traceback ) )
+
+
+class _FormatterFactory:
+    ''' Produces formatters, which are specialized per flavor.
+
+        Type formatters from formatter controls are applied to individual
+        values, so that tracebacks are still rendered for values which they
+        format.
+    '''
+
+    __slots__ = (
+        'auxiliaries', 'consoles', 'highlight_strings', 'tracebacks' )
+
+    applies_type_formatters = True
+
+    def __init__(
+        self,
+        auxiliaries: Auxiliaries,
+        consoles: _ThreadConsoles,
+        tracebacks: _TracebacksCache,
+        highlight_strings: __.Absential[ bool ] = __.absent,
+    ) -> None:
+        self.auxiliaries = auxiliaries
+        self.consoles = consoles
+        self.highlight_strings = highlight_strings
+        self.tracebacks = tracebacks
+
+    def __call__(
+        self, control: __.FormatterControl, mname: str, flavor: __.Flavor
+    ) -> __.Formatter:
+        # Flavor resolution is fixed per debugger, so closures are
+        # specialized here rather than consulting specifications per value.
+        spec, flavor_ = None, ''
+        if isinstance( flavor, str ):
+            flavor_ = _flavor_aliases.get( flavor, flavor )
+            spec = _flavor_specifications.get( flavor_ )
+        highlight = (
+            ( spec is None or spec.highlight_strings )
+            if __.is_absent( self.highlight_strings )
+            else self.highlight_strings )
+        render = _produce_value_renderer( self.consoles, highlight )
+        if control.type_formatters:
+            render = __.TypeDispatcher( control.type_formatters, render )
+        if spec is None or not spec.stack: return render
+        discover_exc_info = self.auxiliaries.exc_info_discoverer
+        tracebacks = self.tracebacks
+        attached: __.typx.Optional[ object ] = None
+
+        def formatter( value: __.typx.Any ) -> str:
+            nonlocal attached
+            exc_info = discover_exc_info( )
+            text = render( value )
+            if not exc_info[ 0 ]: return text
+            # Traceback accompanies only first argument of each emission.
+            rendition = __.current_rendition( )
+            if rendition is not None:
+                if rendition is attached: return text
+                attached = rendition
+            tb_text = tracebacks.render( exc_info, flavor_ )
+            return f"\n{tb_text}\n{text}"
+
+        return formatter
+
+
+def _access_console( factory: __.typx.Callable[ [ ], _Console ] ) -> _Console:
+    console = _consoles.get( factory )
+    if console is not None: return console
+    with _consoles_lock:
+        console = _consoles.get( factory )
+        if console is None: console = _consoles[ factory ] = factory( )
+    return console
+
+
+def _survey_traceback(
+    exception: BaseException,
+    traceback: __.typx.Optional[ __.types.TracebackType ],
+) -> tuple[ __.typx.Any, ... ]:
+    shape: list[ __.typx.Any ] = [ type( exception ) ]
+    while traceback is not None:
+        shape.append( ( traceback.tb_frame.f_code, traceback.tb_lineno ) )
+        traceback = traceback.tb_next
+    return tuple( shape )
+
+
+_consoles: dict[ __.typx.Callable[ [ ], _Console ], _Console ] = { }
+_consoles_lock = __.threads.Lock( )
+_traceback_renditions_maximum = 256
+_traceback_shapes_maximum = 1024
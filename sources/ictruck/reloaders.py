@@ -0,0 +1,193 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+''' Runtime reconfiguration of truck activation. '''
+
+
+
+import signal as _signal
+
+from . import __
+from . import exceptions as _exceptions
+from . import vehicles as _vehicles
+
+
+_validate_arguments = (
+    __.validate_arguments(
+        globalvars = globals( ),
+        errorclass = _exceptions.ArgumentClassInvalidity ) )
+
+
+class ActivationWatcher( __.immut.DataclassObjectMutable ):
+    ''' Reconfigures activation of truck whenever file is modified.
+
+        Modification time of file is polled from a daemon thread. File
+        format is described by :py:func:`reconfigure_from_file`.
+    '''
+
+    truck: __.typx.Annotated[
+        _vehicles.Truck, __.typx.Doc( ''' Truck to reconfigure. ''' )
+    ]
+    location: __.typx.Annotated[
+        str, __.typx.Doc( ''' Path to activation specifications file. ''' )
+    ]
+    interval: __.typx.Annotated[
+        float, __.typx.Doc( ''' Seconds between polls of file. ''' )
+    ] = 1.0
+    _halter: __.threads.Event = __.dcls.field(
+        default_factory = __.threads.Event )
+    _mtime: __.typx.Optional[ int ] = None
+    _thread: __.typx.Optional[ __.threads.Thread ] = None
+
+    def check( self ) -> bool:
+        ''' Reconfigures truck, if file changed since last check. '''
+        try: mtime = __.os.stat( self.location ).st_mtime_ns
+        except OSError: return False
+        if mtime == self._mtime: return False
+        self._mtime = mtime
+        reconfigure_from_file( self.truck, self.location )
+        return True
+
+    def start( self ) -> __.typx.Self:
+        ''' Checks file and then starts polling it from daemon thread. '''
+        if self._thread is not None: return self
+        self.check( )
+        self._halter.clear( )
+        self._thread = __.threads.Thread(
+            target = self._watch,
+            name = f"{__.package_name}-activation-watcher",
+            daemon = True )
+        self._thread.start( )
+        return self
+
+    def stop( self ) -> None:
+        ''' Stops polling file. '''
+        thread = self._thread
+        if thread is None: return
+        self._halter.set( )
+        thread.join( )
+        self._thread = None
+
+    def _poll( self ) -> None:
+        try: self.check( )
+        except ( OSError, ValueError ) as exc:
+            self.truck( 'note', module_name = __name__ )(
+                f"Activation unchanged: {exc}" )
+
+    def _watch( self ) -> None:
+        while not self._halter.wait( self.interval ): self._poll( )
+
+
+@_validate_arguments
+def install_reload_signal_handler(
+    truck: _vehicles.Truck,
+    signum: __.Absential[ int ] = __.absent,
+    location: __.typx.Optional[ str ] = None,
+    evname_active_flavors: __.Absential[ str ] = __.absent,
+    evname_trace_levels: __.Absential[ str ] = __.absent,
+) -> None:
+    ''' Reconfigures activation of truck upon receipt of signal.
+
+        Default signal is ``SIGHUP``. If location of file is provided, then
+        activation specifications are read from it. Otherwise, they are read
+        from the process environment.
+
+        Must be called from main thread.
+    '''
+    if __.is_absent( signum ): signum = _signal.SIGHUP
+    if location is None:
+        reconfigure = __.funct.partial(
+            reconfigure_from_environment, truck,
+            evname_active_flavors = evname_active_flavors,
+            evname_trace_levels = evname_trace_levels )
+    else:
+        reconfigure = __.funct.partial(
+            reconfigure_from_file, truck, location )
+
+    def handle( signum: int, frame: __.typx.Any ) -> None:
+        # Signal may interrupt main thread while it holds truck lock.
+        # Reconfigure from another thread to avoid deadlock.
+        __.threads.Thread( target = reconfigure, daemon = True ).start( )
+
+    _signal.signal( signum, handle )
+
+
+@_validate_arguments
+def install_resize_signal_handler(
+    truck: _vehicles.Truck,
+    signum: __.Absential[ int ] = __.absent,
+) -> None:
+    ''' Refreshes formatters of truck upon receipt of signal.
+
+        Default signal is ``SIGWINCH``, which is sent to foreground processes
+        when their controlling terminals are resized.
+
+        Must be called from main thread.
+    '''
+    if __.is_absent( signum ): signum = _signal.SIGWINCH
+
+    def handle( signum: int, frame: __.typx.Any ) -> None:
+        # Signal may interrupt main thread while it holds truck lock.
+        # Refresh from another thread to avoid deadlock.
+        __.threads.Thread(
+            target = truck.refresh_formatters, daemon = True ).start( )
+
+    _signal.signal( signum, handle )
+
+
+@_validate_arguments
+def reconfigure_from_environment(
+    truck: _vehicles.Truck,
+    evname_active_flavors: __.Absential[ str ] = __.absent,
+    evname_trace_levels: __.Absential[ str ] = __.absent,
+) -> None:
+    ''' Reconfigures activation of truck from environment variables. '''
+    truck.reconfigure(
+        active_flavors = _vehicles.active_flavors_from_environment(
+            evname = evname_active_flavors ),
+        trace_levels = _vehicles.trace_levels_from_environment(
+            evname = evname_trace_levels ) )
+
+
+@_validate_arguments
+def reconfigure_from_file( truck: _vehicles.Truck, location: str ) -> None:
+    ''' Reconfigures activation of truck from specifications in file.
+
+        Each line of the file is either ``active_flavors = <spec>`` or
+        ``trace_levels = <spec>``, where specifications have the same forms
+        as the corresponding environment variables. Blank lines and lines
+        starting with ``#`` are ignored. Activations which are absent from
+        the file are unchanged; empty specifications deactivate.
+    '''
+    parsers = dict(
+        active_flavors = _vehicles.active_flavors_from_specification,
+        trace_levels = _vehicles.trace_levels_from_specification )
+    nomargs: dict[ str, __.typx.Any ] = { }
+    with open( location, encoding = 'utf-8' ) as file:
+        for line in file:
+            line_ = line.strip( )
+            if not line_ or line_.startswith( '#' ): continue
+            name, _, specification = line_.partition( '=' )
+            name = name.strip( )
+            if name not in parsers:
+                raise _exceptions.ActivationSpecificationInvalidity(
+                    location, line_ )
+            nomargs[ name ] = parsers[ name ]( specification.strip( ) )
+    truck.reconfigure( **nomargs )
@@ -22,11 +22,13 @@
 
 
 
-import icecream as _icecream
+import unicodedata as _unicodedata
 
 from . import __
 from . import configuration as _cfg
+from . import debuggers as _dbg
 from . import exceptions as _exceptions
+from . import formatters as _fmt
 from . import printers as _printers
 
 
@@ -34,6 +36,9 @@ from . import printers as _printers
 #     import _typeshed
 
 
+_cells_categories_empty = frozenset( ( 'Cf', 'Me', 'Mn' ) )
+_columns_counts: dict[ int, __.typx.Optional[ int ] ] = { }
+_columns_counts_lock: __.threads.Lock = __.threads.Lock( )
 _installer_lock: __.threads.Lock = __.threads.Lock( )
 _registrar_lock: __.threads.Lock = __.threads.Lock( )
 _self_modulecfg: _cfg.ModuleConfiguration = _cfg.ModuleConfiguration(
@@ -81,8 +86,7 @@ ActiveFlavorsRegistryLiberal: __.typx.TypeAlias = (
 ModulesConfigurationsRegistryLiberal: __.typx.TypeAlias = (
     __.cabc.Mapping[ str, _cfg.ModuleConfiguration ] )
 ReportersRegistry: __.typx.TypeAlias = (
-    __.accret.Dictionary[
-        tuple[ str, _cfg.Flavor ], _icecream.IceCreamDebugger ] )
+    __.accret.Dictionary[ tuple[ str, _cfg.Flavor ], _dbg.Debugger ] )
 TraceLevelsRegistry: __.typx.TypeAlias = (
     __.immut.Dictionary[ str | None, int ] )
 TraceLevelsRegistryLiberal: __.typx.TypeAlias = (
@@ -102,8 +106,15 @@ omniflavor: __.typx.Annotated[
 ] = Omniflavor.Instance
 
 
-class Truck( __.immut.DataclassObject ):
-    ''' Vends flavors of Icecream debugger. '''
+class Truck(
+    __.immut.DataclassObject,
+    instances_mutables = ( 'active_flavors', 'trace_levels' ),
+):
+    ''' Vends flavors of Icecream debugger.
+
+        Active flavors and trace levels can be swapped at runtime via
+        :py:meth:`reconfigure`. All other attributes are immutable.
+    '''
 
     active_flavors: __.typx.Annotated[
         ActiveFlavorsRegistry,
@@ -114,6 +125,14 @@ class Truck( __.immut.DataclassObject ):
                 override globals for that module.
             ''' ),
     ] = __.dcls.field( default_factory = ActiveFlavorsRegistry )
+    deduplicator: __.typx.Annotated[
+        __.typx.Optional[ _dbg.Deduplicator ],
+        __.typx.Doc(
+            ''' Collapser of repeated emissions from call sites.
+
+                If ``None``, then repeated emissions are printed.
+            ''' ),
+    ] = None
     generalcfg: __.typx.Annotated[
         _cfg.VehicleConfiguration,
         __.typx.Doc(
@@ -144,6 +163,23 @@ class Truck( __.immut.DataclassObject ):
                 produced by a formatter.
             ''' ),
     ] = __.funct.partial( _printers.produce_simple_printer, __.sys.stderr )
+    retrospector: __.typx.Annotated[
+        __.typx.Optional[ _dbg.Retrospector ],
+        __.typx.Doc(
+            ''' Retainer of recent emissions from inactive debuggers.
+
+                If ``None``, then emissions from inactive debuggers are
+                discarded.
+            ''' ),
+    ] = None
+    throttler: __.typx.Annotated[
+        __.typx.Optional[ _dbg.Throttler ],
+        __.typx.Doc(
+            ''' Sampler of emissions from hot call sites.
+
+                If ``None``, then call sites are not throttled.
+            ''' ),
+    ] = None
     trace_levels: __.typx.Annotated[
         TraceLevelsRegistry,
         __.typx.Doc(
@@ -169,7 +205,7 @@ class Truck( __.immut.DataclassObject ):
         self,
         flavor: _cfg.Flavor, *,
         module_name: __.Absential[ str ] = __.absent,
-    ) -> _icecream.IceCreamDebugger:
+    ) -> _dbg.Debugger:
         ''' Vends flavor of Icecream debugger. '''
         mname = (
             _discover_invoker_module_name( ) if __.is_absent( module_name )
@@ -179,24 +215,83 @@ class Truck( __.immut.DataclassObject ):
             with self._debuggers_lock:
                 return self._debuggers[ cache_index ]
         configuration = _produce_ic_configuration( self, mname, flavor )
-        control = _cfg.FormatterControl( )
+        # Emission of prefixes for disabled debuggers is deferred, since
+        # prefix emitters may have costly dependencies.
+        if _calculate_enablement(
+            self.active_flavors, self.trace_levels, mname, flavor
+        ):
+            prefix = _produce_prefix( configuration, mname, flavor )
+            control = _calculate_formatter_control(
+                self, configuration, prefix )
+        else:
+            prefix = _produce_deferred_prefix( configuration, mname, flavor )
+            control = _cfg.FormatterControl(
+                type_formatters = __.immut.Dictionary(
+                    configuration[ 'type_formatters' ] ) )
         initargs = _calculate_ic_initargs(
-            self, configuration, control, mname, flavor )
-        debugger = _icecream.IceCreamDebugger( **initargs )
-        if isinstance( flavor, int ):
-            trace_level = (
-                _calculate_effective_trace_level( self.trace_levels, mname) )
-            debugger.enabled = flavor <= trace_level
-        elif isinstance( flavor, str ): # pragma: no branch
-            active_flavors = (
-                _calculate_effective_flavors( self.active_flavors, mname ) )
-            debugger.enabled = (
-                isinstance( active_flavors, Omniflavor )
-                or flavor in active_flavors )
+            self, configuration, control, prefix, mname, flavor )
+        debugger = _dbg.Debugger(
+            control = control,
+            deduplicator = self.deduplicator,
+            flavor = flavor,
+            module_name = mname,
+            rate_limit = configuration[ 'rate_limit' ],
+            retrospector = self.retrospector,
+            throttler = self.throttler,
+            truck = self,
+            **initargs )
         with self._debuggers_lock:
+            debugger.enabled = _calculate_enablement(
+                self.active_flavors, self.trace_levels, mname, flavor )
             self._debuggers[ cache_index ] = debugger
         return debugger
 
+    @_validate_arguments
+    def activate(
+        self,
+        flavors: __.typx.Annotated[
+            __.Absential[
+                ActiveFlavorsLiberal | ActiveFlavorsRegistryLiberal ],
+            __.typx.Doc( ''' Additional flavors to activate. ''' ),
+        ] = __.absent,
+        trace_levels: __.typx.Annotated[
+            __.Absential[ int | TraceLevelsRegistryLiberal ],
+            __.typx.Doc( ''' Additional trace depths to activate. ''' ),
+        ] = __.absent,
+    ) -> _dbg.ActivationOverlay:
+        ''' Produces context manager which activates flavors and trace levels.
+
+            Activation applies only within the current thread or asyncio task
+            and only to debuggers vended by this truck. Flavors and trace
+            levels are specified in the same forms as for
+            :py:func:`produce_truck` and add to those of the truck.
+
+            Debuggers which are only enabled by overlays format values
+            without knowledge of terminal widths.
+        '''
+        initargs: dict[ str, __.typx.Any ] = { }
+        _add_truck_initarg_active_flavors( initargs, flavors, None )
+        _add_truck_initarg_trace_levels( initargs, trace_levels, None )
+        assessor = __.funct.partial(
+            _calculate_enablement,
+            initargs.get( 'active_flavors', __.immut.Dictionary( ) ),
+            initargs.get( 'trace_levels', __.immut.Dictionary( ) ) )
+        return _dbg.ActivationOverlay( truck = self, assessor = assessor )
+
+    def buffered_scope(
+        self, latency_threshold: __.typx.Optional[ float ] = None
+    ) -> _dbg.BufferedScope:
+        ''' Produces scope which buffers emissions until it exits.
+
+            Buffered emissions are printed only if the scope exits with an
+            exception, lasts longer than the latency threshold (in seconds),
+            or is explicitly kept. Otherwise, they are discarded without
+            being formatted.
+
+            Can be used as context manager or as decorator.
+        '''
+        return _dbg.BufferedScope( latency_threshold = latency_threshold )
+
     @_validate_arguments
     def install( self, alias: str = builtins_alias_default ) -> __.typx.Self:
         ''' Installs truck into builtins with provided alias.
@@ -217,6 +312,54 @@ class Truck( __.immut.DataclassObject ):
                     alias, self, _exceptions.AttributeNondisplacement )
         return self
 
+    @_validate_arguments
+    def reconfigure(
+        self,
+        active_flavors: __.typx.Annotated[
+            __.Absential[
+                ActiveFlavorsLiberal | ActiveFlavorsRegistryLiberal ],
+            __.typx.Doc( ''' Flavors to activate, replacing current. ''' ),
+        ] = __.absent,
+        trace_levels: __.typx.Annotated[
+            __.Absential[ int | TraceLevelsRegistryLiberal ],
+            __.typx.Doc( ''' Trace depths, replacing current. ''' ),
+        ] = __.absent,
+    ) -> __.typx.Self:
+        ''' Swaps in new active flavors and trace levels.
+
+            Cached debuggers, which are affected by the change, are enabled
+            or disabled accordingly. Unspecified activations are unchanged.
+        '''
+        initargs: dict[ str, __.typx.Any ] = { }
+        _add_truck_initarg_active_flavors( initargs, active_flavors, None )
+        _add_truck_initarg_trace_levels( initargs, trace_levels, None )
+        enablements: list[ _dbg.Debugger ] = [ ]
+        with self._debuggers_lock:
+            for name, registry in initargs.items( ):
+                setattr( self, name, registry )
+            for ( mname, flavor ), debugger in self._debuggers.items( ):
+                enabled = _calculate_enablement(
+                    self.active_flavors, self.trace_levels, mname, flavor )
+                if debugger.enabled == enabled: continue
+                debugger.enabled = enabled
+                if enabled: enablements.append( debugger )
+        for debugger in enablements: _refresh_formatter( self, debugger )
+        return self
+
+    def refresh_formatters( self ) -> __.typx.Self:
+        ''' Remeasures terminals and refreshes formatters of debuggers.
+
+            Formatters of enabled cached debuggers are reproduced, if their
+            effective columns counts have changed. Typically invoked after
+            terminal resizes.
+        '''
+        with _columns_counts_lock: _columns_counts.clear( )
+        with self._debuggers_lock:
+            debuggers = tuple( self._debuggers.values( ) )
+        for debugger in debuggers:
+            if debugger.enabled: _refresh_formatter( self, debugger )
+        return self
+
     @_validate_arguments
     def register_module(
         self,
@@ -254,6 +397,14 @@ ProduceTruckActiveFlavorsArgument: __.typx.TypeAlias = __.typx.Annotated[
             Module-specific entries merge with global entries.
         ''' ),
 ]
+ProduceTruckDeduplicatorArgument: __.typx.TypeAlias = __.typx.Annotated[
+    __.Absential[ __.typx.Optional[ _dbg.Deduplicator ] ],
+    __.typx.Doc(
+        ''' Collapser of repeated emissions from call sites.
+
+            If absent or ``None``, then repeated emissions are printed.
+        ''' ),
+]
 ProduceTruckEvnActiveFlavorsArgument: __.typx.TypeAlias = __.typx.Annotated[
     __.Absential[ __.typx.Optional[ str ] ],
     __.typx.Doc(
@@ -318,6 +469,23 @@ ProduceTruckPrinterFactoryArgument: __.typx.TypeAlias = __.typx.Annotated[
             If absent, uses a default.
         ''' ),
 ]
+ProduceTruckRetrospectorArgument: __.typx.TypeAlias = __.typx.Annotated[
+    __.Absential[ __.typx.Optional[ _dbg.Retrospector ] ],
+    __.typx.Doc(
+        ''' Retainer of recent emissions from inactive debuggers.
+
+            If absent or ``None``, then emissions from inactive debuggers are
+            discarded.
+        ''' ),
+]
+ProduceTruckThrottlerArgument: __.typx.TypeAlias = __.typx.Annotated[
+    __.Absential[ __.typx.Optional[ _dbg.Throttler ] ],
+    __.typx.Doc(
+        ''' Sampler of emissions from hot call sites.
+
+            If absent or ``None``, then call sites are not throttled.
+        ''' ),
+]
 ProduceTruckTraceLevelsArgument: __.typx.TypeAlias = __.typx.Annotated[
     __.Absential[ int | TraceLevelsRegistryLiberal ],
     __.typx.Doc(
@@ -359,16 +527,34 @@ RegisterModulePrefixEmitterArgument: __.typx.TypeAlias = __.typx.Annotated[
             arguments. Returns prefix string.
         ''' ),
 ]
+RegisterModuleRateLimitArgument: __.typx.TypeAlias = __.typx.Annotated[
+    __.Absential[ _cfg.RateLimit ],
+    __.typx.Doc( ''' Limit on rate of emissions. ''' ),
+]
+RegisterModuleTypeFormattersArgument: __.typx.TypeAlias = __.typx.Annotated[
+    __.Absential[ __.cabc.Mapping[ type, _cfg.Formatter ] ],
+    __.typx.Doc( ''' Registry of value types to formatters. ''' ),
+]
 
 
 def active_flavors_from_environment(
     evname: __.Absential[ str ] = __.absent
 ) -> ActiveFlavorsRegistry:
     ''' Extracts active flavors from named environment variable. '''
-    active_flavors: ActiveFlavorsRegistryLiberal = { }
     name = 'ICTRUCK_ACTIVE_FLAVORS' if __.is_absent( evname ) else evname
-    value = __.os.getenv( name, '' )
-    for part in value.split( '+' ):
+    return active_flavors_from_specification( __.os.getenv( name, '' ) )
+
+
+def active_flavors_from_specification(
+    specification: str
+) -> ActiveFlavorsRegistry:
+    ''' Extracts active flavors from specification string.
+
+        Specification has same form as environment variable value, such as
+        ``note,error+mypackage.db:*``.
+    '''
+    active_flavors: ActiveFlavorsRegistryLiberal = { }
+    for part in specification.split( '+' ):
         if not part: continue
         if ':' in part:
             mname, flavors = part.split( ':', 1 )
@@ -387,17 +573,27 @@ def trace_levels_from_environment(
     evname: __.Absential[ str ] = __.absent
 ) -> TraceLevelsRegistry:
     ''' Extracts trace levels from named environment variable. '''
-    trace_levels: TraceLevelsRegistryLiberal = { None: -1 }
     name = 'ICTRUCK_TRACE_LEVELS' if __.is_absent( evname ) else evname
-    value = __.os.getenv( name, '' )
-    for part in value.split( '+' ):
+    return trace_levels_from_specification( __.os.getenv( name, '' ) )
+
+
+def trace_levels_from_specification(
+    specification: str
+) -> TraceLevelsRegistry:
+    ''' Extracts trace levels from specification string.
+
+        Specification has same form as environment variable value, such as
+        ``1+mypackage.db:5``.
+    '''
+    trace_levels: TraceLevelsRegistryLiberal = { None: -1 }
+    for part in specification.split( '+' ):
         if not part: continue
         if ':' in part: mname, level = part.split( ':', 1 )
         else: mname, level = None, part
         if not level.isdigit( ):
             __.warnings.warn(
                 f"Non-integer trace level {level!r} "
-                f"in environment variable {name!r}." )
+                f"in specification {specification!r}." )
             continue
         trace_levels[ mname ] = int( level )
     return __.immut.Dictionary( trace_levels )
@@ -412,6 +608,9 @@ def install( # noqa: PLR0913
     trace_levels: ProduceTruckTraceLevelsArgument = __.absent,
     evname_active_flavors: ProduceTruckEvnActiveFlavorsArgument = __.absent,
     evname_trace_levels: ProduceTruckEvnTraceLevelsArgument = __.absent,
+    retrospector: ProduceTruckRetrospectorArgument = __.absent,
+    throttler: ProduceTruckThrottlerArgument = __.absent,
+    deduplicator: ProduceTruckDeduplicatorArgument = __.absent,
 ) -> Truck:
     ''' Produces truck and installs it into builtins with alias.
 
@@ -425,7 +624,10 @@ def install( # noqa: PLR0913
         printer_factory = printer_factory,
         trace_levels = trace_levels,
         evname_active_flavors = evname_active_flavors,
-        evname_trace_levels = evname_trace_levels )
+        evname_trace_levels = evname_trace_levels,
+        retrospector = retrospector,
+        throttler = throttler,
+        deduplicator = deduplicator )
     return truck.install( alias = alias )
 
 
@@ -438,6 +640,9 @@ def produce_truck( # noqa: PLR0913
     trace_levels: ProduceTruckTraceLevelsArgument = __.absent,
     evname_active_flavors: ProduceTruckEvnActiveFlavorsArgument = __.absent,
     evname_trace_levels: ProduceTruckEvnTraceLevelsArgument = __.absent,
+    retrospector: ProduceTruckRetrospectorArgument = __.absent,
+    throttler: ProduceTruckThrottlerArgument = __.absent,
+    deduplicator: ProduceTruckDeduplicatorArgument = __.absent,
 ) -> Truck:
     ''' Produces icecream truck with some shorthand argument values. '''
     # TODO: Deeper validation of active flavors and trace levels.
@@ -451,6 +656,12 @@ def produce_truck( # noqa: PLR0913
                 in modulecfgs.items( ) } )
     if not __.is_absent( printer_factory ):
         initargs[ 'printer_factory' ] = printer_factory
+    if not __.is_absent( retrospector ):
+        initargs[ 'retrospector' ] = retrospector
+    if not __.is_absent( throttler ):
+        initargs[ 'throttler' ] = throttler
+    if not __.is_absent( deduplicator ):
+        initargs[ 'deduplicator' ] = deduplicator
     _add_truck_initarg_active_flavors(
         initargs, active_flavors, evname_active_flavors )
     _add_truck_initarg_trace_levels(
@@ -459,12 +670,14 @@ def produce_truck( # noqa: PLR0913
 
 
 @_validate_arguments
-def register_module(
+def register_module( # noqa: PLR0913
     name: RegisterModuleNameArgument = __.absent,
     flavors: ProduceTruckFlavorsArgument = __.absent,
     formatter_factory: RegisterModuleFormatterFactoryArgument = __.absent,
     include_context: RegisterModuleIncludeContextArgument = __.absent,
     prefix_emitter: RegisterModulePrefixEmitterArgument = __.absent,
+    rate_limit: RegisterModuleRateLimitArgument = __.absent,
+    type_formatters: RegisterModuleTypeFormattersArgument = __.absent,
 ) -> _cfg.ModuleConfiguration:
     ''' Registers module configuration on the builtin truck.
 
@@ -492,6 +705,10 @@ def register_module(
         nomargs[ 'include_context' ] = include_context
     if not __.is_absent( prefix_emitter ):
         nomargs[ 'prefix_emitter' ] = prefix_emitter
+    if not __.is_absent( rate_limit ):
+        nomargs[ 'rate_limit' ] = rate_limit
+    if not __.is_absent( type_formatters ):
+        nomargs[ 'type_formatters' ] = __.immut.Dictionary( type_formatters )
     configuration = _cfg.ModuleConfiguration( **nomargs )
     return truck.register_module( name = name, configuration = configuration )
 
@@ -562,25 +779,56 @@ def _calculate_effective_trace_level(
     return result
 
 
-def _calculate_ic_initargs(
+def _calculate_enablement(
+    active_flavors: ActiveFlavorsRegistry,
+    trace_levels: TraceLevelsRegistry,
+    mname: str,
+    flavor: _cfg.Flavor,
+) -> bool:
+    if isinstance( flavor, int ):
+        level = _calculate_effective_trace_level( trace_levels, mname )
+        return flavor <= level
+    flavors = _calculate_effective_flavors( active_flavors, mname )
+    return isinstance( flavors, Omniflavor ) or flavor in flavors
+
+
+def _calculate_formatter_control(
+    truck: Truck,
+    configuration: __.immut.Dictionary[ str, __.typx.Any ],
+    prefix: str | _cfg.PrefixRenderer,
+) -> _cfg.FormatterControl:
+    type_formatters = __.immut.Dictionary[ type, _cfg.Formatter ](
+        configuration[ 'type_formatters' ] )
+    target = _discover_printer_target( truck.printer_factory )
+    columns = None if target is None else _measure_columns( target )
+    if columns is None:
+        return _cfg.FormatterControl( type_formatters = type_formatters )
+    if not isinstance( prefix, str ): prefix = prefix( )
+    prefix = _printers._remove_ansi_c1_sequences( prefix ) # noqa: SLF001
+    return _cfg.FormatterControl(
+        columns_count_effective = max( columns - _measure_cells( prefix ), 1 ),
+        type_formatters = type_formatters )
+
+
+def _calculate_ic_initargs( # noqa: PLR0913
     truck: Truck,
     configuration: __.immut.Dictionary[ str, __.typx.Any ],
     control: _cfg.FormatterControl,
+    prefix: str | _cfg.PrefixRenderer,
     mname: str,
     flavor: _cfg.Flavor,
 ) -> dict[ str, __.typx.Any ]:
     nomargs: dict[ str, __.typx.Any ] = { }
-    nomargs[ 'argToStringFunction' ] = (
-        configuration[ 'formatter_factory' ]( control, mname, flavor ) )
+    nomargs[ 'argToStringFunction' ] = _produce_formatter(
+        configuration, control, mname, flavor )
     nomargs[ 'includeContext' ] = configuration[ 'include_context' ]
     if isinstance( truck.printer_factory, __.io.TextIOBase ):
         printer = __.funct.partial( print, file = truck.printer_factory )
     else: printer = truck.printer_factory( mname, flavor )
     nomargs[ 'outputFunction' ] = printer
-    prefix_emitter = configuration[ 'prefix_emitter' ]
-    nomargs[ 'prefix' ] = (
-        prefix_emitter if isinstance( prefix_emitter, str )
-        else prefix_emitter( mname, flavor ) )
+    # Emitters return renderers for volatile prefixes, such as ones with
+    # timestamps, which are then invoked for every emission.
+    nomargs[ 'prefix' ] = prefix
     return nomargs
 
 
@@ -607,27 +855,99 @@ def _discover_invoker_module_name( ) -> str:
     return name
 
 
+def _discover_printer_target(
+    printer_factory: _printers.PrinterFactoryUnion
+) -> __.typx.Optional[ __.io.TextIOBase ]:
+    if isinstance( printer_factory, __.io.TextIOBase ): return printer_factory
+    if isinstance( printer_factory, __.funct.partial ):
+        arguments: tuple[ __.typx.Any, ... ] = printer_factory.args
+        if arguments and isinstance( arguments[ 0 ], __.io.TextIOBase ):
+            return arguments[ 0 ]
+    return None
+
+
 def _iterate_module_name_ancestry( name: str ) -> __.cabc.Iterator[ str ]:
     parts = name.split( '.' )
     for i in range( len( parts ) ):
         yield '.'.join( parts[ : i + 1 ] )
 
 
+def _measure_cells( text: str ) -> int:
+    # East Asian wide and full-width characters, such as many emoji, occupy
+    # two terminal cells. Combining marks and format characters, such as
+    # variation selectors and zero-width joiners, occupy none.
+    cells = 0
+    for character in text:
+        if _unicodedata.category( character ) in _cells_categories_empty:
+            continue
+        cells += (
+            2 if _unicodedata.east_asian_width( character ) in ( 'F', 'W' )
+            else 1 )
+    return cells
+
+
+def _measure_columns( stream: __.io.TextIOBase ) -> __.typx.Optional[ int ]:
+    try: descriptor = stream.fileno( )
+    except ( AttributeError, OSError, ValueError ): return None
+    with _columns_counts_lock:
+        if descriptor in _columns_counts: return _columns_counts[ descriptor ]
+    columns = None
+    if __.os.isatty( descriptor ):
+        with __.ctxl.suppress( OSError ):
+            columns = __.os.get_terminal_size( descriptor ).columns
+    with _columns_counts_lock: _columns_counts[ descriptor ] = columns
+    return columns
+
+
 def _merge_ic_configuration(
     base: dict[ str, __.typx.Any ], update_objct: object,
 ) -> dict[ str, __.typx.Any ]:
     update: dict[ str, __.typx.Any ] = _dict_from_dataclass( update_objct )
     result: dict[ str, __.typx.Any ] = { }
-    result[ 'flavors' ] = (
-            dict( base.get( 'flavors', dict( ) ) )
-        |   dict( update.get( 'flavors', dict( ) ) ) )
-    for ename in ( 'formatter_factory', 'include_context', 'prefix_emitter' ):
+    for ename in ( 'flavors', 'type_formatters' ):
+        result[ ename ] = (
+                dict( base.get( ename, dict( ) ) )
+            |   dict( update.get( ename, dict( ) ) ) )
+    for ename in (
+        'formatter_factory', 'include_context', 'prefix_emitter', 'rate_limit'
+    ):
         uvalue = update.get( ename )
         if uvalue is not None: result[ ename ] = uvalue
         elif ename in base: result[ ename ] = base[ ename ]
     return result
 
 
+def _produce_deferred_prefix(
+    configuration: __.immut.Dictionary[ str, __.typx.Any ],
+    mname: str,
+    flavor: _cfg.Flavor,
+) -> _cfg.PrefixRenderer:
+    prefixes: list[ str | _cfg.PrefixRenderer ] = [ ]
+
+    def render( ) -> str:
+        if not prefixes:
+            prefixes.append( _produce_prefix( configuration, mname, flavor ) )
+        prefix = prefixes[ 0 ]
+        return prefix if isinstance( prefix, str ) else prefix( )
+
+    return render
+
+
+def _produce_formatter(
+    configuration: __.immut.Dictionary[ str, __.typx.Any ],
+    control: _cfg.FormatterControl,
+    mname: str,
+    flavor: _cfg.Flavor,
+) -> _cfg.Formatter:
+    factory = configuration[ 'formatter_factory' ]
+    formatter = factory( control, mname, flavor )
+    type_formatters = control.type_formatters
+    if type_formatters and not getattr(
+        factory, 'applies_type_formatters', False
+    ): formatter = _fmt.TypeDispatcher( type_formatters, formatter )
+    return formatter
+
+
 def _produce_ic_configuration(
     vehicle: Truck, mname: str, flavor: _cfg.Flavor
 ) -> __.immut.Dictionary[ str, __.typx.Any ]:
@@ -651,3 +971,24 @@ def _produce_ic_configuration(
     for fconfig in fconfigs:
         configd = _merge_ic_configuration( configd, fconfig )
     return __.immut.Dictionary( configd )
+
+
+def _produce_prefix(
+    configuration: __.immut.Dictionary[ str, __.typx.Any ],
+    mname: str,
+    flavor: _cfg.Flavor,
+) -> str | _cfg.PrefixRenderer:
+    prefix_emitter = configuration[ 'prefix_emitter' ]
+    if isinstance( prefix_emitter, str ): return prefix_emitter
+    return prefix_emitter( mname, flavor )
+
+
+def _refresh_formatter( vehicle: Truck, debugger: _dbg.Debugger ) -> None:
+    mname, flavor = debugger.module_name, debugger.flavor
+    configuration = _produce_ic_configuration( vehicle, mname, flavor )
+    control = _calculate_formatter_control(
+        vehicle, configuration, debugger.prefix )
+    if control == debugger.control: return
+    debugger.argToStringFunction = _produce_formatter(
+        configuration, control, mname, flavor )
+    debugger.control = control
@@ -52,6 +52,15 @@ def test_010_argument_class_invalidity( exceptions ):
     assert 'str' in str( excinfo.value )
 
 
+def test_011_argument_value_invalidity( exceptions ):
+    ''' ArgumentValueInvalidity exception provides helpful message. '''
+    with pytest.raises( exceptions.ArgumentValueInvalidity ) as excinfo:
+        raise exceptions.ArgumentValueInvalidity(
+            'count', 0, 'at least 1' )
+    assert str( excinfo.value ) == (
+        "Argument 'count' must be at least 1. Got: 0" )
+
+
 def test_020_flavor_inavailability( exceptions ):
     ''' FlavorInavailability exception properly formats flavor. '''
     with pytest.raises( exceptions.FlavorInavailability ) as excinfo:
@@ -0,0 +1,403 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+
+''' Tests for formatters module. '''
+
+
+import collections
+import dataclasses
+import decimal
+import fractions
+import functools
+import ipaddress
+import pathlib
+import typing
+
+import pytest
+
+from . import PACKAGE_NAME, cache_import_module
+
+
+@pytest.fixture( scope = 'session' )
+def configuration( ):
+    ''' Provides configuration module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.configuration" )
+
+
+@pytest.fixture( scope = 'session' )
+def formatters( ):
+    ''' Provides formatters module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.formatters" )
+
+
+@pytest.fixture( scope = 'session' )
+def vehicles( ):
+    ''' Provides vehicles module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.vehicles" )
+
+
+class _FakeDtype:
+
+    kind = 'f'
+
+    def __str__( self ): return 'float64'
+
+
+class _FakeFlat:
+
+    def __init__( self, values ): self.values = values
+
+    def __getitem__( self, selector ):
+        return _FakeArray( self.values[ selector ] )
+
+
+class _FakeArray:
+
+    dtype = _FakeDtype( )
+
+    def __init__( self, values ):
+        self.values = list( values )
+        self.size = len( self.values )
+        self.nbytes = 8 * self.size
+        self.flat = _FakeFlat( self.values )
+
+    def __array__( self ): raise AssertionError( 'conversion' )
+
+    def __repr__( self ): raise AssertionError( 'conversion' )
+
+    @property
+    def shape( self ): return ( self.size, )
+
+    def max( self ): return max( self.values )
+
+    def mean( self ): return sum( self.values ) / self.size
+
+    def min( self ): return min( self.values )
+
+    def tolist( self ): return list( self.values )
+
+
+@dataclasses.dataclass
+class _Point:
+
+    x: int
+    y: int
+    label: str = dataclasses.field( default = '', repr = False )
+
+
+class _Listing( list ): pass
+
+
+class _Pair( typing.NamedTuple ):
+
+    first: int
+    second: str
+
+
+class _Slotted:
+
+    __slots__ = ( '__hidden', 'name', 'size' )
+
+    def __init__( self, name ):
+        self.name = name
+        self.__hidden = True
+
+
+class _SlottedChild( _Slotted ):
+
+    __slots__ = ( 'extra', )
+
+
+class _Handwritten:
+
+    __slots__ = ( 'name', )
+
+    def __init__( self ): self.name = 'h'
+
+    def __repr__( self ): return f"<handwritten {self.name}>"
+
+
+@dataclasses.dataclass
+class _HandwrittenPoint:
+
+    x: int
+
+    def __repr__( self ): return f"<point {self.x}>"
+
+
+class _Unrepresentable:
+
+    def __repr__( self ):
+        raise ValueError( 'broken' )
+
+
+def test_010_type_dispatcher( formatters ):
+    ''' Dispatcher resolves formatters along MRO and caches by type. '''
+    fallbacks = [ ]
+    def fallback( value ):
+        fallbacks.append( value )
+        return 'fallback'
+    dispatcher = formatters.TypeDispatcher(
+        formatters.scalar_formatters, fallback )
+    assert dispatcher( 'x' ) == "'x'"
+    assert dispatcher( True ) == 'True'
+    assert dispatcher( None ) == 'None'
+    assert dispatcher( [ 1 ] ) == 'fallback'
+    assert fallbacks == [ [ 1 ] ]
+    assert dispatcher.resolutions[ bool ] is repr
+    assert dispatcher.resolutions[ list ] is fallback
+
+
+def test_011_type_formatters_configuration(
+    configuration, vehicles, simple_output
+):
+    ''' Type formatters merge across configuration hierarchy. '''
+    truck = vehicles.Truck(
+        generalcfg = configuration.VehicleConfiguration(
+            type_formatters = { int: lambda value: f"int:{value}" } ),
+        modulecfgs = vehicles.ModulesConfigurationsRegistry( ),
+        printer_factory = simple_output,
+        trace_levels = { None: 0 } )
+    truck.register_module( configuration = configuration.ModuleConfiguration(
+        type_formatters = { str: lambda value: f"str:{value}" } ) )
+    number, text, real = 1, 'a', 2.5
+    truck( 0 )( number, text, real )
+    assert simple_output.getvalue( ) == (
+        "TRACE0| number: int:1, text: str:a, real: 2.5\n" )
+
+
+def test_050_array_formatter( configuration, formatters ):
+    ''' Array-like values are summarized; other values fall back. '''
+    formatter = formatters.produce_array_formatter(
+        configuration.FormatterControl( ), __name__, 1, edge = 2 )
+    assert formatter( _FakeArray( range( 1_000 ) ) ) == (
+        "_FakeArray(shape=(1000,), dtype=float64, nbytes=8000, "
+        "min=0, max=999, mean=499.5, head=[0, 1], tail=[998, 999])" )
+    assert formatter( _FakeArray( [ 1.0 ] ) ) == (
+        "_FakeArray(shape=(1,), dtype=float64, nbytes=8, "
+        "min=1.0, max=1.0, mean=1.0, values=[1.0])" )
+    assert formatter( [ 1, 2 ] ) == '[1, 2]'
+
+
+def test_051_array_formatter_numpy( configuration, formatters ):
+    ''' NumPy arrays are summarized without full conversion. '''
+    numpy = pytest.importorskip( 'numpy' )
+    formatter = formatters.produce_array_formatter(
+        configuration.FormatterControl( ), __name__, 1 )
+    text = formatter( numpy.arange( 12, dtype = 'int64' ).reshape( 3, 4 ) )
+    assert text.startswith(
+        "ndarray(shape=(3, 4), dtype=int64, nbytes=96, min=" )
+    assert text.endswith( "head=[0, 1, 2], tail=[9, 10, 11])" )
+
+
+def test_052_array_formatter_kinds( configuration, formatters ):
+    ''' Statistics are only computed for numeric kinds of data. '''
+    formatter = formatters.produce_array_formatter(
+        configuration.FormatterControl( ), __name__, 1, edge = 2 )
+    for kind in ( '', 'bi', 'O' ):
+        value = _FakeArray( range( 5 ) )
+        value.dtype = type( '_Dtype', ( _FakeDtype, ), { 'kind': kind } )( )
+        assert 'min=' not in formatter( value )
+    value = _FakeArray( range( 5 ) )
+    value.dtype = object( )
+    assert 'min=' not in formatter( value )
+
+
+def test_053_array_formatter_dataframe( configuration, formatters ):
+    ''' Data frames are summarized over numeric columns by data type. '''
+    pandas = pytest.importorskip( 'pandas' )
+    formatter = formatters.produce_array_formatter(
+        configuration.FormatterControl( ), __name__, 1, edge = 1 )
+    frame = pandas.DataFrame( dict(
+        a = [ 1, 2, 3 ], b = [ 'x', 'y', 'z' ], c = [ 0.5, 1.5, 2.5 ] ) )
+    text = formatter( frame )
+    assert text.startswith(
+        "DataFrame(shape=(3, 3), dtypes=[float64, int64, " )
+    assert "columns=3, " in text
+    assert text.endswith(
+        "min=0.5, max=3.0, mean=1.75, "
+        "head=[[1, 'x', 0.5]], tail=[[3, 'z', 2.5]])" )
+    text = formatter( pandas.DataFrame( dict( b = [ 'x', 'y' ] ) ) )
+    assert 'min=' not in text
+    assert text.endswith( "values=[['x'], ['y']])" )
+
+
+def test_060_record_formatter( configuration, formatters ):
+    ''' Record formatter renders records via generated renderers. '''
+    formatter = formatters.produce_record_formatter(
+        configuration.FormatterControl( ), __name__, 1 )
+    assert formatter( _Point( 1, 2, 'x' ) ) == '_Point(x=1, y=2)'
+    assert formatter( _Point( 3, 4 ) ) == '_Point(x=3, y=4)'
+    assert formatter( _Pair( 1, 'a' ) ) == "_Pair(first=1, second='a')"
+    assert formatter( _SlottedChild( 'b' ) ) == (
+        "_SlottedChild(__hidden=True, name='b', size=<unset>, "
+        "extra=<unset>)" )
+    assert formatter( ( 1, 2 ) ) == '(1, 2)'
+    assert formatter( [ 1 ] ) == '[1]'
+    assert set( formatter.renderers ) == {
+        _Point, _Pair, _SlottedChild, tuple, list }
+
+
+def test_061_record_formatter_selections( configuration, formatters ):
+    ''' Record formatter honors field selections and truncation. '''
+    formatter = formatters.produce_record_formatter(
+        configuration.FormatterControl( columns_count_effective = 4 ),
+        __name__, 1, inclusions = ( 'y', 'first' ), exclusions = ( 'x', ) )
+    assert formatter( _Point( 1, 123456 ) ) == '_Point(y=1234...(2 more))'
+    assert formatter( _Pair( 1, 'a' ) ) == '_Pair(first=1)'
+    formatter = formatters.produce_record_formatter(
+        configuration.FormatterControl( ), __name__, 1,
+        exclusions = ( 'x', 'y' ) )
+    assert formatter( _Point( 1, 2 ) ) == '_Point()'
+
+
+def test_062_record_formatter_handwritten_reprs( configuration, formatters ):
+    ''' Classes with handwritten representations keep them. '''
+    formatter = formatters.produce_record_formatter(
+        configuration.FormatterControl( ), __name__, 1 )
+    values = (
+        ipaddress.IPv4Address( '192.168.1.1' ),
+        fractions.Fraction( 1, 3 ),
+        pathlib.PurePosixPath( '/srv/x' ),
+        decimal.Decimal( '1.5' ),
+        _Handwritten( ),
+        _HandwrittenPoint( 1 ) )
+    for value in values: assert formatter( value ) == repr( value )
+
+
+def test_063_record_formatter_strings( configuration, formatters ):
+    ''' Supplied maximum length of fields overrides columns count. '''
+    formatter = formatters.produce_record_formatter(
+        configuration.FormatterControl( columns_count_effective = 80 ),
+        __name__, 1, strings = 3 )
+    assert formatter( _Point( 12345, 'abcdef' ) ) == (
+        "_Point(x=123...(2 more), y='ab...(5 more))" )
+    formatter = formatters.produce_record_formatter(
+        configuration.FormatterControl( ), __name__, 1, strings = 4 )
+    assert formatter( _Point( 1, 2 ) ) == '_Point(x=1, y=2)'
+    assert formatter( _Point( 123456, 2 ) ) == '_Point(x=1234...(2 more), y=2)'
+
+
+def test_070_hexdump_formatter( configuration, formatters ):
+    ''' Hexdump formatter renders windows of byte buffers. '''
+    formatter = formatters.produce_hexdump_formatter(
+        configuration.FormatterControl( columns_count_effective = 40 ),
+        __name__, 1, window = 16 )
+    assert formatter( b'Hi\x00' ) == (
+        "bytes(nbytes=3)\n"
+        "00000000  48 69 00     |Hi.|" )
+    assert formatter( bytearray( range( 256 ) ) * 4096 ) == (
+        "bytearray(nbytes=1048576)\n"
+        "00000000  00 01 02 03  |....|\n"
+        "00000004  04 05 06 07  |....|\n"
+        "... (1048560 bytes elided) ...\n"
+        "000ffff8  f8 f9 fa fb  |....|\n"
+        "000ffffc  fc fd fe ff  |....|" )
+    assert formatter( [ 1 ] ) == '[1]'
+
+
+def test_071_hexdump_views( configuration, formatters ):
+    ''' Memory views, including strided ones, are rendered. '''
+    view = memoryview( bytes( range( 8 ) ) )
+    assert formatters.render_hexdump( view[ 2 : 6 ], width = 4 ) == (
+        "memoryview(nbytes=4)\n"
+        "00000000  02 03 04 05  |....|" )
+    formatter = formatters.produce_hexdump_formatter(
+        configuration.FormatterControl( ), __name__, 1 )
+    assert formatter( view[ : : 2 ] ).endswith( '|....|' )
+
+
+def test_100_safe_formatter_bounds( configuration, formatters ):
+    ''' Safe formatter bounds elements, depth, and total length. '''
+    budget = formatters.ReprBudget( characters = 100, depth = 2, elements = 3 )
+    formatter = formatters.produce_safe_formatter(
+        configuration.FormatterControl( ), __name__, 1, budget = budget )
+    value = { i: [ [ i ] ] * 10 for i in range( 100_000 ) }
+    assert formatter( value ) == (
+        "{0: [[...], [...], [...], ...(7 more)], "
+        "1: [[...], [...], [...], ...(7 more)], "
+        "2: [[...], [...], [.....(truncated)" )
+    assert formatter( ( 1, ) ) == '(1,)'
+    assert formatter( set( ) ) == 'set()'
+    assert formatter( frozenset( ( 1, ) ) ) == 'frozenset({1})'
+    assert formatter( frozenset( ) ) == 'frozenset()'
+
+
+def test_101_safe_formatter_hazards( configuration, formatters ):
+    ''' Safe formatter survives cycles and broken representations. '''
+    formatter = formatters.produce_safe_formatter(
+        configuration.FormatterControl( ), __name__, 1 )
+    cycle = [ 1 ]
+    cycle.append( cycle )
+    assert formatter( cycle ) == '[1, [...]]'
+    assert formatter( [ _Unrepresentable( ) ] ) == (
+        "[<_Unrepresentable repr failed: ValueError('broken')>]" )
+
+
+def test_102_safe_formatter_columns( configuration, formatters ):
+    ''' Long strings are truncated to effective columns count. '''
+    formatter = formatters.produce_safe_formatter(
+        configuration.FormatterControl( columns_count_effective = 5 ),
+        __name__, 1 )
+    assert formatter( [ 'abcdefgh', b'xy' ] ) == (
+        "['abcde'...(3 more), b'xy']" )
+
+
+def test_103_safe_formatter_per_flavor(
+    configuration, formatters, vehicles, simple_output
+):
+    ''' Safe formatter can be configured for individual flavors. '''
+    budget = formatters.ReprBudget( elements = 2 )
+    flavors = dict( configuration.produce_default_flavors( ) )
+    flavors[ 1 ] = configuration.FlavorConfiguration(
+        formatter_factory = functools.partial(
+            formatters.produce_safe_formatter, budget = budget ),
+        prefix_emitter = 'TRACE1| ' )
+    truck = vehicles.Truck(
+        generalcfg = configuration.VehicleConfiguration( flavors = flavors ),
+        printer_factory = simple_output,
+        trace_levels = { None: 1 } )
+    values = list( range( 5 ) )
+    truck( 0 )( values )
+    truck( 1 )( values )
+    assert simple_output.getvalue( ) == (
+        "TRACE0| values: [0, 1, 2, 3, 4]\n"
+        "TRACE1| values: [0, 1, ...(3 more)]\n" )
+
+
+def test_104_safe_formatter_containers( configuration, formatters ):
+    ''' Safe formatter bounds containers of other classes by interface. '''
+    budget = formatters.ReprBudget( elements = 3 )
+    formatter = formatters.produce_safe_formatter(
+        configuration.FormatterControl( ), __name__, 1, budget = budget )
+    assert formatter( collections.deque( range( 1_000_000 ) ) ) == (
+        'deque([0, 1, 2, ...(999997 more)])' )
+    counter = collections.Counter( range( 1_000_000 ) )
+    assert formatter( counter ) == (
+        'Counter({0: 1, 1: 1, 2: 1, ...(999997 more)})' )
+    assert formatter( collections.OrderedDict( a = [ 1 ] ) ) == (
+        "OrderedDict({'a': [1]})" )
+    assert formatter( collections.defaultdict( list ) ) == 'defaultdict({})'
+    assert formatter( _Listing( range( 5 ) ) ) == (
+        '_Listing([0, 1, 2, ...(2 more)])' )
+    assert formatter( _Pair( 1, 'b' ) ) == "_Pair(first=1, second='b')"
+    assert formatter( range( 5 ) ) == 'range(0, 5)'
+    assert formatter( 'abcde' ) == "'abcde'"
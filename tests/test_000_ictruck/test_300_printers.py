@@ -21,12 +21,20 @@
 ''' Tests for printers module. '''
 
 
+import functools
+
 import pytest
 
 
 from . import PACKAGE_NAME, cache_import_module
 
 
+@pytest.fixture( scope = 'session' )
+def exceptions( ):
+    ''' Provides exceptions module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.exceptions" )
+
+
 @pytest.fixture( scope = 'session' )
 def printers( ):
     ''' Provides printers module. '''
@@ -50,3 +58,105 @@ def test_011_simple_printer_color_output( printers, simple_output ):
     text = "\x1b[33mTest output\x1b[0m"
     printer( text )
     assert simple_output.getvalue( ) == f"{text}\n"
+
+
+def test_100_flight_recorder_records( printers, tmp_path ):
+    ''' Flight recorder retains records in chronological order. '''
+    location = str( tmp_path / 'recording' )
+    recorder = printers.produce_flight_recorder( location, capacity = 64 )
+    for i in range( 3 ): recorder.record( f"line {i}" )
+    recorder.flush( )
+    assert printers.decode_flight_recording( location ) == (
+        'line 0', 'line 1', 'line 2' )
+
+
+def test_101_flight_recorder_wraps( printers, tmp_path ):
+    ''' Flight recorder overwrites oldest records when full. '''
+    location = str( tmp_path / 'recording' )
+    recorder = printers.produce_flight_recorder( location, capacity = 64 )
+    for i in range( 20 ): recorder.record( f"line {i}" )
+    records = printers.decode_flight_recording( location )
+    assert records[ -1 ] == 'line 19'
+    assert 'line 0' not in records
+    assert all( record.startswith( 'line ' ) for record in records )
+
+
+def test_102_flight_recorder_continues( printers, tmp_path ):
+    ''' Flight recorder continues existing recording of same capacity. '''
+    location = str( tmp_path / 'recording' )
+    printers.produce_flight_recorder( location, capacity = 64 ).record( 'a' )
+    printers.produce_flight_recorder( location, capacity = 64 ).record( 'b' )
+    assert printers.decode_flight_recording( location ) == ( 'a', 'b' )
+    printers.produce_flight_recorder( location, capacity = 32 ).record( 'c' )
+    assert printers.decode_flight_recording( location ) == ( 'c', )
+
+
+def test_103_flight_recorder_oversize_record( printers, tmp_path ):
+    ''' Flight recorder truncates records larger than its capacity. '''
+    location = str( tmp_path / 'recording' )
+    recorder = printers.produce_flight_recorder( location, capacity = 8 )
+    recorder.record( 'abcdefghijkl' )
+    assert printers.decode_flight_recording( location ) == ( 'abcdefg', )
+
+
+def test_104_flight_recorder_invalid( printers, exceptions, tmp_path ):
+    ''' Invalid capacities and recordings are rejected. '''
+    location = tmp_path / 'recording'
+    with pytest.raises( exceptions.FlightRecorderCapacityInvalidity ):
+        printers.produce_flight_recorder( str( location ), capacity = 1 )
+    location.write_bytes( b'garbage' * 8 )
+    with pytest.raises( exceptions.FlightRecordingInvalidity ):
+        printers.decode_flight_recording( str( location ) )
+
+
+def test_105_flight_recorder_exact_fills( printers, tmp_path ):
+    ''' Whole records survive when ring is filled exactly. '''
+    location = str( tmp_path / 'recording' )
+    recorder = printers.produce_flight_recorder( location, capacity = 8 )
+    for text in ( 'aaa', 'bbb' ): recorder.record( text )
+    assert printers.decode_flight_recording( location ) == ( 'aaa', 'bbb' )
+    for text in ( 'ccc', 'ddd' ): recorder.record( text )
+    assert printers.decode_flight_recording( location ) == ( 'ccc', 'ddd' )
+    recorder.record( 'ee' )
+    assert printers.decode_flight_recording( location ) == ( 'ddd', 'ee' )
+    recorder.record( 'f' )
+    assert printers.decode_flight_recording( location ) == ( 'ee', 'f' )
+
+
+def test_106_flight_recorder_close( printers, tmp_path ):
+    ''' Closed flight recorders discard records. '''
+    location = str( tmp_path / 'recording' )
+    with printers.produce_flight_recorder(
+        location, capacity = 64
+    ) as recorder: recorder.record( 'kept' )
+    assert recorder.area.closed
+    recorder.record( 'discarded' )
+    recorder.flush( )
+    recorder.close( )
+    assert printers.decode_flight_recording( location ) == ( 'kept', )
+
+
+def test_110_recorder_printer( printers, tmp_path ):
+    ''' Recorder printer strips ANSI sequences unless forced to color. '''
+    location = str( tmp_path / 'recording' )
+    recorder = printers.produce_flight_recorder( location, capacity = 128 )
+    text = "\x1b[33mTest output\x1b[0m"
+    printers.produce_recorder_printer( recorder, 'test', 1 )( text )
+    printers.produce_recorder_printer(
+        recorder, 'test', 1, force_color = True )( text )
+    assert printers.decode_flight_recording( location ) == (
+        'Test output', text )
+
+
+def test_200_routing_printer( printers, simple_output, tmp_path ):
+    ''' Routing printer selects printer factory by flavor. '''
+    location = str( tmp_path / 'recording' )
+    recorder = printers.produce_flight_recorder( location, capacity = 128 )
+    routes = { 'error': simple_output }
+    default = functools.partial( printers.produce_recorder_printer, recorder )
+    printers.produce_routing_printer( routes, default, 'test', 'error' )(
+        'Failure' )
+    printers.produce_routing_printer( routes, default, 'test', 5 )(
+        'Details' )
+    assert simple_output.getvalue( ) == 'Failure\n'
+    assert printers.decode_flight_recording( location ) == ( 'Details', )
@@ -0,0 +1,610 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+''' Tests for debuggers module. '''
+
+
+import asyncio
+import sys
+import threading
+
+import icecream
+import pytest
+
+from . import PACKAGE_NAME, cache_import_module
+
+
+@pytest.fixture( scope = 'session' )
+def configuration( ):
+    ''' Provides configuration module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.configuration" )
+
+
+@pytest.fixture( scope = 'session' )
+def debuggers( ):
+    ''' Provides debuggers module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.debuggers" )
+
+
+@pytest.fixture( scope = 'session' )
+def exceptions( ):
+    ''' Provides exceptions module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.exceptions" )
+
+
+@pytest.fixture( scope = 'session' )
+def vehicles( ):
+    ''' Provides vehicles module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.vehicles" )
+
+
+def _produce_truck( configuration, vehicles, printer_factory, **nomargs ):
+    flavors = dict( configuration.produce_default_flavors( ) )
+    flavors[ 'error' ] = configuration.FlavorConfiguration(
+        prefix_emitter = 'ERROR| ' )
+    flavors[ 'note' ] = configuration.FlavorConfiguration(
+        prefix_emitter = 'NOTE| ' )
+    return vehicles.Truck(
+        generalcfg = configuration.VehicleConfiguration( flavors = flavors ),
+        printer_factory = printer_factory,
+        active_flavors = { None: frozenset( { 'error' } ) },
+        trace_levels = { None: 0 },
+        **nomargs )
+
+
+def test_010_debugger_passthrough( configuration, vehicles, simple_output ):
+    ''' Debugger returns its arguments, like Icecream does. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    for debugger in ( truck( 0 ), truck( 1 ) ):
+        assert debugger( ) is None
+        assert debugger( 42 ) == 42
+        assert debugger( 1, 2 ) == ( 1, 2 )
+
+
+def test_011_debugger_identity( configuration, vehicles, simple_output ):
+    ''' Debugger knows its module and flavor. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    debugger = truck( 1 )
+    assert debugger.module_name == __name__
+    assert debugger.flavor == 1
+
+
+def test_012_icecream_interfaces( ):
+    ''' Private interfaces of Icecream, on which records rely, exist. '''
+    for name in (
+        '_constructArgumentOutput', '_formatContext', '_formatTime'
+    ): assert callable( getattr( icecream.IceCreamDebugger, name ) )
+    assert callable( icecream.Source.executing )
+    assert hasattr( icecream.Sentinel, 'absent' )
+
+
+def test_050_buffered_scope_discards(
+    configuration, vehicles, simple_output
+):
+    ''' Buffered emissions are discarded, unformatted, on success. '''
+    formatted = [ ]
+    def formatter_factory( control, mname, flavor ):
+        def formatter( value ):
+            formatted.append( value )
+            return repr( value )
+        return formatter
+    truck = vehicles.Truck(
+        generalcfg = configuration.VehicleConfiguration(
+            formatter_factory = formatter_factory ),
+        printer_factory = simple_output,
+        trace_levels = { None: 0 } )
+    with truck.buffered_scope( ) as scope:
+        truck( 0 )( 'buffered' )
+        assert scope.bytes_count > 0
+        assert len( scope.records ) == 1
+    assert not formatted
+    assert not simple_output.getvalue( )
+    assert not scope.records
+
+
+def test_051_buffered_scope_exception(
+    configuration, vehicles, simple_output
+):
+    ''' Buffered emissions are printed when scope exits by exception. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    with pytest.raises( ValueError ), truck.buffered_scope( ):
+        truck( 0 )( 'first' )
+        truck( 'error' )( 'second' )
+        raise ValueError
+    assert simple_output.getvalue( ) == (
+        "TRACE0| 'first'\nERROR| 'second'\n" )
+
+
+def test_052_buffered_scope_keep_and_latency(
+    configuration, vehicles, simple_output
+):
+    ''' Buffered emissions are printed if kept or if scope is slow. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    with truck.buffered_scope( ) as scope:
+        truck( 0 )( 'kept' )
+        scope.keep( )
+    with truck.buffered_scope( latency_threshold = -1.0 ):
+        truck( 0 )( 'slow' )
+    with truck.buffered_scope( latency_threshold = 3600.0 ):
+        truck( 0 )( 'fast' )
+    assert simple_output.getvalue( ) == "TRACE0| 'kept'\nTRACE0| 'slow'\n"
+
+
+def test_053_buffered_scope_nesting(
+    configuration, vehicles, simple_output
+):
+    ''' Released emissions of nested scope pass to enclosing scope. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    with truck.buffered_scope( ) as outer:
+        with truck.buffered_scope( ) as inner:
+            truck( 0 )( 'inner' )
+            inner.keep( )
+        assert not simple_output.getvalue( )
+        assert len( outer.records ) == 1
+    assert not simple_output.getvalue( )
+
+
+def test_054_buffered_scope_decorator(
+    configuration, vehicles, simple_output
+):
+    ''' Decorated functions and coroutines get fresh scopes. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    @truck.buffered_scope( )
+    def work( fail ):
+        truck( 0 )( fail )
+        if fail: raise RuntimeError
+    @truck.buffered_scope( )
+    async def work_async( fail ):
+        truck( 0 )( fail )
+        await asyncio.sleep( 0 )
+        if fail: raise RuntimeError
+    async def run_tasks( ):
+        return await asyncio.gather(
+            work_async( False ), work_async( True ),
+            return_exceptions = True )
+    work( False )
+    with pytest.raises( RuntimeError ): work( True )
+    asyncio.run( run_tasks( ) )
+    assert simple_output.getvalue( ) == (
+        "TRACE0| fail: True\nTRACE0| fail: True\n" )
+
+
+def test_055_current_buffered_scope(
+    configuration, debuggers, vehicles, simple_output
+):
+    ''' Current scope is accessible from within decorated functions. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    assert debuggers.current_buffered_scope( ) is None
+    @truck.buffered_scope( )
+    def work( keep ):
+        truck( 0 )( keep )
+        scope = debuggers.current_buffered_scope( )
+        assert scope is not None
+        if keep: scope.keep( )
+        return scope
+    with truck.buffered_scope( ) as outer:
+        assert debuggers.current_buffered_scope( ) is outer
+        scope = work( False )
+        assert scope is not outer
+        assert debuggers.current_buffered_scope( ) is outer
+        outer.keep( )
+    work( True )
+    assert debuggers.current_buffered_scope( ) is None
+    assert simple_output.getvalue( ) == "TRACE0| keep: True\n"
+
+
+def test_056_buffered_scope_release_within(
+    configuration, vehicles, simple_output
+):
+    ''' Releasing active scope prints or passes on, never re-buffers. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    with truck.buffered_scope( ) as scope:
+        truck( 0 )( 'early' )
+        scope.release( )
+        assert not scope.records
+        assert simple_output.getvalue( ) == "TRACE0| 'early'\n"
+        truck( 0 )( 'late' )
+    assert simple_output.getvalue( ) == "TRACE0| 'early'\n"
+    with truck.buffered_scope( ) as outer:
+        with truck.buffered_scope( ) as inner:
+            truck( 0 )( 'inner' )
+            with truck.buffered_scope( ):
+                inner.release( )
+            assert not inner.records
+        assert len( outer.records ) == 1
+    assert simple_output.getvalue( ) == "TRACE0| 'early'\n"
+
+
+def test_070_activation_overlay( configuration, vehicles, simple_output ):
+    ''' Overlay activates flavors and trace levels within context. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    truck( 2 )( 'before' )
+    with truck.activate( flavors = [ 'note' ], trace_levels = 2 ):
+        truck( 2 )( 'during' )
+        truck( 3 )( 'deeper' )
+        truck( 'note' )( 'noted' )
+        truck( 'error' )( 'always' )
+    truck( 2 )( 'after' )
+    assert simple_output.getvalue( ) == (
+        "TRACE2| 'during'\nNOTE| 'noted'\nERROR| 'always'\n" )
+
+
+def test_071_activation_overlay_modules(
+    configuration, vehicles, simple_output
+):
+    ''' Overlay respects module names and nests with enclosing overlays. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    other = _produce_truck( configuration, vehicles, simple_output )
+    with truck.activate( trace_levels = { 'elsewhere': 5 } ):
+        truck( 1 )( 'skipped' )
+        truck( 1, module_name = 'elsewhere.sub' )( 'sub' )
+        with truck.activate( flavors = { __name__: [ 'note' ] } ):
+            truck( 'note' )( 'noted' )
+            truck( 1, module_name = 'elsewhere' )( 'outer' )
+            other( 'note' )( 'other' )
+    assert simple_output.getvalue( ) == (
+        "TRACE1| 'sub'\nNOTE| 'noted'\nTRACE1| 'outer'\n" )
+
+
+def test_072_activation_overlay_context_local(
+    configuration, vehicles, simple_output
+):
+    ''' Overlay does not apply to other threads or to sibling tasks. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    async def work( active ):
+        if active:
+            with truck.activate( trace_levels = 1 ):
+                await asyncio.sleep( 0 )
+                truck( 1 )( active )
+        else:
+            await asyncio.sleep( 0 )
+            truck( 1 )( active )
+    async def run_tasks( ):
+        await asyncio.gather( work( True ), work( False ) )
+    with truck.activate( trace_levels = 1 ):
+        thread = threading.Thread( target = lambda: truck( 1 )( 'thread' ) )
+        thread.start( )
+        thread.join( )
+    asyncio.run( run_tasks( ) )
+    assert simple_output.getvalue( ) == "TRACE1| active: True\n"
+
+
+def test_080_rate_limit( configuration, vehicles, simple_output ):
+    ''' Rate limit suppresses excess emissions and then reports them. '''
+    truck = _produce_truck(
+        configuration, vehicles, simple_output,
+        modulecfgs = vehicles.ModulesConfigurationsRegistry( ) )
+    truck.register_module( configuration = configuration.ModuleConfiguration(
+        rate_limit = configuration.RateLimit( rate = 1.0, burst = 2 ) ) )
+    debugger = truck( 'error' )
+    for i in range( 5 ): debugger( i )
+    assert debugger.limiter.suppressions == 3
+    debugger.limiter.updated -= 1.0
+    debugger( 'resumed' )
+    assert simple_output.getvalue( ) == (
+        "ERROR| i: 0\nERROR| i: 1\n"
+        "ERROR| 3 emissions suppressed by rate limit.\n"
+        "ERROR| 'resumed'\n" )
+    assert debugger.emissions == 3
+
+
+def test_081_rate_limit_inheritance( configuration, vehicles, simple_output ):
+    ''' Flavor rate limits override module rate limits. '''
+    flavors = dict( configuration.produce_default_flavors( ) )
+    flavors[ 'note' ] = configuration.FlavorConfiguration(
+        rate_limit = configuration.RateLimit( rate = 5.0 ) )
+    truck = vehicles.Truck(
+        generalcfg = configuration.VehicleConfiguration( flavors = flavors ),
+        modulecfgs = vehicles.ModulesConfigurationsRegistry( ),
+        printer_factory = simple_output )
+    assert truck( 0 ).limiter is None
+    truck.register_module( configuration = configuration.ModuleConfiguration(
+        rate_limit = configuration.RateLimit( rate = 2.0, burst = 4 ) ) )
+    limiter = truck( 'note', module_name = f"{__name__}.sub" ).limiter
+    assert ( limiter.rate, limiter.burst ) == ( 5.0, 1.0 )
+    limiter = truck( 1, module_name = f"{__name__}.sub" ).limiter
+    assert ( limiter.rate, limiter.burst ) == ( 2.0, 4.0 )
+
+
+def test_090_call_site_every_and_first(
+    configuration, vehicles, simple_output
+):
+    ''' Modifiers emit every Nth or first N invocations per call site. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    for i in range( 7 ):
+        assert truck( 0 ).every( 3 )( i ) == i
+        assert truck( 0 ).first( 2 )( i * 10, 'x' ) == ( i * 10, 'x' )
+    assert simple_output.getvalue( ) == (
+        "TRACE0| i: 0\n"
+        "TRACE0| i * 10: 0, 'x'\n"
+        "TRACE0| i * 10: 10, 'x'\n"
+        "TRACE0| i: 3\n"
+        "TRACE0| i: 6\n" )
+
+
+def test_091_call_site_once( configuration, vehicles, simple_output ):
+    ''' Once modifier emits on first invocation from each call site. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    for i in range( 3 ):
+        assert truck( 0 ).once( i ) == i
+        truck( 0 ).once( i + 100 )
+    assert simple_output.getvalue( ) == (
+        "TRACE0| i: 0\nTRACE0| i + 100: 100\n" )
+
+
+def test_092_call_site_per( configuration, vehicles, simple_output, mocker ):
+    ''' Per modifier emits at most once per interval from call site. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    monotonic = mocker.patch( 'time.monotonic', return_value = 100.0 )
+    for now in ( 100.0, 102.0, 105.0, 106.0 ):
+        monotonic.return_value = now
+        truck( 0 ).per( seconds = 5 )( now )
+    assert simple_output.getvalue( ) == (
+        "TRACE0| now: 100.0\nTRACE0| now: 105.0\n" )
+
+
+def test_093_call_site_every_invalid(
+    configuration, exceptions, vehicles, simple_output
+):
+    ''' Every modifier rejects counts less than one. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    for count in ( 0, -1 ):
+        with pytest.raises( exceptions.ArgumentValueInvalidity ):
+            truck( 0 ).every( count )
+        with pytest.raises( exceptions.ArgumentValueInvalidity ):
+            truck( 9 ).every( count )
+
+
+def test_094_call_site_first_and_per_invalid(
+    configuration, exceptions, vehicles, simple_output
+):
+    ''' First and per modifiers reject non-positive counts and intervals. '''
+    truck = _produce_truck( configuration, vehicles, simple_output )
+    for count in ( 0, -1 ):
+        with pytest.raises( exceptions.ArgumentValueInvalidity ):
+            truck( 0 ).first( count )
+        with pytest.raises( exceptions.ArgumentValueInvalidity ):
+            truck( 9 ).first( count )
+    for seconds in ( 0, -1.5, float( 'nan' ) ):
+        with pytest.raises( exceptions.ArgumentValueInvalidity ):
+            truck( 0 ).per( seconds )
+        with pytest.raises( exceptions.ArgumentValueInvalidity ):
+            truck( 9 ).per( seconds )
+    assert not simple_output.getvalue( )
+
+
+def test_095_throttler(
+    configuration, debuggers, vehicles, simple_output, mocker
+):
+    ''' Throttler samples hot call sites down and relaxes afterwards. '''
+    throttler = debuggers.Throttler( rate_budget = 2.0, window = 1.0 )
+    truck = _produce_truck(
+        configuration, vehicles, simple_output, throttler = throttler )
+    truck.reconfigure( active_flavors = {
+        None: [ 'error' ], PACKAGE_NAME: [ 'note' ] } )
+    monotonic = mocker.patch( 'time.monotonic', return_value = 100.0 )
+    def emit( now, count ):
+        monotonic.return_value = now
+        for _ in range( count ): truck( 0 )( now )
+    emit( 100.0, 4 )
+    emit( 101.5, 4 )
+    emit( 103.0, 1 )
+    emit( 110.0, 2 )
+    output = simple_output.getvalue( )
+    assert 'Throttling emissions from hot call site.' in output
+    assert f"{__file__}:" in output
+    lines = [
+        line for line in output.splitlines( )
+        if line.startswith( 'TRACE0| ' ) ]
+    assert lines == [ 'TRACE0| now: 100.0' ] * 4 + [
+        'TRACE0| now: 101.5', 'TRACE0| now: 101.5',
+        'TRACE0| now: 110.0', 'TRACE0| now: 110.0' ]
+
+
+def test_096_deduplicator_prefixes_and_bounds(
+    configuration, debuggers, vehicles, simple_output
+):
+    ''' Deduplicator ignores prefixes and bounds tracked call sites. '''
+    deduplicator = debuggers.Deduplicator( timeout = 10.0 )
+    truck = _produce_truck(
+        configuration, vehicles, simple_output, deduplicator = deduplicator )
+    ticks = iter( range( 100 ) )
+    def emit_prefix( mname, flavor ):
+        return lambda: f"{next( ticks )}| "
+    flavor = configuration.FlavorConfiguration( prefix_emitter = emit_prefix )
+    truck.register_module(
+        name = f"{__name__}.dedup",
+        configuration = configuration.ModuleConfiguration(
+            flavors = { 0: flavor } ) )
+    for _ in range( 3 ): truck( 0, module_name = f"{__name__}.dedup" )( 1 )
+    deduplicator.flush( )
+    assert simple_output.getvalue( ) == (
+        "0| 1\n3| Last message repeated 2 times.\n" )
+    maximum = debuggers._deduplicator_sites_maximum
+    mnames = [ 'a', 'a', *( f"b{i}" for i in range( maximum ) ) ]
+    for mname in mnames: truck( 0, module_name = mname )( 1 )
+    assert len( deduplicator._sites ) == maximum
+    assert not deduplicator._pending
+    assert simple_output.getvalue( ).endswith(
+        "TRACE0| Last message repeated 1 times.\nTRACE0| 1\n" )
+
+
+def test_097_deduplicator(
+    configuration, debuggers, vehicles, simple_output, mocker
+):
+    ''' Deduplicator collapses runs of repeats from each call site. '''
+    deduplicator = debuggers.Deduplicator( timeout = 10.0 )
+    truck = _produce_truck(
+        configuration, vehicles, simple_output, deduplicator = deduplicator )
+    monotonic = mocker.patch( 'time.monotonic', return_value = 100.0 )
+    def emit( now, values ):
+        monotonic.return_value = now
+        for value in values: truck( 0 )( value )
+    emit( 100.0, ( 1, 1, 1, 2, 2 ) )
+    emit( 120.0, ( 2, ) )
+    emit( 121.0, ( 2, ) )
+    deduplicator.flush( )
+    assert simple_output.getvalue( ) == (
+        "TRACE0| value: 1\n"
+        "TRACE0| Last message repeated 2 times.\n"
+        "TRACE0| value: 2\n"
+        "TRACE0| Last message repeated 2 times.\n"
+        "TRACE0| Last message repeated 1 times.\n" )
+
+
+def test_098_deduplicator_expirations(
+    configuration, debuggers, vehicles, simple_output, mocker
+):
+    ''' Expired repeats are summarized upon emissions from other sites. '''
+    deduplicator = debuggers.Deduplicator( timeout = 10.0 )
+    truck = _produce_truck(
+        configuration, vehicles, simple_output, deduplicator = deduplicator )
+    monotonic = mocker.patch( 'time.monotonic', return_value = 100.0 )
+    for _ in range( 5 ): truck( 0 )( 'same' )
+    truck( 0 )( 'other' )
+    monotonic.return_value = 111.0
+    truck( 0 )( 'another' )
+    assert simple_output.getvalue( ) == (
+        "TRACE0| 'same'\n"
+        "TRACE0| 'other'\n"
+        "TRACE0| Last message repeated 4 times.\n"
+        "TRACE0| 'another'\n" )
+
+
+def test_099_deduplicator_exit_flush(
+    configuration, debuggers, vehicles, simple_output
+):
+    ''' Held back repeats are summarized when process exits. '''
+    deduplicator = debuggers.Deduplicator( timeout = 10.0 )
+    truck = _produce_truck(
+        configuration, vehicles, simple_output, deduplicator = deduplicator )
+    for _ in range( 3 ): truck( 0 )( 'same' )
+    assert id( deduplicator ) in debuggers._pending_deduplicators
+    debuggers._flush_pending_deduplicators( )
+    assert simple_output.getvalue( ).endswith(
+        "TRACE0| Last message repeated 2 times.\n" )
+    assert id( deduplicator ) not in debuggers._pending_deduplicators
+    deduplicator.flush( )
+    assert simple_output.getvalue( ).count( 'repeated' ) == 1
+
+
+def test_100_retrospector_flush_on_trigger(
+    configuration, debuggers, vehicles, structured_capture
+):
+    ''' Inactive emissions are printed when trigger flavor emits. '''
+    retrospector = debuggers.Retrospector( capacity = 2 )
+    truck = _produce_truck(
+        configuration, vehicles, structured_capture.printer_factory,
+        retrospector = retrospector )
+    for value in range( 3 ): truck( 5 )( value )
+    assert not structured_capture.outputs
+    truck( 'error' )( 'failure' )
+    texts = [ output[ 2 ] for output in structured_capture.outputs ]
+    assert texts == [
+        'TRACE5| value: 1', 'TRACE5| value: 2', "ERROR| 'failure'" ]
+    structured_capture.clear( )
+    truck( 'error' )( 'again' )
+    texts = [ output[ 2 ] for output in structured_capture.outputs ]
+    assert texts == [ "ERROR| 'again'" ]
+
+
+def test_101_retrospector_defers_formatting(
+    configuration, debuggers, vehicles, simple_output
+):
+    ''' Retained emissions are only formatted when flushed. '''
+    formatted = [ ]
+    def formatter_factory( control, mname, flavor ):
+        def formatter( value ):
+            formatted.append( value )
+            return repr( value )
+        return formatter
+    retrospector = debuggers.Retrospector( )
+    truck = vehicles.Truck(
+        generalcfg = configuration.VehicleConfiguration(
+            formatter_factory = formatter_factory ),
+        printer_factory = simple_output,
+        retrospector = retrospector )
+    truck( 3 )( 'deferred' )
+    assert not formatted
+    retrospector.flush( )
+    assert formatted == [ 'deferred' ]
+    assert simple_output.getvalue( ) == "TRACE3| 'deferred'\n"
+
+
+def test_102_retrospector_per_thread(
+    configuration, debuggers, vehicles, structured_capture
+):
+    ''' Retained emissions are isolated per thread. '''
+    retrospector = debuggers.Retrospector( )
+    truck = _produce_truck(
+        configuration, vehicles, structured_capture.printer_factory,
+        retrospector = retrospector )
+    debugger = truck( 5 )
+    thread = threading.Thread( target = lambda: debugger( 'elsewhere' ) )
+    thread.start( )
+    thread.join( )
+    debugger( 'here' )
+    truck( 'error' )( 'failure' )
+    texts = [ output[ 2 ] for output in structured_capture.outputs ]
+    assert texts == [ "TRACE5| 'here'", "ERROR| 'failure'" ]
+
+
+def test_103_retrospector_excepthooks(
+    configuration, debuggers, vehicles, structured_capture, monkeypatch
+):
+    ''' Uncaught exceptions print retained emissions. '''
+    calls = [ ]
+    monkeypatch.setattr( sys, 'excepthook', lambda *a: calls.append( a ) )
+    monkeypatch.setattr( threading, 'excepthook', calls.append )
+    retrospector = debuggers.Retrospector( ).install_excepthooks( )
+    truck = _produce_truck(
+        configuration, vehicles, structured_capture.printer_factory,
+        retrospector = retrospector )
+    truck( 5 )( 'context' )
+    sys.excepthook( ValueError, ValueError( 'test' ), None )
+    texts = [ output[ 2 ] for output in structured_capture.outputs ]
+    assert texts == [ "TRACE5| 'context'" ]
+    def fail( ):
+        truck( 5 )( 'thread context' )
+        raise RuntimeError
+    thread = threading.Thread( target = fail )
+    thread.start( )
+    thread.join( )
+    texts = [ output[ 2 ] for output in structured_capture.outputs ]
+    assert texts[ -1 ] == "TRACE5| 'thread context'"
+    assert len( calls ) == 2
+
+
+def test_110_record_render_context( configuration, debuggers, vehicles ):
+    ''' Rendered records include context, if configured. '''
+    outputs = [ ]
+    retrospector = debuggers.Retrospector( )
+    truck = vehicles.Truck(
+        generalcfg = configuration.VehicleConfiguration(
+            include_context = True ),
+        printer_factory = lambda mname, flavor: outputs.append,
+        retrospector = retrospector )
+    truck( 2 )( )
+    truck( 2 )( 'value' )
+    retrospector.flush( )
+    assert outputs[ 0 ].startswith( 'TRACE2| test_350_debuggers.py:' )
+    assert ' at ' in outputs[ 0 ]
+    assert 'in test_110_record_render_context()' in outputs[ 1 ]
+    assert outputs[ 1 ].endswith( "'value'" )
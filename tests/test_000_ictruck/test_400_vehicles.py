@@ -22,6 +22,8 @@
 
 
 import functools as funct
+import io
+import os
 import warnings
 
 import accretive as accret
@@ -75,6 +77,13 @@ def mock_env( monkeypatch ):
     return _mock_env
 
 
+class _TerminalOutput( io.StringIO ):
+    ''' Text stream which masquerades as terminal. '''
+
+
+    def fileno( self ): return 1023
+
+
 def test_111_invalid_flavor_type( configuration, exceptions, vehicles ):
     ''' Passing invalid flavor type raises a validation error. '''
     truck = vehicles.Truck(
@@ -179,6 +188,73 @@ def test_150_textio_printer( configuration, vehicles, simple_output ):
     assert simple_output.getvalue( ).startswith( 'TRACE0| ' )
 
 
+def test_151_terminal_columns_control(
+    configuration, vehicles, monkeypatch
+):
+    ''' Formatters receive terminal width less prefix width. '''
+    controls = [ ]
+    def custom_formatter( ctrl, mname, flavor ):
+        controls.append( ctrl )
+        return repr
+    monkeypatch.setattr( os, 'isatty', lambda fd: fd == 1023 )
+    columns = [ 80 ]
+    monkeypatch.setattr(
+        os, 'get_terminal_size',
+        lambda fd: os.terminal_size( ( columns[ 0 ], 24 ) ) )
+    flavors = dict( configuration.produce_default_flavors( ) )
+    flavors[ 'note' ] = configuration.FlavorConfiguration(
+        prefix_emitter = lambda mname, flavor: '\x1b[1mNOTE\x1b[0m| ' )
+    truck = vehicles.Truck(
+        active_flavors = { None: { 'note' } },
+        generalcfg = configuration.VehicleConfiguration(
+            flavors = flavors, formatter_factory = custom_formatter ),
+        printer_factory = _TerminalOutput( ),
+        trace_levels = { None: 0 } )
+    truck.refresh_formatters( )
+    truck( 'note' )
+    truck( 1 )
+    assert controls[ 0 ].columns_count_effective == 74
+    assert controls[ 1 ].columns_count_effective is None
+    columns[ 0 ] = 100
+    truck.refresh_formatters( )
+    assert controls[ 2 ].columns_count_effective == 94
+    assert len( controls ) == 3
+    truck.reconfigure( trace_levels = 1 )
+    assert controls[ 3 ].columns_count_effective == 92
+    plain = vehicles.Truck(
+        generalcfg = configuration.VehicleConfiguration(
+            formatter_factory = custom_formatter ),
+        printer_factory = io.StringIO( ),
+        trace_levels = { None: 0 } )
+    plain( 0 )
+    assert controls[ 4 ].columns_count_effective is None
+
+
+def test_152_terminal_columns_wide_prefix(
+    configuration, vehicles, monkeypatch
+):
+    ''' Prefix width is measured in terminal cells, not characters. '''
+    controls = [ ]
+    def custom_formatter( ctrl, mname, flavor ):
+        controls.append( ctrl )
+        return repr
+    monkeypatch.setattr( os, 'isatty', lambda fd: fd == 1023 )
+    monkeypatch.setattr(
+        os, 'get_terminal_size', lambda fd: os.terminal_size( ( 80, 24 ) ) )
+    flavors = dict( configuration.produce_default_flavors( ) )
+    flavors[ 'error' ] = configuration.FlavorConfiguration(
+        prefix_emitter = '\x1b[31m\U0001f50e ERROR\x1b[0m| ' )
+    truck = vehicles.Truck(
+        active_flavors = { None: { 'error' } },
+        generalcfg = configuration.VehicleConfiguration(
+            flavors = flavors, formatter_factory = custom_formatter ),
+        printer_factory = _TerminalOutput( ) )
+    truck.refresh_formatters( )
+    truck( 'error' )
+    assert controls[ 0 ].columns_count_effective == 70
+    assert vehicles._measure_cells( '\u274c\ufe0f a\u0301\u200d' ) == 4
+
+
 def test_200_debugger_cache( configuration, vehicles, structured_capture ):
     ''' Debugger caching works correctly with factories. '''
     truck = vehicles.Truck(
@@ -192,6 +268,42 @@ def test_200_debugger_cache( configuration, vehicles, structured_capture ):
     assert len( structured_capture.outputs ) == 1
 
 
+def test_210_reconfigure( configuration, vehicles ):
+    ''' Reconfiguration swaps activations and updates cached debuggers. '''
+    flavors = dict( configuration.produce_default_flavors( ) )
+    flavors[ 'debug' ] = (
+        configuration.FlavorConfiguration( prefix_emitter = 'DEBUG| ' ) )
+    truck = vehicles.Truck(
+        generalcfg = configuration.VehicleConfiguration( flavors = flavors ),
+        trace_levels = { None: 0 } )
+    shallow, deep, debug = truck( 0 ), truck( 5, module_name = 'x.y' ), (
+        truck( 'debug' ) )
+    assert ( shallow.enabled, deep.enabled, debug.enabled ) == (
+        True, False, False )
+    truck.reconfigure( trace_levels = { 'x': 5 } )
+    assert ( shallow.enabled, deep.enabled, debug.enabled ) == (
+        False, True, False )
+    truck.reconfigure( active_flavors = [ 'debug' ] )
+    assert truck.trace_levels == immut.Dictionary( { None: -1, 'x': 5 } )
+    assert debug.enabled
+    assert truck( 1, module_name = 'x' ).enabled
+    truck.reconfigure( trace_levels = -1 )
+    assert not deep.enabled
+
+
+def test_211_activation_specifications( vehicles ):
+    ''' Specification strings are parsed like environment variables. '''
+    assert vehicles.active_flavors_from_specification(
+        'note+x.y:*+z:a,b' ) == immut.Dictionary( {
+            None: frozenset( { 'note' } ),
+            'x.y': vehicles.omniflavor,
+            'z': frozenset( { 'a', 'b' } ) } )
+    assert vehicles.trace_levels_from_specification(
+        '2+x.y:5' ) == immut.Dictionary( { None: 2, 'x.y': 5 } )
+    assert vehicles.trace_levels_from_specification(
+        '' ) == immut.Dictionary( { None: -1 } )
+
+
 @hypothesis.given(
     vehicle_include = st.booleans( ),
     module_include = st.one_of( st.none( ), st.booleans( ) ),
@@ -272,6 +384,54 @@ def test_310_prefix_inheritance(
     assert output.startswith( expected )
 
 
+def test_311_prefix_emitter_per_debugger(
+    configuration, vehicles, simple_output
+):
+    ''' Prefix emitters returning strings are invoked once per debugger. '''
+    calls = [ ]
+    def emitter( mname, flavor ):
+        calls.append( ( mname, flavor ) )
+        return f"{len( calls )}| "
+    flavors = dict( configuration.produce_default_flavors( ) )
+    flavors[ 0 ] = configuration.FlavorConfiguration(
+        prefix_emitter = emitter )
+    truck = vehicles.Truck(
+        generalcfg = configuration.VehicleConfiguration( flavors = flavors ),
+        printer_factory = simple_output,
+        trace_levels = { None: 0 } )
+    value = 1
+    truck( 0 )( value )
+    truck( 0 )( value )
+    assert simple_output.getvalue( ) == "1| value: 1\n1| value: 1\n"
+    assert calls == [ ( __name__, 0 ) ]
+
+
+def test_312_prefix_emitter_renderer_per_emission(
+    configuration, vehicles, simple_output
+):
+    ''' Prefix renderers from emitters are invoked for every emission. '''
+    calls = [ ]
+    renders = [ ]
+    def render( ):
+        renders.append( None )
+        return f"{len( renders )}| "
+    def emitter( mname, flavor ):
+        calls.append( ( mname, flavor ) )
+        return render
+    flavors = dict( configuration.produce_default_flavors( ) )
+    flavors[ 0 ] = configuration.FlavorConfiguration(
+        prefix_emitter = emitter )
+    truck = vehicles.Truck(
+        generalcfg = configuration.VehicleConfiguration( flavors = flavors ),
+        printer_factory = simple_output,
+        trace_levels = { None: 0 } )
+    value = 1
+    truck( 0 )( value )
+    truck( 0 )( value )
+    assert simple_output.getvalue( ) == "1| value: 1\n2| value: 1\n"
+    assert calls == [ ( __name__, 0 ) ]
+
+
 @pytest.mark.parametrize(
     'module_name, parent_modules, flavor_overrides, expected_prefix',
     [
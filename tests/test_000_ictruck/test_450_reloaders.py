@@ -0,0 +1,148 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+
+''' Tests for reloaders module. '''
+
+
+import io
+import os
+import signal
+import time
+
+import pytest
+
+from . import PACKAGE_NAME, cache_import_module
+
+
+@pytest.fixture( scope = 'session' )
+def exceptions( ):
+    ''' Provides exceptions module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.exceptions" )
+
+
+@pytest.fixture( scope = 'session' )
+def reloaders( ):
+    ''' Provides reloaders module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.reloaders" )
+
+
+@pytest.fixture( scope = 'session' )
+def vehicles( ):
+    ''' Provides vehicles module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.vehicles" )
+
+
+def _wait_for( predicate, timeout = 5.0 ):
+    deadline = time.monotonic( ) + timeout
+    while not predicate( ) and time.monotonic( ) < deadline:
+        time.sleep( 0.01 )
+    return predicate( )
+
+
+def test_100_reconfigure_from_file( reloaders, vehicles, tmp_path ):
+    ''' Activation specifications are read from file. '''
+    location = tmp_path / 'activation'
+    location.write_text(
+        '# Comment.\n\ntrace_levels = 1+x.y:5\nactive_flavors = note\n' )
+    truck = vehicles.Truck( trace_levels = { None: 0 } )
+    debugger = truck( 5, module_name = 'x.y.z' )
+    assert not debugger.enabled
+    reloaders.reconfigure_from_file( truck, str( location ) )
+    assert debugger.enabled
+    assert truck.trace_levels[ None ] == 1
+    location.write_text( 'trace_levels =\n' )
+    reloaders.reconfigure_from_file( truck, str( location ) )
+    assert not debugger.enabled
+    assert truck.active_flavors[ None ] == frozenset( { 'note' } )
+
+
+def test_101_reconfigure_from_invalid_file(
+    exceptions, reloaders, vehicles, tmp_path
+):
+    ''' Unknown activation names in file are rejected. '''
+    location = tmp_path / 'activation'
+    location.write_text( 'trace_level = 1\n' )
+    truck = vehicles.Truck( )
+    with pytest.raises( exceptions.ActivationSpecificationInvalidity ):
+        reloaders.reconfigure_from_file( truck, str( location ) )
+
+
+def test_110_activation_watcher( reloaders, vehicles, tmp_path ):
+    ''' Watcher reconfigures truck when file modification time changes. '''
+    location = tmp_path / 'activation'
+    truck = vehicles.Truck( )
+    debugger = truck( 3, module_name = 'x' )
+    watcher = reloaders.ActivationWatcher(
+        truck = truck, location = str( location ), interval = 0.01 )
+    assert not watcher.check( )
+    location.write_text( 'trace_levels = x:3\n' )
+    watcher.start( )
+    try:
+        assert debugger.enabled
+        location.write_text( 'trace_levels = x:2\n' )
+        stat = location.stat( )
+        os.utime( location, ns = ( stat.st_atime_ns, stat.st_mtime_ns + 1 ) )
+        assert _wait_for( lambda: not debugger.enabled )
+    finally: watcher.stop( )
+    assert not watcher.check( )
+
+
+@pytest.mark.skipif(
+    not hasattr( signal, 'SIGUSR1' ), reason = 'Requires SIGUSR1.' )
+def test_120_reload_signal_handler( reloaders, vehicles, monkeypatch ):
+    ''' Signal handler re-reads activation from environment. '''
+    truck = vehicles.Truck( )
+    debugger = truck( 2 )
+    monkeypatch.setenv( 'ICTRUCK_TRACE_LEVELS', '2' )
+    handler_o = signal.getsignal( signal.SIGUSR1 )
+    reloaders.install_reload_signal_handler(
+        truck, signum = signal.SIGUSR1 )
+    try:
+        os.kill( os.getpid( ), signal.SIGUSR1 )
+        assert _wait_for( lambda: debugger.enabled )
+    finally: signal.signal( signal.SIGUSR1, handler_o )
+
+
+@pytest.mark.skipif(
+    not hasattr( signal, 'SIGUSR2' ), reason = 'Requires SIGUSR2.' )
+def test_130_resize_signal_handler( reloaders, vehicles, monkeypatch ):
+    ''' Signal handler refreshes formatters of truck. '''
+    class TerminalOutput( io.StringIO ):
+        def fileno( self ): return 1022
+    columns = [ 80 ]
+    monkeypatch.setattr( os, 'isatty', lambda fd: fd == 1022 )
+    monkeypatch.setattr(
+        os, 'get_terminal_size',
+        lambda fd: os.terminal_size( ( columns[ 0 ], 24 ) ) )
+    truck = vehicles.Truck(
+        printer_factory = TerminalOutput( ), trace_levels = { None: 0 } )
+    truck.refresh_formatters( )
+    debugger = truck( 0 )
+    assert debugger.control.columns_count_effective == 72
+    columns[ 0 ] = 120
+    handler_o = signal.getsignal( signal.SIGUSR2 )
+    reloaders.install_resize_signal_handler(
+        truck, signum = signal.SIGUSR2 )
+    try:
+        os.kill( os.getpid( ), signal.SIGUSR2 )
+        assert _wait_for(
+            lambda: debugger.control.columns_count_effective == 112 )
+    finally: signal.signal( signal.SIGUSR2, handler_o )
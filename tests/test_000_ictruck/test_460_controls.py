@@ -0,0 +1,196 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+
+''' Tests for controls module. '''
+
+
+import atexit
+import json
+import socket
+
+import pytest
+
+from . import PACKAGE_NAME, cache_import_module
+
+
+pytestmark = pytest.mark.skipif(
+    not hasattr( socket, 'AF_UNIX' ),
+    reason = 'Requires Unix domain sockets.' )
+
+
+@pytest.fixture( scope = 'session' )
+def cli( ):
+    ''' Provides command-line interface module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.__main__" )
+
+
+@pytest.fixture( scope = 'session' )
+def controls( ):
+    ''' Provides controls module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.controls" )
+
+
+@pytest.fixture( scope = 'session' )
+def exceptions( ):
+    ''' Provides exceptions module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.exceptions" )
+
+
+@pytest.fixture( scope = 'session' )
+def printers( ):
+    ''' Provides printers module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.printers" )
+
+
+@pytest.fixture( scope = 'session' )
+def vehicles( ):
+    ''' Provides vehicles module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.vehicles" )
+
+
+@pytest.fixture
+def served( controls, vehicles, simple_output, tmp_path ):
+    ''' Provides truck with running control server. '''
+    truck = vehicles.Truck(
+        printer_factory = simple_output, trace_levels = { None: 0 } )
+    server = controls.serve_control( truck, str( tmp_path / 'control' ) )
+    yield truck, server
+    server.stop( )
+
+
+def test_100_inspection( controls, served ):
+    ''' Server reports debuggers, emission counts, and activation. '''
+    truck, server = served
+    truck( 0 )( 'first' )
+    truck( 0 )( 'second' )
+    truck( 1 )
+    debuggers = controls.request_control( server.location, 'debuggers' )
+    assert sorted( map( json.dumps, debuggers ) ) == sorted( map(
+        json.dumps, [
+            dict( module = __name__, flavor = 0, enabled = True,
+                  emissions = 2 ),
+            dict( module = __name__, flavor = 1, enabled = False,
+                  emissions = 0 ) ] ) )
+    activation = controls.request_control(
+        server.location, 'activation', module = __name__ )
+    assert activation == dict( flavors = [ ], trace_level = 0 )
+    activations = controls.request_control( server.location, 'activation' )
+    assert __name__ in activations
+
+
+def test_110_reconfiguration( controls, served ):
+    ''' Server reconfigures activation of truck. '''
+    truck, server = served
+    debugger = truck( 1 )
+    activations = controls.request_control(
+        server.location, 'reconfigure',
+        active_flavors = f"{__name__}:*", trace_levels = '1' )
+    assert debugger.enabled
+    assert activations[ __name__ ] == dict( flavors = '*', trace_level = 1 )
+
+
+def test_120_failures( controls, exceptions, served ):
+    ''' Server reports failures without halting. '''
+    _, server = served
+    with pytest.raises( exceptions.ControlRequestFailure ):
+        controls.request_control( server.location, 'bogus' )
+    with pytest.raises( exceptions.ControlRequestFailure ):
+        controls.request_control( server.location, 'dump' )
+    assert controls.request_control( server.location, 'flush' ) is None
+
+
+def test_125_malformed_requests( controls, served ):
+    ''' Server reports malformed requests and continues serving. '''
+    _, server = served
+    lines = (
+        '{"command": "activation", "module": 5}',
+        '{"command": "reconfigure", "trace_levels": 3}',
+        '{"command": 7}',
+        '{"module": "x"}',
+        '[ 1 ]',
+        'bogus',
+    )
+    with controls._connect( server.location ) as stream:
+        for line in lines:
+            stream.write( line + '\n' )
+            stream.flush( )
+            assert 'error' in json.loads( stream.readline( ) )
+    assert controls.request_control( server.location, 'flush' ) is None
+
+
+def test_130_dump_recorder( controls, printers, vehicles, tmp_path ):
+    ''' Server dumps records from flight recorder. '''
+    recorder = printers.produce_flight_recorder(
+        str( tmp_path / 'recording' ), capacity = 64 )
+    recorder.record( 'recorded' )
+    server = controls.serve_control(
+        vehicles.Truck( ), str( tmp_path / 'control' ), recorder = recorder )
+    try:
+        assert controls.request_control(
+            server.location, 'dump' ) == [ 'recorded' ]
+    finally: server.stop( )
+    assert not ( tmp_path / 'control' ).exists( )
+
+
+def test_135_stale_socket( controls, vehicles, simple_output, tmp_path ):
+    ''' Stale sockets are replaced and sockets are removed on stop. '''
+    location = tmp_path / 'control'
+    with socket.socket( socket.AF_UNIX, socket.SOCK_STREAM ) as stale:
+        stale.bind( str( location ) )
+    assert location.exists( )
+    truck = vehicles.Truck(
+        printer_factory = simple_output, trace_levels = { None: 0 } )
+    server = controls.serve_control( truck, str( location ) )
+    assert controls.request_control( str( location ), 'debuggers' ) == [ ]
+    with pytest.raises( OSError ):
+        controls.serve_control( truck, str( location ) )
+    assert controls.request_control( str( location ), 'debuggers' ) == [ ]
+    server.stop( )
+    assert not location.exists( )
+    location.write_text( 'precious' )
+    with pytest.raises( OSError ):
+        controls.serve_control( truck, str( location ) )
+    assert location.read_text( ) == 'precious'
+
+
+def test_136_socket_removal_at_exit(
+    controls, vehicles, simple_output, tmp_path, mocker
+):
+    ''' Running servers are stopped at process exit. '''
+    register = mocker.spy( atexit, 'register' )
+    unregister = mocker.spy( atexit, 'unregister' )
+    truck = vehicles.Truck(
+        printer_factory = simple_output, trace_levels = { None: 0 } )
+    server = controls.serve_control( truck, str( tmp_path / 'control' ) )
+    ( stop, ), _ = register.call_args
+    assert stop == server.stop
+    stop( )
+    assert not ( tmp_path / 'control' ).exists( )
+    unregister.assert_called_once_with( server.stop )
+
+
+def test_140_cli_client( cli, served, capsys ):
+    ''' Control client subcommand prints results as JSON. '''
+    _, server = served
+    cli.main( [
+        'ctl', server.location, 'activation', '--module', __name__ ] )
+    assert json.loads( capsys.readouterr( ).out ) == dict(
+        flavors = [ ], trace_level = 0 )
@@ -21,10 +21,15 @@
 ''' Tests for rich recipes module. '''
 
 
+import io
 import sys
+import threading
 
 import pytest
+import rich.pretty
+
 from rich.console import Console
+from rich.theme import Theme
 
 from . import PACKAGE_NAME, cache_import_module
 
@@ -75,17 +80,46 @@ def test_012_console_printer_output( recipes, simple_output ):
     assert '\n' in output  # Rich console adds newline
 
 
-# def test_014_pretty_formatter_output( recipes, configuration ):
-#     ''' Pretty formatter produces plain-text pretty output. '''
-#     formatter = recipes.produce_pretty_formatter(
-#         configuration.FormatterControl( ), 'test', 1 )
-#     # Force multi-line output by limiting width
-#     formatter = lambda x: formatter( x, max_width = 10 )
-#     value = { 'a': [ 1, 2, 3 ], 'b': 'test' }
-#     result = formatter( value )
-#     assert "'a': [1, 2, 3]" in result  # Pretty-printed structure
-#     assert "'b': 'test'" in result
-#     assert '\n' in result  # Multi-line output
+def test_013_thread_consoles( recipes, simple_output ):
+    ''' Thread consoles mirror template console and reuse buffers. '''
+    console = Console(
+        file = simple_output, force_terminal = True, width = 40 )
+    consoles = recipes.ThreadConsoles( console )
+    value = { 'key': list( range( 20 ) ) }
+    with console.capture( ) as capture: console.print( value )
+    assert consoles.render( value ) == capture.get( )
+    assert consoles.render( 'x', end = '' ) == 'x'
+    pair = consoles.access( )
+    assert pair is consoles.access( )
+    assert pair[ 0 ].width == 40
+    assert pair[ 0 ].color_system == console.color_system
+    pairs = [ ]
+    thread = threading.Thread(
+        target = lambda: pairs.append( consoles.access( ) ) )
+    thread.start( )
+    thread.join( )
+    assert pairs[ 0 ][ 0 ] is not pair[ 0 ]
+    assert not simple_output.getvalue( )
+
+
+def test_014_pretty_formatter_budget( recipes, configuration ):
+    ''' Pretty formatter limits renditions by budget and control. '''
+    value = { 'a': [ 1, 2, 3 ], 'b': { 'c': { 'd': 'test' } } }
+    formatter = recipes.produce_pretty_formatter(
+        configuration.FormatterControl( ), 'test', 1 )
+    assert formatter is rich.pretty.pretty_repr
+    formatter = recipes.produce_pretty_formatter(
+        configuration.FormatterControl( columns_count_effective = 20 ),
+        'test', 1,
+        budget = recipes.PrettyBudget( max_depth = 2, max_length = 2 ) )
+    result = formatter( value )
+    assert '\n' in result
+    assert '... +1' in result
+    assert "'c': {...}" in result
+    formatter = recipes.produce_pretty_formatter(
+        configuration.FormatterControl( columns_count_effective = 20 ),
+        'test', 1, budget = recipes.PrettyBudget( max_width = 200 ) )
+    assert '\n' not in formatter( value )
 
 
 def test_015_console_text_io_invalidity( recipes, monkeypatch ):
@@ -97,6 +131,85 @@ def test_015_console_text_io_invalidity( recipes, monkeypatch ):
         recipes.produce_truck( stderr = False )
 
 
+def test_016_atomic_writer( recipes ):
+    ''' Atomic writer writes bytes to buffer, preserving text order. '''
+    raw = io.BytesIO( )
+    stream = io.TextIOWrapper( raw, encoding = 'utf-8' )
+    writer = recipes.AtomicWriter( stream )
+    stream.write( 'before\n' )
+    writer.write( 'caf\u00e9\n' )
+    assert raw.getvalue( ) == 'before\ncaf\u00e9\n'.encode( )
+    text_stream = io.StringIO( )
+    recipes.AtomicWriter( text_stream ).write( 'plain\n' )
+    assert text_stream.getvalue( ) == 'plain\n'
+
+
+def test_017_pooled_console_printer_threads( recipes ):
+    ''' Pooled printer keeps renditions from threads whole. '''
+    output = io.StringIO( )
+    console = Console( file = output, width = 200 )
+    printer = recipes.produce_pooled_console_printer(
+        console, recipes.AtomicWriter( output ), 'test', 1 )
+    def emit( index ):
+        for _ in range( 50 ): printer( f"thread {index} " * 5 )
+    threads = [
+        threading.Thread( target = emit, args = ( i, ) ) for i in range( 4 ) ]
+    for thread in threads: thread.start( )
+    for thread in threads: thread.join( )
+    lines = output.getvalue( ).splitlines( )
+    assert len( lines ) == 200
+    assert all( len( set( line.split( ) ) ) == 2 for line in lines )
+
+
+def test_018_timed_formatter( recipes, mocker ):
+    ''' Slow classes are formatted by fallback until cooldown elapses. '''
+    mocker.patch(
+        'time.perf_counter',
+        side_effect = [
+            0.0, 0.5, 1.0, 2.0, 2.1, 11.0, 11.0, 11.1, 12.0, 12.1 ] )
+    formatter = recipes.TimedFormatter(
+        lambda value: f"slow {value}", lambda value: f"fast {value}", 0.3,
+        cooldown = 10.0 )
+    assert formatter( 1 ) == 'slow 1'
+    assert formatter( 2 ) == 'fast 2'
+    assert formatter( 'x' ) == 'slow x'
+    assert formatter( 3 ) == 'slow 3'
+    assert not formatter.demotions
+    assert formatter( 4 ) == 'slow 4'
+
+
+def test_019_pretty_formatter_time_budget( recipes, configuration, mocker ):
+    ''' Pretty formatter falls back to bounded plain representation. '''
+    mocker.patch( 'time.perf_counter', side_effect = [ 0.0, 1.0, 1.5 ] )
+    formatter = recipes.produce_pretty_formatter(
+        configuration.FormatterControl( ), 'test', 1,
+        budget = recipes.PrettyBudget( max_length = 2, max_seconds = 0.5 ) )
+    assert formatter( [ 1, 2, 3 ] ) == '[1, 2, ... +1]'
+    assert formatter( [ 1, 2, 3 ] ) == '[1, 2, ...(1 more)]'
+    unbounded = recipes.produce_pretty_formatter(
+        configuration.FormatterControl( ), 'test', 1,
+        budget = recipes.PrettyBudget( max_seconds = None ) )
+    assert not isinstance( unbounded, recipes.TimedFormatter )
+
+
+def test_020_thread_consoles_settings( recipes ):
+    ''' Thread consoles follow theme, settings, and width of template. '''
+    console = Console(
+        file = io.StringIO( ), force_terminal = True, width = 40,
+        color_system = 'standard',
+        theme = Theme( { 'repr.number': 'bold red' } ) )
+    consoles = recipes.ThreadConsoles( console )
+    assert consoles.render( 42, end = '' ) == '\x1b[1;31m42\x1b[0m'
+    console.width = 100
+    assert consoles.access( )[ 0 ].width == 100
+    console = Console(
+        file = io.StringIO( ), force_terminal = True, color_system = None,
+        markup = False, emoji = False, highlight = False )
+    consoles = recipes.ThreadConsoles( console )
+    assert consoles.render( '[bold]:smile:[/bold] 42', end = '' ) == (
+        '[bold]:smile:[/bold] 42' )
+
+
 def test_101_produce_truck_formatter_mode(
     recipes, base, vehicles, simple_output, monkeypatch
 ):
@@ -157,6 +270,49 @@ def test_103_produce_truck_active_flavors(
     assert "Debug message" not in output
 
 
+def test_104_produce_truck_pooled_printer_mode(
+    recipes, vehicles, simple_output, monkeypatch
+):
+    ''' Truck in pooled printer mode renders via thread consoles. '''
+    monkeypatch.setattr( sys, 'stderr', simple_output )
+    truck = recipes.produce_truck(
+        mode = recipes.Modes.PooledPrinter, trace_levels = 0 )
+    assert (
+        truck.generalcfg.formatter_factory
+        == recipes.produce_pretty_formatter )
+    debugger = truck( 0 )
+    debugger( { 'key': 'value' } )
+    assert "'key': 'value'" in simple_output.getvalue( )
+
+
+def test_105_produce_truck_pretty_budgets(
+    recipes, vehicles, simple_output, monkeypatch
+):
+    ''' Trucks apply pretty budgets per flavor in all modes. '''
+    monkeypatch.setattr( sys, 'stderr', simple_output )
+    value = [ 1, 2, 3, 4 ]
+    budget = recipes.PrettyBudget( max_length = 2 )
+    for mode in recipes.Modes:
+        truck = recipes.produce_truck(
+            mode = mode, trace_levels = 1, pretty_budgets = { 0: budget } )
+        truck( 0 )( value )
+        truck( 1 )( value )
+        truck( 1 )( list( range( 100 ) ) )
+    output = simple_output.getvalue( )
+    assert output.count( '[1, 2, ... +2]' ) == 3
+    assert output.count( '[1, 2, 3, 4]' ) == 3
+    assert output.count( '... +36' ) == 3
+    truck = recipes.produce_truck(
+        mode = recipes.Modes.Printer, trace_levels = 0,
+        pretty_budgets = budget )
+    truck( 0 )( value )
+    assert simple_output.getvalue( ).count( '[1, 2, ... +2]' ) == 4
+    truck = recipes.produce_truck(
+        mode = recipes.Modes.Printer, trace_levels = 0 )
+    truck( 0 )( list( range( 100 ) ) )
+    assert simple_output.getvalue( ).count( '... +' ) == 7
+
+
 def test_200_install_truck_default(
     recipes, vehicles, simple_output, clean_builtins, monkeypatch
 ):
@@ -211,3 +367,21 @@ def test_300_register_module(
     debugger( { 'key': 'value' } )
     output = simple_output.getvalue( )
     assert "Rich| {'key': 'value'}" in output
+
+
+def test_301_register_module_pretty_budgets(
+    recipes, configuration, vehicles,
+    simple_output, clean_builtins, monkeypatch,
+):
+    ''' Registered module formats arguments within pretty budget. '''
+    monkeypatch.setattr( sys, 'stderr', simple_output )
+    truck = recipes.install( trace_levels = 0, active_flavors = { 'debug' } )
+    mname = f"{__name__}.budgeted"
+    recipes.register_module(
+        name = mname,
+        prefix_emitter = 'Rich| ',
+        flavors = { 'debug': configuration.FlavorConfiguration( ) },
+        pretty_budgets = recipes.PrettyBudget( max_depth = 1 ) )
+    debugger = truck( 'debug', module_name = mname )
+    debugger( { 'key': { 'nested': 'value' } } )
+    assert "Rich| {'key': {...}}" in simple_output.getvalue( )
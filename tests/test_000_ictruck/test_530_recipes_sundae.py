@@ -19,11 +19,15 @@
 
 ''' Tests for sundae recipes module. '''
 
+import os
 import re
+import sys
+import threading
 
 import accretive as accret
 import pytest
 
+from rich.color import ColorSystem
 from rich.console import Console
 from rich.style import Style
 
@@ -33,6 +37,8 @@ from . import PACKAGE_NAME, cache_import_module
 class FakeConsole:
     ''' Fake Console implementation which captures print calls. '''
 
+    color_system = 'truecolor'
+
     def __init__( self ):
         import locale
         import os
@@ -45,6 +51,8 @@ class FakeConsole:
         self.print_calls.append( ( text, style ) )
         self.console.print( text, style = style, end = end )
 
+    def __getattr__( self, name ): return getattr( self.console, name )
+
     def capture( self ): return self.console.capture( )
 
     def print_exception( self ):
@@ -53,6 +61,11 @@ class FakeConsole:
             self.console.print_exception( )
 
 
+def _stylize( text, color ):
+    return Style( color = color ).render(
+        text, color_system = ColorSystem.TRUECOLOR )
+
+
 def _strip_ansi_c1( text ):
     # Null device is TTY on Windows. :facepalm:
     regex = re.compile( r'''\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])''' )
@@ -156,7 +169,7 @@ def test_011_flavor_aliases( recipes ):
     ( 'Words|Emoji', 'errorx', '❌ ERROR| ', 'red' ),
     ( 'Nothing', 'error', '| ', None ),
 ] )
-def test_020_produce_special_prefix(
+def test_020_compile_special_prefix(
     recipes, test_console, fake_auxiliaries, label_as, flavor,
     expected_prefix, expected_style,
 ):
@@ -168,14 +181,13 @@ def test_020_produce_special_prefix(
     else: presentation = getattr( recipes.PrefixLabelPresentations, label_as )
     control = recipes.PrefixFormatControl(
         colorize = True, label_as = presentation )
-    prefix = _strip_ansi_c1( recipes._produce_special_prefix(
-        test_console, fake_auxiliaries, control, 'test_module', flavor ) )
-    assert prefix == expected_prefix
+    prefix = recipes._compile_special_prefix(
+        test_console, fake_auxiliaries, control, 'test_module', flavor )
+    assert _strip_ansi_c1( prefix ) == expected_prefix
     if expected_style and control.colorize:
         label = expected_prefix.split( '|' )[ 0 ].strip( )
-        assert any(
-            call[ 0 ] == label and call[ 1 ].color.name == expected_style
-            for call in test_console.print_calls )
+        assert _stylize( label, expected_style ) in prefix
+    assert not test_console.print_calls
 
 
 @pytest.mark.parametrize( "label_as,level,expected_prefix,expected_style", [
@@ -187,7 +199,7 @@ def test_020_produce_special_prefix(
     ( 'Words|Emoji', 1, '🔎 TRACE1|   ', 'grey82' ),
     ( 'Nothing', 1, '|   ', None ),
 ] )
-def test_021_produce_trace_prefix(
+def test_021_compile_trace_prefix(
     recipes, test_console, fake_auxiliaries, label_as, level,
     expected_prefix, expected_style,
 ):
@@ -199,36 +211,33 @@ def test_021_produce_trace_prefix(
     else: presentation = getattr( recipes.PrefixLabelPresentations, label_as )
     control = recipes.PrefixFormatControl(
         colorize = True, label_as = presentation )
-    prefix = _strip_ansi_c1( recipes._produce_trace_prefix(
-        test_console, fake_auxiliaries, control, 'test_module', level ) )
-    assert prefix == expected_prefix
+    prefix = recipes._compile_trace_prefix(
+        test_console, fake_auxiliaries, control, 'test_module', level )
+    assert _strip_ansi_c1( prefix ) == expected_prefix
     if expected_style and control.colorize:
         label = expected_prefix.split( '|' )[ 0 ].strip( )
-        assert any(
-            call[ 0 ] == label and call[ 1 ].color.name == expected_style
-            for call in test_console.print_calls )
+        assert _stylize( label, expected_style ) in prefix
+    assert not test_console.print_calls
 
 
-def test_022_stylize_interpolants( recipes, test_console ):
+def test_022_compile_prefix_styles( recipes, test_console ):
     ''' Custom styles are applied to interpolants. '''
-    interpolants = {
-        'timestamp': '2025-04-01',
-        'module_qname': 'test_module',
-        'flavor': 'NOTE',
-    }
+    auxiliaries = recipes.Auxiliaries(
+        time_formatter = lambda ts_format: '2025-04-01' )
+    control = recipes.PrefixFormatControl(
+        template = "{timestamp} {module_qname} {flavor}| " )
     styles = {
         'timestamp': Style( color = 'green' ),
         'module_qname': Style( color = 'yellow' ),
         'flavor': Style( color = 'blue' ),
     }
-    recipes._stylize_interpolants( test_console, interpolants, styles )
-    assert len( test_console.print_calls ) == 3
-    assert test_console.print_calls[ 0 ] == (
-        '2025-04-01', styles['timestamp'] )
-    assert test_console.print_calls[ 1 ] == (
-        'test_module', styles['module_qname'] )
-    assert test_console.print_calls[ 2 ] == (
-        'NOTE', styles['flavor'] )
+    prefix = recipes._compile_prefix(
+        test_console, auxiliaries, control, 'test_module', 'NOTE', styles )
+    assert prefix( ) == (
+        f"{_stylize( '2025-04-01', 'green' )} "
+        f"{_stylize( 'test_module', 'yellow' )} "
+        f"{_stylize( 'NOTE', 'blue' )}| " )
+    assert not test_console.print_calls
 
 
 @pytest.mark.parametrize( "flavor,expected_prefix", [
@@ -264,7 +273,7 @@ def test_024_produce_prefix_emitter_trace_levels(
     assert prefix == expected_prefix
 
 
-def test_025_render_prefix_interpolants(
+def test_025_compile_prefix_interpolants(
     recipes, test_console, fake_auxiliaries
 ):
     ''' Prefix emitter handles all available interpolants. '''
@@ -274,14 +283,15 @@ def test_025_render_prefix_interpolants(
         template = (
             "{timestamp} [{module_qname}] {flavor} "
             "(pid:{process_id}, tid:{thread_id}, tname:{thread_name})| " ) )
-    prefix = recipes._render_prefix(
+    renderer = recipes._compile_prefix(
         test_console, fake_auxiliaries, control, 'test_module', 'NOTE', { } )
+    prefix = renderer( )
     assert prefix == (
         "2025-04-01 12:00:00 [test_module] NOTE "
         "(pid:1234, tid:5678, tname:TestThread)| " )
 
 
-def test_026_render_prefix_ts_format(
+def test_026_compile_prefix_ts_format(
     recipes, test_console, fake_auxiliaries
 ):
     ''' Prefix emitter handles custom timestamp format. '''
@@ -290,11 +300,58 @@ def test_026_render_prefix_ts_format(
         label_as = recipes.PrefixLabelPresentations.Words,
         template = "{timestamp} {flavor}| ",
         ts_format = '%H:%M:%S' )
-    prefix = recipes._render_prefix(
+    renderer = recipes._compile_prefix(
         test_console, fake_auxiliaries, control, 'test_module', 'NOTE', { } )
+    prefix = renderer( )
     assert prefix == "12:00:00 NOTE| "
 
 
+def test_027_compile_prefix_template_specifications(
+    recipes, test_console, fake_auxiliaries
+):
+    ''' Compiled templates honor conversions and format specifications. '''
+    control = recipes.PrefixFormatControl(
+        colorize = False, template = "{flavor!r:>8}|{process_id:>6}| " )
+    renderer = recipes._compile_prefix(
+        test_console, fake_auxiliaries, control, 'test_module', 'NOTE', { } )
+    prefix = renderer( )
+    assert prefix == "  'NOTE'|  1234| "
+
+
+def test_028_compile_prefix_without_colors( recipes, test_console ):
+    ''' No sequences are produced without detected color system. '''
+    test_console.color_system = None
+    control = recipes.PrefixFormatControl( )
+    prefix = recipes._compile_prefix(
+        test_console, recipes.Auxiliaries( ), control, 'test_module', 'NOTE',
+        { 'flavor': Style( color = 'blue' ) } )
+    assert prefix == 'NOTE| '
+
+
+def test_029_compile_prefix_fixed_interpolants(
+    recipes, test_console, mocker
+):
+    ''' Prefixes without volatile interpolants are compiled to text once. '''
+    def fail( *posargs ): raise AssertionError( 'computed' )
+    auxiliaries = recipes.Auxiliaries(
+        pid_discoverer = fail,
+        thread_discoverer = fail,
+        time_formatter = fail )
+    control = recipes.PrefixFormatControl(
+        colorize = True, template = "{flavor}[{module_qname}]| " )
+    styles = { 'flavor': Style( color = 'blue' ) }
+    prefix = recipes._compile_prefix(
+        test_console, auxiliaries, control, 'test_module', 'NOTE', styles )
+    flavor = _stylize( 'NOTE', 'blue' )
+    mname = _stylize( 'test_module', 'blue' )
+    assert prefix == f"{flavor}[{mname}]| "
+    compiler = mocker.spy( recipes, '_compile_special_prefix' )
+    emitter = recipes._produce_prefix_emitter(
+        test_console, auxiliaries, control )
+    assert emitter( 'test_module', 'n' ) == emitter( 'test_module', 'n' )
+    assert compiler.call_count == 1
+
+
 ## Formatter Factory
 
 
@@ -338,6 +395,142 @@ def test_032_formatter_output_level(
     assert result == "{'key': 'value'}\n"
 
 
+def _capture_exc_info( message ):
+    try: raise ValueError( message )
+    except ValueError: return sys.exc_info( )
+
+
+def test_033_formatter_traceback_caching(
+    recipes, configuration, test_console, fake_auxiliaries, mocker
+):
+    ''' Tracebacks are rendered once per exception and shape. '''
+    exc_infos = [ _capture_exc_info( 'first' ) ]
+    auxiliaries = recipes.Auxiliaries(
+        exc_info_discoverer = lambda: exc_infos[ -1 ],
+        pid_discoverer = fake_auxiliaries.pid_discoverer,
+        thread_discoverer = fake_auxiliaries.thread_discoverer,
+        time_formatter = fake_auxiliaries.time_formatter )
+    renderer = mocker.spy( recipes._traceback, 'format_exception' )
+    formatter = recipes._produce_formatter_factory(
+        test_console, auxiliaries, plain_tracebacks = True )(
+            configuration.FormatterControl( ), 'test', 'ex' )
+    first = formatter( 'a' )
+    assert first.startswith( '\nTraceback #1:\nTraceback (most recent' )
+    assert 'ValueError: first' in first
+    assert formatter( 'a' ) == first
+    assert renderer.call_count == 1
+    assert not vars( exc_infos[ -1 ][ 1 ] )
+    exc_infos.append( _capture_exc_info( 'second' ) )
+    assert formatter( 'b' ) == (
+        "\nSame traceback as #1: ValueError: second\nb" )
+    assert renderer.call_count == 1
+    exc_infos.append( ( KeyError, KeyError( 'k' ), None ) )
+    assert formatter( 'c' ).startswith( '\nTraceback #2:\n' )
+
+
+def test_034_formatter_specialized_closures(
+    recipes, configuration, test_console, fake_auxiliaries
+):
+    ''' Only stack flavors discover exceptions. '''
+    discoveries = [ ]
+    def discover( ):
+        discoveries.append( True )
+        return ( None, None, None )
+    auxiliaries = recipes.Auxiliaries(
+        exc_info_discoverer = discover,
+        pid_discoverer = fake_auxiliaries.pid_discoverer,
+        thread_discoverer = fake_auxiliaries.thread_discoverer,
+        time_formatter = fake_auxiliaries.time_formatter )
+    factory = recipes._produce_formatter_factory( test_console, auxiliaries )
+    control = configuration.FormatterControl( )
+    for flavor in ( 'n', 'error', 3 ):
+        assert factory( control, 'test', flavor )( 'x' ) == 'x'
+    assert not discoveries
+    assert factory( control, 'test', 'ex' )( 'x' ) == 'x'
+    assert len( discoveries ) == 1
+
+
+def test_035_formatter_highlight_strings(
+    recipes, configuration, test_console, fake_auxiliaries
+):
+    ''' Plain strings bypass Rich, unless highlighting is enabled. '''
+    control = configuration.FormatterControl( )
+    factory = recipes._produce_formatter_factory(
+        test_console, fake_auxiliaries, highlight_strings = False )
+    formatter = factory( control, 'test', 'note' )
+    assert formatter( '[bold]x[/bold] 42' ) == '[bold]x[/bold] 42'
+    assert _strip_ansi_c1( formatter( [ 1 ] ) ) == '[1]\n'
+    factory = recipes._produce_formatter_factory(
+        test_console, fake_auxiliaries )
+    formatter = factory( control, 'test', 'note' )
+    assert _strip_ansi_c1( formatter( '[bold]x[/bold] 42' ) ) == 'x 42'
+    assert recipes.FlavorSpecification(
+        color = 'blue', emoji = '', label = 'X' ).highlight_strings
+
+
+## Auxiliaries
+
+
+def test_040_timestamp_provider( recipes, mocker ):
+    ''' Timestamp provider caches seconds and renders fractions. '''
+    import time
+    nanoseconds = [ 1_700_000_000_123_456_789 ]
+    mocker.patch( 'time.time_ns', lambda: nanoseconds[ 0 ] )
+    strftime = mocker.patch( 'time.strftime', wraps = time.strftime )
+    provider = recipes.TimestampProvider( )
+    seconds = time.strftime( '%H:%M:%S', time.localtime( 1_700_000_000 ) )
+    strftime.reset_mock( )
+    assert provider( '%H:%M:%S.%f' ) == f"{seconds}.123456"
+    nanoseconds[ 0 ] += 100_000
+    assert provider( '%H:%M:%S.%f' ) == f"{seconds}.123556"
+    assert strftime.call_count == 1
+    assert provider( '%S.%3f%%f' ).endswith( '.123%f' )
+    assert provider( '%%' ) == '%'
+    nanoseconds[ 0 ] += 1_000_000_000
+    assert provider( '%H:%M:%S.%f' ) != f"{seconds}.123556"
+
+
+def test_041_timestamp_provider_elapsed( recipes, mocker ):
+    ''' Timestamp provider can render elapsed monotonic time. '''
+    nanoseconds = [ 5_000_000_000 ]
+    mocker.patch( 'time.monotonic_ns', lambda: nanoseconds[ 0 ] )
+    provider = recipes.TimestampProvider( elapsed = True )
+    nanoseconds[ 0 ] += 12_345_678_901
+    assert provider( '%f' ) == '12.345678'
+    assert provider( '%3f' ) == '12.345'
+    assert provider( '%H:%M:%S' ) == '12'
+    assert isinstance(
+        recipes.Auxiliaries( ).time_formatter, recipes.TimestampProvider )
+
+
+def test_042_identity_discoverers( recipes ):
+    ''' Process and thread discoverers cache identities. '''
+    assert recipes._discover_process_id( ) == os.getpid( )
+    assert recipes._discover_thread( ) is threading.current_thread( )
+    threads = [ ]
+    thread = threading.Thread(
+        target = lambda: threads.append( recipes._discover_thread( ) ) )
+    thread.start( )
+    thread.join( )
+    assert threads == [ thread ]
+
+
+@pytest.mark.skipif(
+    not hasattr( os, 'fork' ), reason = 'Requires fork.' )
+def test_043_process_id_after_fork( recipes ):
+    ''' Cached process ID is refreshed in forked child. '''
+    reader, writer = os.pipe( )
+    pid = os.fork( )
+    if not pid: # pragma: no cover
+        os.write( writer, str( recipes._discover_process_id( ) ).encode( ) )
+        os._exit( 0 )
+    os.close( writer )
+    reported = int( os.read( reader, 32 ) )
+    os.close( reader )
+    os.waitpid( pid, 0 )
+    assert reported == pid
+
+
 ## Integration
 
 
@@ -370,7 +563,7 @@ def test_101_register_module_colorize_default(
 ):
     ''' End-to-end module registration works correctly. Colorization. '''
     printer_factory = base.funct.partial(
-        printers.produce_simple_printer, simple_output )
+        printers.produce_simple_printer, simple_output, force_color = True )
     truck = vehicles.produce_truck(
         modulecfgs = accret.Dictionary( ),
         active_flavors = { 'note' },
@@ -385,9 +578,7 @@ def test_101_register_module_colorize_default(
     debugger( "Colorize test" )
     output = _strip_ansi_c1( simple_output.getvalue( ) )
     assert output == "NOTE| Colorize test\n"
-    assert any(
-        call[ 0 ] == 'NOTE' and call[ 1 ].color.name == 'blue'
-        for call in test_console.print_calls )
+    assert _stylize( 'NOTE', 'blue' ) in simple_output.getvalue( )
 
 
 def test_102_register_module_label_as_default(
@@ -396,7 +587,7 @@ def test_102_register_module_label_as_default(
 ):
     ''' End-to-end module registration works correctly. Default labeling. '''
     printer_factory = base.funct.partial(
-        printers.produce_simple_printer, simple_output )
+        printers.produce_simple_printer, simple_output, force_color = True )
     truck = vehicles.produce_truck(
         modulecfgs = accret.Dictionary( ),
         active_flavors = { 'note' },
@@ -423,7 +614,7 @@ def test_103_register_module_custom_styles(
         'module_qname': Style( color = 'green' ),
     } )
     printer_factory = base.funct.partial(
-        printers.produce_simple_printer, simple_output )
+        printers.produce_simple_printer, simple_output, force_color = True )
     truck = vehicles.produce_truck(
         modulecfgs = accret.Dictionary( ),
         active_flavors = { 'note' },
@@ -433,18 +624,15 @@ def test_103_register_module_custom_styles(
         colorize = True,
         prefix_label_as = recipes.PrefixLabelPresentations.Words,
         prefix_styles = custom_styles,
+        prefix_template = "[{module_qname}] {flavor}| ",
         console_factory = lambda: test_console,
         auxiliaries = fake_auxiliaries )
     debugger = truck( 'note' )
     debugger( "Custom styles test" )
     output = _strip_ansi_c1( simple_output.getvalue( ) )
-    assert output == "NOTE| Custom styles test\n"
-    # assert any(
-    #     call[ 0 ] == 'NOTE' and call[ 1 ].color.name == 'magenta'
-    #     for call in test_console.print_calls )
-    assert any(
-        call[ 0 ] == __name__ and call[ 1 ].color.name == 'green'
-        for call in test_console.print_calls )
+    assert output.startswith( f"[{__name__}] NOTE| " )
+    # assert _stylize( 'NOTE', 'magenta' ) in simple_output.getvalue( )
+    assert _stylize( __name__, 'green' ) in simple_output.getvalue( )
 
 
 def test_104_register_module_custom_template(
@@ -499,6 +687,110 @@ def test_105_register_module_custom_ts_format(
     assert output == "12:00:00 NOTE| Custom ts format test\n"
 
 
+def test_106_register_module_deferred_console(
+    recipes, vehicles, base, printers, test_console, fake_auxiliaries,
+    simple_output, clean_builtins,
+):
+    ''' Console is produced on first emission and shared by modules. '''
+    consoles = [ ]
+    def console_factory( ):
+        consoles.append( test_console )
+        return test_console
+    printer_factory = base.funct.partial(
+        printers.produce_simple_printer, simple_output )
+    modulecfgs = accret.Dictionary( )
+    truck = vehicles.produce_truck(
+        modulecfgs = modulecfgs,
+        active_flavors = { 'note' },
+        printer_factory = printer_factory )
+    for name in ( 'x', __name__ ):
+        truck.register_module(
+            name = name,
+            configuration = recipes.produce_module_configuration(
+                console_factory = console_factory,
+                auxiliaries = fake_auxiliaries ) )
+    truck( 'error' )( 'Inactive' )
+    assert not consoles
+    truck( 'note' )( 'Active' )
+    truck( 'note', module_name = 'x' )( 'Active' )
+    assert consoles == [ test_console ]
+
+
+def test_107_register_module_type_formatters(
+    recipes, vehicles, base, configuration, printers, test_console,
+    fake_auxiliaries, simple_output, clean_builtins,
+):
+    ''' Type formatters do not suppress tracebacks of stack flavors. '''
+    formatters = cache_import_module( f"{PACKAGE_NAME}.formatters" )
+    exc_info = _capture_exc_info( 'failure' )
+    auxiliaries = recipes.Auxiliaries(
+        exc_info_discoverer = lambda: exc_info,
+        pid_discoverer = fake_auxiliaries.pid_discoverer,
+        thread_discoverer = fake_auxiliaries.thread_discoverer,
+        time_formatter = fake_auxiliaries.time_formatter )
+    printer_factory = base.funct.partial(
+        printers.produce_simple_printer, simple_output )
+    truck = vehicles.produce_truck(
+        modulecfgs = accret.Dictionary( ),
+        active_flavors = { 'errorx' },
+        printer_factory = printer_factory )
+    modulecfg = recipes.produce_module_configuration(
+        colorize = False,
+        console_factory = lambda: test_console,
+        auxiliaries = auxiliaries,
+        plain_tracebacks = True )
+    truck.register_module(
+        name = __name__,
+        configuration = configuration.ModuleConfiguration(
+            flavors = modulecfg.flavors,
+            formatter_factory = modulecfg.formatter_factory,
+            type_formatters = formatters.scalar_formatters ) )
+    message = 'failed'
+    truck( 'errorx' )( message )
+    output = simple_output.getvalue( )
+    assert 'Traceback #1:' in output
+    assert 'ValueError: failure' in output
+    assert output.endswith( "'failed'\n" )
+
+
+def test_108_register_module_traceback_per_record(
+    recipes, vehicles, base, configuration, printers, test_console,
+    fake_auxiliaries, simple_output, clean_builtins,
+):
+    ''' Tracebacks are printed once per emission, not per argument. '''
+    exc_info = _capture_exc_info( 'failure' )
+    auxiliaries = recipes.Auxiliaries(
+        exc_info_discoverer = lambda: exc_info,
+        pid_discoverer = fake_auxiliaries.pid_discoverer,
+        thread_discoverer = fake_auxiliaries.thread_discoverer,
+        time_formatter = fake_auxiliaries.time_formatter )
+    printer_factory = base.funct.partial(
+        printers.produce_simple_printer, simple_output )
+    truck = vehicles.produce_truck(
+        modulecfgs = accret.Dictionary( ),
+        active_flavors = { 'errorx' },
+        printer_factory = printer_factory )
+    modulecfg = recipes.produce_module_configuration(
+        colorize = False,
+        console_factory = lambda: test_console,
+        auxiliaries = auxiliaries,
+        plain_tracebacks = True )
+    truck.register_module(
+        name = f"{__name__}.traceback_per_record",
+        configuration = modulecfg )
+    debugger = truck(
+        'errorx', module_name = f"{__name__}.traceback_per_record" )
+    first, second = 'a', 'b'
+    debugger( first, second )
+    debugger( first )
+    with truck.buffered_scope( ) as scope:
+        debugger( first, second )
+        scope.keep( )
+    output = simple_output.getvalue( )
+    assert output.count( 'ValueError: failure' ) == 3
+    assert output.count( 'Traceback #1:' ) == 3
+
+
 # Edge Cases
 
 
@@ -511,7 +803,7 @@ def test_200_invalid_prefix_template(
         label_as = recipes.PrefixLabelPresentations.Words,
         template = "{invalid_key}| " )
     with pytest.raises( KeyError ):
-        recipes._render_prefix(
+        recipes._compile_prefix(
             test_console, fake_auxiliaries, control,
             'test_module', 'NOTE', { } )
 
@@ -530,7 +822,6 @@ def test_201_invalid_ts_format( recipes, test_console, fake_auxiliaries ):
         label_as = recipes.PrefixLabelPresentations.Words,
         template = "{timestamp} {flavor}| ",
         ts_format = '%Q' )
-    with pytest.raises( ValueError ):
-        recipes._render_prefix(
-            test_console, fake_auxiliaries, control,
-            'test_module', 'NOTE', { } )
+    prefix = recipes._compile_prefix(
+        test_console, fake_auxiliaries, control, 'test_module', 'NOTE', { } )
+    with pytest.raises( ValueError ): prefix( )
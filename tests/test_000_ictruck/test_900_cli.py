@@ -0,0 +1,55 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+''' Tests for command-line interface. '''
+
+
+import pytest
+
+from . import PACKAGE_NAME, cache_import_module
+
+
+@pytest.fixture( scope = 'session' )
+def cli( ):
+    ''' Provides command-line interface module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.__main__" )
+
+
+@pytest.fixture( scope = 'session' )
+def printers( ):
+    ''' Provides printers module. '''
+    return cache_import_module( f"{PACKAGE_NAME}.printers" )
+
+
+def test_100_decode_recording( cli, printers, tmp_path, capsys ):
+    ''' Decode subcommand prints records in chronological order. '''
+    location = str( tmp_path / 'recording' )
+    recorder = printers.produce_flight_recorder( location, capacity = 64 )
+    recorder.record( 'first' )
+    recorder.record( 'second' )
+    cli.main( [ 'decode', location ] )
+    assert capsys.readouterr( ).out == 'first\nsecond\n'
+
+
+def test_101_missing_subcommand( cli, capsys ):
+    ''' Missing subcommand is rejected. '''
+    with pytest.raises( SystemExit ):
+        cli.main( [ ] )
+    assert 'usage' in capsys.readouterr( ).err